@@ -1,9 +1,28 @@
 """Main application window — manages screen transitions."""
 
+import threading
 import tkinter as tk
+from importlib import import_module
 
 from app.gui.category_screen import CategoryScreen
-from app.gui.sorting_screen import SortingScreen
+from app.services import category_service, settings_service
+
+# How often the Tk loop checks whether the data files have been read
+STARTUP_POLL_MS = 10
+
+
+def _warm_up(data_ready: threading.Event) -> None:
+    """Read settings and categories, then import the sorting screen (worker thread)."""
+    try:
+        settings_service.preload()
+        category_service.preload()
+    finally:
+        # On failure the screen reads (and reports) on the Tk thread instead
+        data_ready.set()
+    try:
+        import_module("app.gui.sorting_screen")
+    except ImportError:
+        pass  # raised again, visibly, when the sorting screen is opened
 
 
 class ImageSorterApp(tk.Tk):
@@ -23,28 +42,51 @@ class ImageSorterApp(tk.Tk):
         y = (self.winfo_screenheight() - 700) // 2
         self.geometry(f"+{x}+{y}")
 
-        self._current_screen = None
-        self._show_category_screen()
+        self._data_ready = threading.Event()
+        threading.Thread(target=_warm_up, args=(self._data_ready,), name="warm-up", daemon=True).start()
+
+        # Screens are built once and swapped in and out, not recreated
+        self._category_screen = CategoryScreen(
+            self,
+            on_continue_callback=self._show_sorting_screen,
+        )
+        self._category_screen.configure(bg="#1e1e2e")
+        self._sorting_screen = None
+        # Show the (still empty) screen right away; it is filled in once loaded
+        self._current_screen = self._category_screen
+        self._category_screen.pack(fill="both", expand=True)
+        self._activate_when_loaded()
+
+    def _activate_when_loaded(self):
+        if not self._data_ready.is_set():
+            self.after(STARTUP_POLL_MS, self._activate_when_loaded)
+            return
+        if self._current_screen is self._category_screen:
+            self._category_screen.activate()
 
     def _clear_screen(self):
-        """Remove the current screen."""
+        """Hide the current screen."""
         if self._current_screen is not None:
-            self._current_screen.destroy()
+            self._current_screen.deactivate()
+            self._current_screen.pack_forget()
             self._current_screen = None
 
-    def _show_category_screen(self):
+    def _show_screen(self, screen):
         self._clear_screen()
-        self._current_screen = CategoryScreen(
-            self,
-            on_continue_callback=self._show_sorting_screen,
-        )
-        self._current_screen.configure(bg="#1e1e2e")
-        self._current_screen.pack(fill="both", expand=True)
+        self._current_screen = screen
+        screen.pack(fill="both", expand=True)
+        screen.activate()
+
+    def _show_category_screen(self):
+        self._show_screen(self._category_screen)
 
     def _show_sorting_screen(self):
-        self._clear_screen()
-        self._current_screen = SortingScreen(
-            self,
-            on_back_callback=self._show_category_screen,
-        )
-        self._current_screen.pack(fill="both", expand=True)
+        if self._sorting_screen is None:
+            # Usually already imported by the warm-up thread
+            from app.gui.sorting_screen import SortingScreen
+
+            self._sorting_screen = SortingScreen(
+                self,
+                on_back_callback=self._show_category_screen,
+            )
+        self._show_screen(self._sorting_screen)
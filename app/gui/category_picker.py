@@ -0,0 +1,261 @@
+"""Category picker — paged, filterable grid of category buttons."""
+
+import tkinter as tk
+from typing import Callable
+
+from app.models.category_trie import CategoryTrie
+
+COLUMNS = 5
+ROWS = 4
+PAGE_SIZE = COLUMNS * ROWS
+
+# With up to this many entries, 1-9 and 0 pick immediately (0 = 10th)
+SINGLE_KEY_LIMIT = 10
+
+# How long to wait for the next digit of a chord
+CHORD_TIMEOUT_MS = 700
+
+FILTER_HINT = "Type to filter categories"
+
+BUTTON_BG = "#7c3aed"
+SUGGESTED_BG = "#059669"
+SUGGESTED_ACTIVE_BG = "#047857"
+
+
+def chord_is_complete(chord: str, count: int) -> bool:
+    """Whether no entry number up to ``count`` is longer than ``chord`` and starts with it.
+
+    The shortest such number is ``chord`` followed by a 0, so once that is
+    out of range, waiting for another digit is pointless.
+    """
+    return int(chord) * 10 > count
+
+
+class CategoryPicker(tk.Frame):
+    """Grid of category buttons with paging, filtering and digit chords."""
+
+    def __init__(self, master, on_pick: Callable[[str], None]):
+        super().__init__(master, bg="#1e1e2e")
+        self.on_pick = on_pick
+        self._names: list[str] = []
+        self._trie = CategoryTrie()
+        self._matches: list[str] = []
+        self._query = ""
+        self._suggested: str | None = None
+        self._page = 0
+        self._chord = ""
+        self._chord_job = None
+        self._bound = False
+
+        self._build_ui()
+
+    def _build_ui(self):
+        # ── Filter / paging bar ──
+        bar = tk.Frame(self, bg="#1e1e2e")
+        bar.pack(fill="x", pady=(0, 4))
+
+        self.filter_label = tk.Label(
+            bar, text=FILTER_HINT, font=("Segoe UI", 10), fg="#666", bg="#1e1e2e", anchor="w",
+        )
+        self.filter_label.pack(side="left")
+
+        self.next_btn = tk.Button(
+            bar, text="›", font=("Segoe UI", 10), bg="#374151", fg="#e0e0e0",
+            activebackground="#4b5563", activeforeground="white", relief="flat",
+            cursor="hand2", command=lambda: self._turn_page(1),
+        )
+        self.next_btn.pack(side="right")
+        self.page_label = tk.Label(bar, text="", font=("Segoe UI", 10), fg="#888", bg="#1e1e2e")
+        self.page_label.pack(side="right", padx=6)
+        self.prev_btn = tk.Button(
+            bar, text="‹", font=("Segoe UI", 10), bg="#374151", fg="#e0e0e0",
+            activebackground="#4b5563", activeforeground="white", relief="flat",
+            cursor="hand2", command=lambda: self._turn_page(-1),
+        )
+        self.prev_btn.pack(side="right")
+
+        # ── Button pool (created once, relabelled on every change) ──
+        grid = tk.Frame(self, bg="#1e1e2e")
+        grid.pack(fill="x")
+        self._buttons: list[tk.Button] = []
+        for slot in range(PAGE_SIZE):
+            btn = tk.Button(
+                grid,
+                text="",
+                font=("Segoe UI", 11),
+                bg=BUTTON_BG,
+                fg="white",
+                activebackground="#6d28d9",
+                activeforeground="white",
+                relief="flat",
+                cursor="hand2",
+                command=lambda s=slot: self._pick_slot(s),
+            )
+            row, col = divmod(slot, COLUMNS)
+            btn.grid(row=row, column=col, padx=4, pady=4, sticky="ew", ipady=5)
+            self._buttons.append(btn)
+
+        # Make columns share width evenly
+        for col in range(COLUMNS):
+            grid.columnconfigure(col, weight=1)
+
+    # ── Public API ──
+
+    def set_categories(self, names: list[str]) -> None:
+        """Replace the category list and reset the filter."""
+        # The trie is the only part whose cost grows with the category
+        # count, so it is rebuilt only when the list actually changed
+        if names != self._names:
+            self._names = list(names)
+            self._trie = CategoryTrie(names)
+        self._query = ""
+        self._refilter()
+
+    def top_match(self) -> str | None:
+        return self._matches[0] if self._matches else None
+
+    def set_suggestion(self, name: str | None) -> None:
+        """Highlight the category the current image most likely belongs in."""
+        if name != self._suggested:
+            self._suggested = name
+            self._render()
+
+    def bind_keys(self) -> None:
+        root = self.winfo_toplevel()
+        # More specific bindings (arrows, Ctrl+Z) still win over <Key>
+        root.bind("<Key>", self._on_key)
+        root.bind("<Key-Prior>", lambda e: self._turn_page(-1))
+        root.bind("<Key-Next>", lambda e: self._turn_page(1))
+        self._bound = True
+
+    def unbind_keys(self) -> None:
+        if not self._bound:
+            return
+        root = self.winfo_toplevel()
+        for sequence in ("<Key>", "<Key-Prior>", "<Key-Next>"):
+            root.unbind(sequence)
+        self._cancel_chord()
+        self._bound = False
+
+    # ── Filtering & paging ──
+
+    def _refilter(self):
+        self._matches = self._trie.search(self._query)
+        self._page = 0
+        self._cancel_chord()
+        self._render()
+
+    def _turn_page(self, step: int):
+        page = self._page + step
+        if 0 <= page < self._page_count():
+            self._page = page
+            self._render()
+
+    def _page_count(self) -> int:
+        return max(1, -(-len(self._matches) // PAGE_SIZE))
+
+    def _render(self):
+        first = self._page * PAGE_SIZE
+        single_keys = len(self._matches) <= SINGLE_KEY_LIMIT
+        for slot, btn in enumerate(self._buttons):
+            number = first + slot + 1
+            if number > len(self._matches):
+                btn.grid_remove()
+                continue
+            if single_keys:
+                key = str(number % 10)
+            else:
+                key = str(number)
+            name = self._matches[number - 1]
+            if name == self._suggested:
+                btn.config(text=f"[{key}]  ★ {name}", bg=SUGGESTED_BG, activebackground=SUGGESTED_ACTIVE_BG)
+            else:
+                btn.config(text=f"[{key}]  {name}", bg=BUTTON_BG, activebackground="#6d28d9")
+            btn.grid()
+
+        pages = self._page_count()
+        self.page_label.config(text=f"{self._page + 1} / {pages}" if pages > 1 else "")
+        state = "normal" if pages > 1 else "disabled"
+        self.prev_btn.config(state=state)
+        self.next_btn.config(state=state)
+
+        if self._query:
+            count = len(self._matches)
+            noun = "match" if count == 1 else "matches"
+            text = f"Filter: {self._query}▌  ({count} {noun}, Enter picks the first)"
+            self.filter_label.config(text=text, fg="#c084fc")
+        elif self._chord:
+            self.filter_label.config(text=f"Number: {self._chord}▌", fg="#c084fc")
+        elif self._suggested is not None:
+            self.filter_label.config(text=f"Suggested: {self._suggested}  (Enter to accept)", fg="#34d399")
+        else:
+            self.filter_label.config(text=FILTER_HINT, fg="#666")
+
+    # ── Keyboard ──
+
+    def _on_key(self, event):
+        if event.state & 0x4:  # Control held — leave shortcuts alone
+            return
+        char = event.char
+        if char and char in "0123456789":
+            self._add_digit(char)
+        elif (char.isalpha() and char.isascii()) or char == "-":
+            self._query += char.lower()
+            self._refilter()
+        elif event.keysym == "BackSpace" and self._query:
+            self._query = self._query[:-1]
+            self._refilter()
+        elif event.keysym == "Escape" and (self._query or self._chord):
+            self._query = ""
+            self._refilter()
+        elif event.keysym in ("Return", "KP_Enter"):
+            self._pick(self.top_match() if self._query else self._suggested)
+
+    def _add_digit(self, digit: str):
+        count = len(self._matches)
+        if count <= SINGLE_KEY_LIMIT:
+            index = (int(digit) - 1) % 10
+            if index < count:
+                self._pick(self._matches[index])
+            return
+
+        if not self._chord and digit == "0":
+            return
+        self._chord += digit
+        self._cancel_chord(clear=False)
+        if chord_is_complete(self._chord, count):
+            self._finish_chord()
+        else:
+            self._chord_job = self.after(CHORD_TIMEOUT_MS, self._finish_chord)
+            self._render()
+
+    def _finish_chord(self):
+        self._chord_job = None
+        number, self._chord = int(self._chord or 0), ""
+        if 1 <= number <= len(self._matches):
+            self._pick(self._matches[number - 1])
+        else:
+            self._render()
+
+    def _cancel_chord(self, clear: bool = True):
+        if self._chord_job is not None:
+            self.after_cancel(self._chord_job)
+            self._chord_job = None
+        if clear:
+            self._chord = ""
+
+    def _pick_slot(self, slot: int):
+        index = self._page * PAGE_SIZE + slot
+        if index < len(self._matches):
+            self._pick(self._matches[index])
+
+    def _pick(self, name: str | None):
+        if name is None:
+            return
+        if self._query:
+            self._query = ""
+            self._refilter()
+        else:
+            self._cancel_chord()
+            self._render()
+        self.on_pick(name)
@@ -4,7 +4,29 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog, filedialog
 
 from app.models.category import validate_category_name
-from app.services import category_service, settings_service
+from app.services import category_service, image_service, settings_service
+
+# Labels of image_service.SORT_ORDERS in the order menu
+SORT_ORDER_LABELS = {
+    "name": "Name",
+    "natural": "Name (numbers by value)",
+    "taken": "Date taken",
+    "mtime": "Date modified",
+    "size": "File size",
+    "dimensions": "Dimensions",
+}
+
+# Labels of decode_service.DECODE_BACKENDS (not imported here: it loads Pillow)
+DECODE_BACKEND_LABELS = {
+    "thread": "In threads",
+    "process": "In worker processes (faster on many cores)",
+}
+
+# Banner (text, fg, bg) for each settings_service.TRANSFER_MODES entry
+TRANSFER_BANNERS = {
+    "move": ("⚠  Images will be MOVED, not copied! Keep a backup!", "#fbbf24", "#451a03"),
+    "copy": ("✓  Images will be COPIED — the originals stay where they are", "#86efac", "#14352a"),
+}
 
 
 class CategoryScreen(tk.Frame):
@@ -14,9 +36,15 @@ class CategoryScreen(tk.Frame):
         super().__init__(master)
         self.on_continue = on_continue_callback
         self._build_ui()
+
+    def activate(self):
+        """Refresh from settings; called every time the screen is shown."""
         self._refresh_list()
         self._refresh_folders()
 
+    def deactivate(self):
+        pass
+
     def _build_ui(self):
         # ── Title ──
         title = tk.Label(
@@ -41,17 +69,53 @@ class CategoryScreen(tk.Frame):
         )
         folder_section.pack(padx=20, pady=(10, 5), fill="x")
 
-        # Warning banner
-        warning_frame = tk.Frame(folder_section, bg="#451a03")
-        warning_frame.pack(fill="x", padx=8, pady=(8, 5))
-        warning_label = tk.Label(
-            warning_frame,
-            text="⚠  Images will be MOVED, not copied! Keep a backup!",
+        # Warning banner (reflects the move/copy choice below)
+        self.warning_frame = tk.Frame(folder_section, bg="#451a03")
+        self.warning_frame.pack(fill="x", padx=8, pady=(8, 5))
+        self.warning_label = tk.Label(
+            self.warning_frame,
+            text="",
             font=("Segoe UI", 10, "bold"),
             fg="#fbbf24",
             bg="#451a03",
         )
-        warning_label.pack(padx=10, pady=5)
+        self.warning_label.pack(padx=10, pady=5)
+
+        # Move / copy choice
+        mode_row = tk.Frame(folder_section, bg="#1e1e2e")
+        mode_row.pack(fill="x", padx=8, pady=(0, 3))
+
+        tk.Label(
+            mode_row, text="Sorting:", font=("Segoe UI", 10, "bold"),
+            fg="#a0a0a0", bg="#1e1e2e", width=7, anchor="w",
+        ).pack(side="left")
+
+        self.transfer_var = tk.StringVar()
+        for mode, text in (("move", "Move images"), ("copy", "Copy images (hardlinks/clones when possible)")):
+            tk.Radiobutton(
+                mode_row, text=text, value=mode, variable=self.transfer_var,
+                font=("Segoe UI", 9), fg="#d0d0d0", bg="#1e1e2e",
+                activebackground="#1e1e2e", activeforeground="#e0e0e0",
+                selectcolor="#2a2a3d", anchor="w", command=self._choose_transfer_mode,
+            ).pack(side="left", padx=(0, 10))
+
+        # Where previews are decoded
+        backend_row = tk.Frame(folder_section, bg="#1e1e2e")
+        backend_row.pack(fill="x", padx=8, pady=(0, 3))
+
+        tk.Label(
+            backend_row, text="Decode:", font=("Segoe UI", 10, "bold"),
+            fg="#a0a0a0", bg="#1e1e2e", width=7, anchor="w",
+        ).pack(side="left")
+
+        self.backend_var = tk.StringVar()
+        for backend, text in DECODE_BACKEND_LABELS.items():
+            tk.Radiobutton(
+                backend_row, text=text, value=backend, variable=self.backend_var,
+                font=("Segoe UI", 9), fg="#d0d0d0", bg="#1e1e2e",
+                activebackground="#1e1e2e", activeforeground="#e0e0e0",
+                selectcolor="#2a2a3d", anchor="w", command=self._choose_decode_backend,
+            ).pack(side="left", padx=(0, 10))
 
         # Folder row
         input_row = tk.Frame(folder_section, bg="#1e1e2e")
@@ -75,6 +139,65 @@ class CategoryScreen(tk.Frame):
             command=self._browse_input,
         ).pack(side="right", ipady=1, ipadx=6)
 
+        # Extra folders row
+        extra_row = tk.Frame(folder_section, bg="#1e1e2e")
+        extra_row.pack(fill="x", padx=8, pady=3)
+
+        tk.Label(
+            extra_row, text="Also:", font=("Segoe UI", 10),
+            fg="#a0a0a0", bg="#1e1e2e", width=7, anchor="w",
+        ).pack(side="left")
+
+        self.extra_dirs_label = tk.Label(
+            extra_row, text="", font=("Segoe UI", 9),
+            fg="#d0d0d0", bg="#2a2a3d", anchor="w", relief="flat",
+        )
+        self.extra_dirs_label.pack(side="left", fill="x", expand=True, padx=(0, 5), ipady=3, ipadx=5)
+
+        tk.Button(
+            extra_row, text="Clear", font=("Segoe UI", 9),
+            bg="#374151", fg="#e0e0e0", activebackground="#4b5563",
+            activeforeground="white", relief="flat", cursor="hand2",
+            command=self._clear_extra_folders,
+        ).pack(side="right", ipady=1, ipadx=6)
+
+        tk.Button(
+            extra_row, text="＋ Add", font=("Segoe UI", 9),
+            bg="#374151", fg="#e0e0e0", activebackground="#4b5563",
+            activeforeground="white", relief="flat", cursor="hand2",
+            command=self._browse_extra,
+        ).pack(side="right", padx=(0, 5), ipady=1, ipadx=6)
+
+        # Subfolder toggle + presentation order
+        options_row = tk.Frame(folder_section, bg="#1e1e2e")
+        options_row.pack(fill="x", padx=8)
+
+        self.recursive_var = tk.BooleanVar()
+        tk.Checkbutton(
+            options_row, text="Include subfolders", variable=self.recursive_var,
+            font=("Segoe UI", 9), fg="#d0d0d0", bg="#1e1e2e",
+            activebackground="#1e1e2e", activeforeground="#e0e0e0",
+            selectcolor="#2a2a3d", anchor="w", command=self._toggle_recursive,
+        ).pack(side="left")
+
+        self.order_var = tk.StringVar()
+        order_menu = tk.OptionMenu(
+            options_row, self.order_var,
+            *(SORT_ORDER_LABELS[order] for order in image_service.SORT_ORDERS),
+            command=self._choose_order,
+        )
+        order_menu.config(
+            font=("Segoe UI", 9), bg="#374151", fg="#e0e0e0",
+            activebackground="#4b5563", activeforeground="white",
+            relief="flat", highlightthickness=0, cursor="hand2",
+        )
+        order_menu["menu"].config(font=("Segoe UI", 9), bg="#2a2a3d", fg="#e0e0e0")
+        order_menu.pack(side="right", ipadx=4)
+        tk.Label(
+            options_row, text="Order:", font=("Segoe UI", 9),
+            fg="#a0a0a0", bg="#1e1e2e",
+        ).pack(side="right", padx=(0, 4))
+
         # Sorted-to row (read-only, derived from folder)
         output_row = tk.Frame(folder_section, bg="#1e1e2e")
         output_row.pack(fill="x", padx=8, pady=(3, 8))
@@ -223,8 +346,45 @@ class CategoryScreen(tk.Frame):
             settings_service.set_input_dir(folder)
             self._refresh_folders()
 
+    def _browse_extra(self):
+        folder = filedialog.askdirectory(title="Add Another Images Folder")
+        if folder:
+            settings_service.add_extra_input_dir(folder)
+            self._refresh_folders()
+
+    def _clear_extra_folders(self):
+        settings_service.clear_extra_input_dirs()
+        self._refresh_folders()
+
+    def _toggle_recursive(self):
+        settings_service.set_recursive(self.recursive_var.get())
+
+    def _choose_transfer_mode(self):
+        settings_service.set_transfer_mode(self.transfer_var.get())
+        self._refresh_banner()
+
+    def _choose_decode_backend(self):
+        settings_service.set_decode_backend(self.backend_var.get())
+
+    def _refresh_banner(self):
+        text, fg, bg = TRANSFER_BANNERS[settings_service.get_transfer_mode()]
+        self.warning_frame.config(bg=bg)
+        self.warning_label.config(text=text, fg=fg, bg=bg)
+
+    def _choose_order(self, label: str):
+        order = next(o for o, text in SORT_ORDER_LABELS.items() if text == label)
+        settings_service.set_sort_order(order)
+
     def _refresh_folders(self):
-        self.input_dir_label.config(text=settings_service.get_settings()["input_dir"])
+        settings = settings_service.get_settings()
+        self.input_dir_label.config(text=settings["input_dir"])
+        self.extra_dirs_label.config(text="; ".join(settings["extra_input_dirs"]) or "—")
+        self.recursive_var.set(settings["recursive"])
+        self.order_var.set(SORT_ORDER_LABELS[image_service.get_sort_order()])
+        self.transfer_var.set(settings_service.get_transfer_mode())
+        backend = settings["decode_backend"]
+        self.backend_var.set(backend if backend in DECODE_BACKEND_LABELS else "thread")
+        self._refresh_banner()
         self.output_dir_label.config(text=str(settings_service.get_output_dir()))
 
     # ── Category actions ──
@@ -280,5 +440,5 @@ class CategoryScreen(tk.Frame):
 
     def _refresh_list(self):
         self.listbox.delete(0, tk.END)
-        for cat in category_service.get_categories():
-            self.listbox.insert(tk.END, cat.name)
+        # One call instead of one per category keeps long lists fast
+        self.listbox.insert(tk.END, *(cat.name for cat in category_service.get_categories()))
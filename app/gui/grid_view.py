@@ -0,0 +1,308 @@
+"""Contact-sheet view — a scrollable grid of thumbnails with multi-select."""
+
+import tkinter as tk
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+
+from PIL import ImageTk
+
+from app.services import decode_service, timing_service
+from app.services.memory_service import KIND_PHOTO, get_memory_manager, photo_bytes
+from app.services.prefetch_service import Prefetcher
+from app.services.thumbnail_cache_service import load_cached_preview
+
+TILE_SIZE = (160, 120)
+CELL_WIDTH = TILE_SIZE[0] + 16
+CELL_HEIGHT = TILE_SIZE[1] + 34
+
+# Rows decoded beyond the viewport so short scrolls find tiles ready
+OVERSCAN_ROWS = 1
+
+# Memory for decoded thumbnails; off-screen ones go first
+GRID_MAX_BYTES = 64 * 1024 * 1024
+
+# Pointer travel (pixels) before a press counts as a rubber-band drag
+DRAG_THRESHOLD = 4
+
+_MOD_SHIFT = 0x1
+_MOD_CONTROL = 0x4
+
+
+class GridView(tk.Frame):
+    """Thumbnail grid over a list of images, reporting selection changes."""
+
+    def __init__(self, master, on_selection_change: Callable[[], None] | None = None):
+        super().__init__(master, bg="#2a2a3d", highlightthickness=1, highlightbackground="#3a3a5c")
+        self.on_selection_change = on_selection_change
+        self.images: list[Path] = []
+        self.selected: set[Path] = set()
+        self._index: dict[Path, int] = {}
+        self._anchor: int | None = None
+        self._photos: dict[Path, ImageTk.PhotoImage] = {}
+        self._visible: list[Path] = []
+        self._memory = get_memory_manager()
+        self._prefetcher = Prefetcher(
+            loader=partial(load_cached_preview, size=TILE_SIZE),
+            fast_loader=None,
+            max_bytes=GRID_MAX_BYTES,
+            workers=decode_service.prefetch_workers(),
+            memory=self._memory,
+        )
+        self._redraw_job = None
+        self._press: tuple[float, float, int] | None = None
+        self._band_base: set[Path] = set()
+
+        self.canvas = tk.Canvas(self, bg="#2a2a3d", highlightthickness=0, yscrollincrement=CELL_HEIGHT // 2)
+        scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_units(1))
+
+    # ── Public API ──
+
+    def set_images(self, images: list[Path]) -> None:
+        """Show ``images``; the selection keeps whichever are still present."""
+        self.images = list(images)
+        self._index = {path: i for i, path in enumerate(images)}
+        self.selected &= self._index.keys()
+        if self._anchor is not None and self._anchor >= len(images):
+            self._anchor = None
+        self._layout()
+
+    def add_images(self, paths: list[Path]) -> None:
+        """Append images (e.g. a scan batch) without rebuilding the index."""
+        for path in paths:
+            self._index[path] = len(self.images)
+            self.images.append(path)
+        self._layout()
+
+    def select(self, paths: list[Path]) -> None:
+        self.selected = {p for p in paths if p in self._index}
+        if paths and paths[0] in self._index:
+            self._anchor = self._index[paths[0]]
+            self.see(paths[0])
+        self._selection_changed()
+
+    def select_all(self) -> None:
+        self.selected = set(self.images)
+        self._selection_changed()
+
+    def selection(self) -> list[Path]:
+        """Selected images in grid order."""
+        return sorted(self.selected, key=self._index.__getitem__)
+
+    def see(self, path: Path) -> None:
+        """Scroll so ``path`` is in view."""
+        y = self._index[path] // self._columns() * CELL_HEIGHT
+        top = self.canvas.canvasy(0)
+        if y < top or y + CELL_HEIGHT > top + self.canvas.winfo_height():
+            self.canvas.yview_moveto(y / max(1, self._rows() * CELL_HEIGHT))
+            self._schedule_redraw()
+
+    def poll(self) -> None:
+        """Pick up decoded thumbnails; called from the screen's ``after()`` loop."""
+        arrived = self._prefetcher.poll()
+        if any(path in self._visible for path in arrived):
+            self._schedule_redraw()
+
+    def clear(self) -> None:
+        """Release thumbnails and pending decodes (the grid was hidden)."""
+        self._prefetcher.clear()
+        self._keep_photos(set())
+        self._visible = []
+        self.canvas.delete("all")
+
+    def shutdown(self) -> None:
+        self.clear()
+        self._prefetcher.shutdown()
+
+    # ── Layout & drawing ──
+
+    def _columns(self) -> int:
+        return max(1, self.canvas.winfo_width() // CELL_WIDTH)
+
+    def _rows(self) -> int:
+        return -(-len(self.images) // self._columns())
+
+    def _layout(self):
+        width = self._columns() * CELL_WIDTH
+        self.canvas.configure(scrollregion=(0, 0, width, self._rows() * CELL_HEIGHT))
+        self._schedule_redraw()
+
+    def _on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_redraw()
+
+    def _on_wheel(self, event):
+        self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _scroll_units(self, units: int):
+        self.canvas.yview_scroll(units, "units")
+        self._schedule_redraw()
+
+    def _schedule_redraw(self):
+        # Coalesce bursts of scroll events into one redraw per idle cycle
+        if self._redraw_job is None:
+            self._redraw_job = self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_job = None
+        with timing_service.span("grid.redraw"):
+            self._draw_visible()
+
+    def _draw_visible(self):
+        self.canvas.delete("tile")
+        if not self.images:
+            self._visible = []
+            self._keep_photos(set())
+            return
+
+        columns = self._columns()
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // CELL_HEIGHT) - OVERSCAN_ROWS)
+        last_row = min(self._rows() - 1, int(bottom // CELL_HEIGHT) + OVERSCAN_ROWS)
+        start = first_row * columns
+        visible = self.images[start:(last_row + 1) * columns]
+        self._visible = visible
+
+        # Decode what is on screen first, then the page below, then above
+        page = len(visible)
+        self._prefetcher.update(
+            visible[0],
+            ahead=visible[1:] + self.images[start + page:start + 2 * page],
+            behind=self.images[max(0, start - columns):start],
+        )
+        # Photo objects are the expensive Tk-side copies; keep visible ones only
+        self._keep_photos(set(visible))
+
+        for offset, path in enumerate(visible):
+            self._draw_tile(start + offset, path, columns)
+
+    def _draw_tile(self, index: int, path: Path, columns: int):
+        row, col = divmod(index, columns)
+        x, y = col * CELL_WIDTH, row * CELL_HEIGHT
+        selected = path in self.selected
+        self.canvas.create_rectangle(
+            x + 4, y + 4, x + CELL_WIDTH - 4, y + CELL_HEIGHT - 4,
+            fill="#4c1d95" if selected else "#1e1e2e",
+            outline="#c084fc" if selected else "#3a3a5c",
+            width=2 if selected else 1,
+            tags="tile",
+        )
+        center_x = x + CELL_WIDTH // 2
+        center_y = y + 8 + TILE_SIZE[1] // 2
+
+        photo = self._photos.get(path)
+        if photo is None:
+            result = self._prefetcher.get(path)
+            if result is not None and not isinstance(result, Exception):
+                with timing_service.span("photo.convert"):
+                    photo = self._photos[path] = ImageTk.PhotoImage(result)
+                self._memory.track(self, path, photo_bytes(photo), KIND_PHOTO, pinned=True)
+        if photo is not None:
+            self.canvas.create_image(center_x, center_y, image=photo, tags="tile")
+        else:
+            failed = isinstance(self._prefetcher.get(path), Exception)
+            self.canvas.create_text(
+                center_x, center_y, text="⚠" if failed else "…",
+                fill="#f87171" if failed else "#666", font=("Segoe UI", 14), tags="tile",
+            )
+
+        name = path.name if len(path.name) <= 24 else path.name[:21] + "…"
+        self.canvas.create_text(
+            center_x, y + CELL_HEIGHT - 14, text=name,
+            fill="#e0e0e0" if selected else "#aaa", font=("Segoe UI", 8), tags="tile",
+        )
+
+    def _keep_photos(self, wanted: set[Path]):
+        for path in [p for p in self._photos if p not in wanted]:
+            del self._photos[path]
+            self._memory.release(self, path)
+
+    # ── Selection ──
+
+    def _index_at(self, x: float, y: float) -> int | None:
+        columns = self._columns()
+        col, row = int(x // CELL_WIDTH), int(y // CELL_HEIGHT)
+        if x < 0 or y < 0 or col >= columns:
+            return None
+        index = row * columns + col
+        return index if index < len(self.images) else None
+
+    def _indexes_in(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[int]:
+        """Indexes of the tiles a rubber band touches, row by row."""
+        columns = self._columns()
+        left, right = sorted((x0, x1))
+        top, bottom = sorted((y0, y1))
+        first_col = max(0, int(left // CELL_WIDTH))
+        last_col = min(columns - 1, int(right // CELL_WIDTH))
+        first_row = max(0, int(top // CELL_HEIGHT))
+        last_row = min(self._rows() - 1, int(bottom // CELL_HEIGHT))
+        for row in range(first_row, last_row + 1):
+            start = row * columns
+            yield from range(start + first_col, min(start + last_col + 1, len(self.images)))
+
+    def _on_press(self, event):
+        self.canvas.focus_set()
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        self._press = (x, y, event.state)
+        self._band_base = set(self.selected) if event.state & (_MOD_SHIFT | _MOD_CONTROL) else set()
+
+    def _on_drag(self, event):
+        if self._press is None:
+            return
+        x0, y0, _ = self._press
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        if abs(x - x0) < DRAG_THRESHOLD and abs(y - y0) < DRAG_THRESHOLD:
+            return
+        self.canvas.delete("band")
+        self.canvas.create_rectangle(x0, y0, x, y, outline="#c084fc", dash=(3, 2), tags="band")
+        self.selected = self._band_base | {self.images[i] for i in self._indexes_in(x0, y0, x, y)}
+        self._selection_changed(keep_band=True)
+
+    def _on_release(self, event):
+        if self._press is None:
+            return
+        x0, y0, state = self._press
+        self._press = None
+        if self.canvas.find_withtag("band"):
+            self.canvas.delete("band")
+            return
+
+        index = self._index_at(x0, y0)
+        if index is None:
+            if not state & (_MOD_SHIFT | _MOD_CONTROL):
+                self.selected = set()
+                self._selection_changed()
+            return
+
+        path = self.images[index]
+        if state & _MOD_SHIFT and self._anchor is not None:
+            low, high = sorted((self._anchor, index))
+            extra = set(self.images[low:high + 1])
+            self.selected = (self.selected | extra) if state & _MOD_CONTROL else extra
+        elif state & _MOD_CONTROL:
+            self.selected ^= {path}
+            self._anchor = index
+        else:
+            self.selected = {path}
+            self._anchor = index
+        self._selection_changed()
+
+    def _selection_changed(self, keep_band: bool = False):
+        self._schedule_redraw()
+        if keep_band:
+            # The band is redrawn after the tiles so it stays on top
+            self.after_idle(lambda: self.canvas.tag_raise("band"))
+        if self.on_selection_change is not None:
+            self.on_selection_change()
@@ -1,12 +1,41 @@
 """Sorting screen — display images one-by-one with category buttons."""
 
+import time
 import tkinter as tk
 from tkinter import messagebox
 from pathlib import Path
 
-from PIL import Image, ImageTk
-
-from app.services import category_service, image_service, sorting_service, settings_service
+from app.gui.category_picker import CategoryPicker
+from app.gui.grid_view import GridView
+from app.gui.timing_overlay import TimingOverlay
+from app.gui.zoom_view import ZOOM_STEP, ZoomView
+from app.services import (
+    category_service, decode_service, image_service, index_service, journal_service, settings_service,
+    sorting_service, timing_service,
+)
+from app.services.duplicate_service import MAX_GROUP_SIZE, DuplicateFinder
+from app.services.memory_service import get_memory_manager
+from app.services.move_queue_service import get_move_queue
+from app.services.prefetch_service import DEFAULT_AHEAD, DEFAULT_BEHIND, Prefetcher
+from app.services.suggestion_service import get_suggester
+from app.services.thumbnail_cache_service import load_cached_fast_preview, load_cached_preview
+from app.services.watch_service import FolderWatcher
+
+# How often the Tk loop picks up previews and moves finished in the background
+POLL_MS = 15
+
+# Images ahead of the current one whose features are extracted for suggestions
+SUGGEST_AHEAD = 3
+
+NAVIGATION_KEYS = ["Left", "Right"]
+UNDO_SEQUENCES = ["<Control-z>", "<Control-Z>"]
+GRID_SEQUENCES = ["<Control-g>", "<Control-G>"]
+SELECT_ALL_SEQUENCES = ["<Control-a>", "<Control-A>"]
+OVERLAY_SEQUENCES = ["<Key-F3>"]
+ZOOM_IN_SEQUENCES = ["<Control-plus>", "<Control-equal>", "<Control-KP_Add>"]
+ZOOM_OUT_SEQUENCES = ["<Control-minus>", "<Control-KP_Subtract>"]
+ZOOM_FIT_SEQUENCES = ["<Control-Key-0>", "<Control-KP_0>"]
+ZOOM_SEQUENCES = ZOOM_IN_SEQUENCES + ZOOM_OUT_SEQUENCES + ZOOM_FIT_SEQUENCES
 
 
 class SortingScreen(tk.Frame):
@@ -16,11 +45,37 @@ class SortingScreen(tk.Frame):
         super().__init__(master, bg="#1e1e2e")
         self.on_back = on_back_callback
         self.images: list[Path] = []
+        self._listed: set[Path] = set()  # the same paths, for lookups
         self.current_index: int = 0
-        self._photo_ref = None  # prevent garbage collection
+        self._sorted: set[Path] = set()
+        self._memory = get_memory_manager()
+        self._prefetcher = Prefetcher(
+            loader=load_cached_preview,
+            fast_loader=load_cached_fast_preview,
+            workers=decode_service.prefetch_workers(),
+            memory=self._memory,
+        )
+        self._moves = get_move_queue()
+        self._suggester = get_suggester()
+        self._categories: list[str] = []
+        self._duplicates: DuplicateFinder | None = None
+        self._scan: image_service.ImageScan | None = None
+        # Images found while a scan in another order than by name runs; they
+        # are shown once the scan has put them in order
+        self._held: list[Path] | None = None
+        self._watcher: FolderWatcher | None = None
+        self._rejected: list[Path] = []  # broken / non-image files skipped by the scan
+        self._journal: journal_service.Journal | None = None
+        # One entry per decision (an image plus any near-duplicates sorted with it)
+        self._decisions: list[list[Path]] = []
+        # Undone decisions waiting for moves in progress to land: (group, moved)
+        self._undoing: list[tuple[list[Path], list[Path]]] = []
+        self._grid_mode = False
+        self._poll_job = None
+        # When the current image was asked for, until its first preview shows
+        self._requested_at: float | None = None
 
         self._build_ui()
-        self._load_images()
 
     def _build_ui(self):
         # ── Top bar ──
@@ -41,6 +96,35 @@ class SortingScreen(tk.Frame):
         )
         back_btn.pack(side="left")
 
+        self.undo_btn = tk.Button(
+            top_bar,
+            text="↶ Undo",
+            font=("Segoe UI", 10),
+            bg="#374151",
+            fg="#e0e0e0",
+            activebackground="#4b5563",
+            activeforeground="white",
+            relief="flat",
+            cursor="hand2",
+            state="disabled",
+            command=self._undo,
+        )
+        self.undo_btn.pack(side="left", padx=(8, 0))
+
+        self.grid_btn = tk.Button(
+            top_bar,
+            text="▦ Grid",
+            font=("Segoe UI", 10),
+            bg="#374151",
+            fg="#e0e0e0",
+            activebackground="#4b5563",
+            activeforeground="white",
+            relief="flat",
+            cursor="hand2",
+            command=self._toggle_grid,
+        )
+        self.grid_btn.pack(side="left", padx=(8, 0))
+
         self.progress_label = tk.Label(
             top_bar,
             text="",
@@ -54,8 +138,11 @@ class SortingScreen(tk.Frame):
         self.image_frame = tk.Frame(self, bg="#2a2a3d", highlightthickness=1, highlightbackground="#3a3a5c")
         self.image_frame.pack(padx=20, pady=10, fill="both", expand=True)
 
-        self.image_label = tk.Label(self.image_frame, bg="#2a2a3d")
-        self.image_label.pack(expand=True, fill="both", padx=10, pady=10)
+        self.viewer = ZoomView(self.image_frame, bg="#2a2a3d")
+        self.viewer.pack(expand=True, fill="both", padx=10, pady=10)
+
+        # ── Contact sheet (grid mode only) ──
+        self.grid_view = GridView(self, on_selection_change=self._update_progress)
 
         self.filename_label = tk.Label(
             self,
@@ -66,9 +153,24 @@ class SortingScreen(tk.Frame):
         )
         self.filename_label.pack(pady=(0, 5))
 
-        # ── Category buttons container ──
-        self.btn_frame = tk.Frame(self, bg="#1e1e2e")
-        self.btn_frame.pack(padx=20, pady=(5, 15), fill="x")
+        # ── Near-duplicate group toggle (shown only when there are matches) ──
+        self.group_var = tk.BooleanVar(value=settings_service.get_settings()["group_similar"])
+        self.group_check = tk.Checkbutton(
+            self,
+            text="",
+            variable=self.group_var,
+            font=("Segoe UI", 10),
+            fg="#fbbf24",
+            bg="#1e1e2e",
+            activebackground="#1e1e2e",
+            activeforeground="#fcd34d",
+            selectcolor="#2a2a3d",
+            command=lambda: settings_service.set_group_similar(self.group_var.get()),
+        )
+
+        # ── Category buttons ──
+        self.picker = CategoryPicker(self, on_pick=self._on_category)
+        self.picker.pack(padx=20, pady=(5, 15), fill="x")
 
         # ── "All done" label (hidden initially) ──
         self.done_label = tk.Label(
@@ -79,141 +181,622 @@ class SortingScreen(tk.Frame):
             bg="#1e1e2e",
         )
 
-    def _load_images(self):
-        self.images = image_service.get_image_list()
+        # ── Latency overlay (F3) ──
+        self.timing_overlay = TimingOverlay(self)
+
+    def activate(self):
+        """Start a sorting session; called every time the screen is shown."""
+        self.images = []
+        self._listed = set()
         self.current_index = 0
+        self._sorted = set()
+        self._decisions = []
+        self._rejected = []
+        self.undo_btn.config(state="disabled")
+        self.group_var.set(settings_service.get_settings()["group_similar"])
+        self._duplicates = DuplicateFinder()
+
+        self._show_sorting_view()
+        self._categories = [cat.name for cat in category_service.get_categories()]
+        self.picker.set_categories(self._categories)
+        if not self._suggester.example_count:
+            # First run: learn from images sorted before suggestions existed
+            self._suggester.seed(index_service.get_index().decisions())
+        self._load_images()
+
+    def deactivate(self):
+        """Stop background work; the session stays resumable."""
+        if self._undoing:
+            # Leaving the screen: let the last moves land so the undos happen
+            self._moves.flush()
+            self._finish_undos()
+        if self._scan is not None:
+            self._scan.cancel()
+            self._scan = None
+            self._held = None
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._unbind_keys()
+        root = self.winfo_toplevel()
+        for sequence in UNDO_SEQUENCES + OVERLAY_SEQUENCES:
+            root.unbind(sequence)
+        self.timing_overlay.hide()
+        self._prefetcher.clear()
+        self.grid_view.clear()
+        self.viewer.clear()
+        if self._duplicates is not None:
+            self._duplicates.shutdown()
+        if self._journal is not None:
+            self._journal.sync()
+        try:
+            self._suggester.save()
+        except OSError:
+            pass  # saved again on exit
 
-        if not self.images:
+    def _load_images(self):
+        """Start listing the input folder; images appear as batches arrive.
+
+        If the last session over the same folders was left unfinished, offer
+        to pick it up from the journal instead — no rescan needed.  Either
+        way the folders are watched for changes from then on.
+        """
+
+        roots = settings_service.get_input_roots()
+        state = journal_service.find_resumable(roots)
+        if state is not None and messagebox.askyesno(
+            "Resume Session",
+            f"An unfinished session with {len(state.remaining_images())} images left was found.\n\n"
+            "Continue where you left off?",
+        ):
+            self._resume(state)
+        else:
+            self._journal = journal_service.start_session(roots)
+            order = image_service.get_sort_order()
+            self._scan = image_service.ImageScan(order=order)
+            self._held = None if order == image_service.DEFAULT_SORT_ORDER else []
+            self._rejected = self._scan.rejected
+            self._show_waiting()
+        self._watcher = FolderWatcher(*image_service.input_scope())
+        self._poll_background()
+
+    def _resume(self, state: journal_service.SessionState):
+        self._journal = journal_service.resume_session(state)
+        queued = self._moves.pending_sources()
+        self.images = [p for p in state.remaining_images() if p not in queued]
+        self._listed = set(self.images)
+        self._duplicates.add_images(self.images)
+        if state.position in self.images:
+            self.current_index = self.images.index(state.position)
+        self._refresh()
+
+    def _collect_scanned(self):
+        """Append newly listed images; finish up once the scan completes."""
+        found = self._scan.poll()
+        if found and self._held is not None:
+            # Batches arrive in directory order: showing one now would start
+            # the session on an image that may not come first
+            self._held.extend(found)
+            self._update_progress()
+        elif found:
+            # Images still waiting in the move queue are as good as sorted;
+            # the watcher may have reported some of the others already
+            queued = self._moves.pending_sources()
+            added = [p for p in found if p not in queued and p not in self._listed]
+            if added:
+                self._append_images(added)
+
+        if self._scan.done:
+            scan, self._scan = self._scan, None
+            # Subfolders found by the scan are watched too
+            self._watcher.watch_indexed()
+            if self._held is not None:
+                held, self._held = self._held, None
+                self._append_ordered(held, scan.ordered)
+            # Batches arrive in directory order; put what's left in the
+            # chosen order, which the scan worked out on its own thread
+            elif scan.ordered is not None:
+                rank = {path: i for i, path in enumerate(scan.ordered)}
+                upcoming = self.images[self.current_index + 1:]
+                self.images[self.current_index + 1:] = sorted(upcoming, key=lambda p: rank.get(p, len(rank)))
+            # Lets a later launch resume without listing the folders again
+            self._journal.record("snapshot", images=[str(p) for p in self.images])
+
+            if scan.error is not None:
+                messagebox.showerror("Error", f"Failed to list images:\n{scan.error}")
+            if not self.images:
+                self._show_no_images()
+            else:
+                self._refresh()
+
+    def _append_ordered(self, held: list[Path], ordered: list[Path] | None):
+        """Queue the images held back during the scan, in the scan's order."""
+        found = set(held)
+        if ordered is not None:
+            # Only what is still there; anything the index missed goes last
+            listed = set(ordered)
+            held = [p for p in ordered if p in found] + [p for p in held if p not in listed]
+        queued = self._moves.pending_sources()
+        added = [p for p in dict.fromkeys(held) if p not in queued and p not in self._listed]
+        self.images.extend(added)
+        self._listed.update(added)
+        self._duplicates.add_images(added)
+
+    def _collect_changes(self):
+        """Fold images added to or removed from the input folders into the queue."""
+        changes = self._watcher.poll()
+        if not changes:
+            return
+        # Our own moves out of the folder (and undos back in) are reported too
+        gone = {p for p in changes.removed if p in self._listed and p not in self._sorted}
+        added = [p for p in dict.fromkeys(changes.added) if p not in self._listed]
+        if self._scan is None:
+            # Keep the journal's snapshot current for resuming
+            if added:
+                self._journal.record("added", images=[str(p) for p in added])
+            if gone:
+                self._journal.record("removed", images=[str(p) for p in gone])
+        if self._held is not None:
+            # Still waiting for the scan's order: nothing is shown yet
+            removed = set(changes.removed)
+            self._held = [p for p in self._held if p not in removed] + added
+            added = []
+        if gone:
+            self._drop_images(gone)
+        if added:
+            self._append_images(added)
+
+    def _append_images(self, added: list[Path]):
+        """Queue newly found images, showing the first if the queue had run dry."""
+        waiting = self.current_index >= len(self.images)
+        self.images.extend(added)
+        self._listed.update(added)
+        self._duplicates.add_images(added)
+        if self.done_label.winfo_manager():
+            # Everything was sorted, and now there is more
+            self.current_index = len(self.images) - len(added)
+            self._show_sorting_view()
+            self._refresh()
+        elif self._grid_mode:
+            self.grid_view.add_images(added)
+            self._update_progress()
+        elif waiting:
+            self._show_current_image()
+        else:
+            self._update_progress()
+
+    def _drop_images(self, gone: set[Path]):
+        """Forget images that were deleted or moved away behind our back."""
+        current = self.images[self.current_index] if self.current_index < len(self.images) else None
+        self.current_index -= sum(1 for p in self.images[:self.current_index] if p in gone)
+        self.images = [p for p in self.images if p not in gone]
+        self._listed -= gone
+        for path in gone:
+            self._prefetcher.discard(path)
+
+        if self.done_label.winfo_manager():
+            return
+        if not self.images and self._scan is None:
             self._show_no_images()
+        elif self._grid_mode:
+            self._refresh()
+        elif current in gone:
+            self.current_index = self._next_unsorted(self.current_index)
+            self._show_current_image()
+        else:
+            self._update_progress()
+
+    def _refresh(self):
+        """Redisplay after the image list or the sorted set changed."""
+        if not self._grid_mode:
+            self._show_current_image()
             return
+        unsorted = [p for p in self.images if p not in self._sorted]
+        if not unsorted and self._scan is None:
+            self._show_done()
+            return
+        self.grid_view.set_images(unsorted)
+        self._update_progress()
 
-        self._build_category_buttons()
-        self._show_current_image()
-
-    def _build_category_buttons(self):
-        # Clear previous buttons
-        for widget in self.btn_frame.winfo_children():
-            widget.destroy()
-
-        categories = category_service.get_categories()
-        # Keys 1-9 then 0 for the 10th
-        key_labels = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]
-
-        # Create a grid of buttons, 5 per row
-        for i, cat in enumerate(categories):
-            key = key_labels[i] if i < 10 else ""
-            label_text = f"[{key}]  {cat.name}" if key else cat.name
-
-            btn = tk.Button(
-                self.btn_frame,
-                text=label_text,
-                font=("Segoe UI", 11),
-                bg="#7c3aed",
-                fg="white",
-                activebackground="#6d28d9",
-                activeforeground="white",
-                relief="flat",
-                cursor="hand2",
-                command=lambda name=cat.name: self._sort_current(name),
-            )
-            row, col = divmod(i, 5)
-            btn.grid(row=row, column=col, padx=4, pady=4, sticky="ew", ipady=5)
-
-        # Make columns share width evenly
-        for col in range(5):
-            self.btn_frame.columnconfigure(col, weight=1)
-
-        # Bind keyboard shortcuts
-        self._bind_keys(categories)
-
-    def _bind_keys(self, categories):
-        """Bind number keys 1-9 and 0 to the first 10 categories."""
+    def _bind_keys(self):
+        """Bind navigation, undo and the picker's category keys."""
         root = self.winfo_toplevel()
 
-        # Unbind previous
-        for k in ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]:
-            root.unbind(f"<Key-{k}>")
+        # Arrow keys skip forward / go back without sorting
+        root.bind("<Key-Right>", lambda e: self._step(1))
+        root.bind("<Key-Left>", lambda e: self._step(-1))
+
+        # Undo and the overlay stay available on the "all done" view, so they are bound apart
+        for sequence in UNDO_SEQUENCES:
+            root.bind(sequence, lambda e: self._undo())
+        for sequence in OVERLAY_SEQUENCES:
+            root.bind(sequence, lambda e: self.timing_overlay.toggle())
+
+        for sequence in GRID_SEQUENCES:
+            root.bind(sequence, lambda e: self._toggle_grid())
+        for sequence in SELECT_ALL_SEQUENCES:
+            root.bind(sequence, lambda e: self._grid_mode and self.grid_view.select_all())
 
-        key_map = {
-            "1": 0, "2": 1, "3": 2, "4": 3, "5": 4,
-            "6": 5, "7": 6, "8": 7, "9": 8, "0": 9,
-        }
+        for sequence in ZOOM_IN_SEQUENCES:
+            root.bind(sequence, lambda e: self.viewer.zoom(ZOOM_STEP))
+        for sequence in ZOOM_OUT_SEQUENCES:
+            root.bind(sequence, lambda e: self.viewer.zoom(1 / ZOOM_STEP))
+        for sequence in ZOOM_FIT_SEQUENCES:
+            root.bind(sequence, lambda e: self.viewer.zoom_fit())
 
-        for key, index in key_map.items():
-            if index < len(categories):
-                cat_name = categories[index].name
-                root.bind(
-                    f"<Key-{key}>",
-                    lambda e, name=cat_name: self._sort_current(name),
-                )
+        self.picker.bind_keys()
+
+    def _unbind_keys(self):
+        root = self.winfo_toplevel()
+        for k in NAVIGATION_KEYS:
+            root.unbind(f"<Key-{k}>")
+        for sequence in GRID_SEQUENCES + SELECT_ALL_SEQUENCES + ZOOM_SEQUENCES:
+            root.unbind(sequence)
+        self.picker.unbind_keys()
 
     def _show_current_image(self):
         if self.current_index >= len(self.images):
-            self._show_done()
+            if self._scan is not None:
+                self._show_waiting()
+            else:
+                self._show_done()
             return
 
         image_path = self.images[self.current_index]
-        total = len(self.images)
 
-        self.progress_label.config(
-            text=f"Image {self.current_index + 1} of {total}"
-        )
+        self._update_progress()
         self.filename_label.config(text=image_path.name)
+        self._update_group()
+        self._journal.note_position(image_path)
+
+        self._schedule_prefetch()
+        self._suggester.prepare([image_path] + self._neighbours(1, SUGGEST_AHEAD))
+        self._update_suggestion()
+        self._requested_at = time.perf_counter()
+        result = self._prefetcher.get(image_path)
+        if result is None:
+            # Not decoded yet — _poll_background shows it as soon as it lands
+            self.viewer.show_message("Loading…")
+        else:
+            self._display(image_path, result)
+
+    def _display(self, image_path: Path, result):
+        """Show a prefetched preview, or the error raised while loading it."""
+        if isinstance(result, Exception):
+            self.viewer.show_message(f"⚠ Cannot display image:\n{result}", fg="#f87171")
+            return
+        self.viewer.show(image_path, result)
+        if self._requested_at is not None:
+            # Navigation to pixels on screen, including any wait for the decode
+            timing_service.record("display.latency", time.perf_counter() - self._requested_at)
+            self._requested_at = None
+
+    def _schedule_prefetch(self):
+        """Point the prefetcher at the images around the current one."""
+        self._prefetcher.update(
+            self.images[self.current_index],
+            ahead=self._neighbours(1, DEFAULT_AHEAD),
+            behind=self._neighbours(-1, DEFAULT_BEHIND),
+        )
 
-        # Load & resize image to fit the frame
-        try:
-            pil_image = Image.open(image_path)
-            pil_image.thumbnail((700, 500), Image.LANCZOS)
-            self._photo_ref = ImageTk.PhotoImage(pil_image)
-            self.image_label.config(image=self._photo_ref, text="")
-        except Exception as e:
-            self.image_label.config(
-                image="",
-                text=f"⚠ Cannot display image:\n{e}",
-                font=("Segoe UI", 12),
-                fg="#f87171",
-            )
-            self._photo_ref = None
+    def _neighbours(self, direction: int, count: int) -> list[Path]:
+        """Up to ``count`` unsorted images next to the current one."""
+        found = []
+        i = self.current_index + direction
+        while 0 <= i < len(self.images) and len(found) < count:
+            if self.images[i] not in self._sorted:
+                found.append(self.images[i])
+            i += direction
+        return found
+
+    def _update_progress(self):
+        scanning = "…" if self._scan is not None else ""
+        if self._grid_mode:
+            text = f"{len(self.grid_view.images)} unsorted{scanning}  ·  {len(self.grid_view.selected)} selected"
+        elif self.current_index < len(self.images):
+            text = f"Image {self.current_index + 1} of {len(self.images)}{scanning}"
+        elif self._scan is not None:
+            text = f"{len(self.images) + len(self._held or ())} images{scanning}"
+        else:
+            text = "Done"
+        if self._rejected:
+            text += f"  ·  {len(self._rejected)} unreadable skipped"
+        pending = self._moves.pending_count()
+        if pending:
+            text += f"  ·  moving {pending}…"
+        self.progress_label.config(text=text)
+
+    def _poll_background(self):
+        """Pick up scan results, finished previews and moves from the workers."""
+        if self._scan is not None:
+            self._collect_scanned()
+        if self._watcher is not None:
+            self._collect_changes()
+
+        if self._grid_mode:
+            self.grid_view.poll()
+            self._duplicates.poll()
+        elif self.current_index < len(self.images):
+            current = self.images[self.current_index]
+            if current in self._prefetcher.poll():
+                self._display(current, self._prefetcher.get(current))
+            self.viewer.poll()
+            if self._duplicates.poll():
+                self._update_group()
+        if self._suggester.poll():
+            self._update_suggestion()
+
+        finished = self._moves.poll()
+        if self._undoing:
+            self._finish_undos()
+        if finished:
+            for job in finished:
+                if job.destination is not None:
+                    self._suggester.note_moved(job.source, job.destination)
+            self._update_progress()
+            failed = [job for job in finished if job.error is not None]
+            if failed:
+                self._report_failed_moves(failed)
+
+        self._poll_job = self.after(POLL_MS, self._poll_background)
+
+    def _report_failed_moves(self, failed):
+        # The files are still in the input folder, so they count as unsorted
+        for job in failed:
+            self._sorted.discard(job.source)
+        details = "\n".join(f"{job.source.name}: {job.error}" for job in failed[:10])
+        if len(failed) > 10:
+            details += f"\n… and {len(failed) - 10} more"
+        messagebox.showerror("Error", f"Failed to sort image:\n{details}")
+
+    def _find_unsorted(self, start: int, direction: int) -> int | None:
+        i = start
+        while 0 <= i < len(self.images):
+            if self.images[i] not in self._sorted:
+                return i
+            i += direction
+        return None
+
+    def _next_unsorted(self, start: int) -> int:
+        """First unsorted image from ``start`` on, then any skipped earlier; ``len(images)`` if none is left."""
+        index = self._find_unsorted(start, 1)
+        if index is None:
+            index = self._find_unsorted(0, 1)
+        return len(self.images) if index is None else index
+
+    def _step(self, direction: int):
+        """Skip ahead or go back to an unsorted image without sorting."""
+        if self._grid_mode or self.current_index >= len(self.images):
+            return
+        index = self._find_unsorted(self.current_index + direction, direction)
+        if index is not None:
+            self.current_index = index
+            self._show_current_image()
+
+    def _similar_unsorted(self) -> list[Path]:
+        """Unsorted near-duplicates of the current image, closest first (capped)."""
+        current = self.images[self.current_index]
+        return [
+            p for p in self._duplicates.group_of(current)
+            if p != current and p not in self._sorted and p in self._listed
+        ][:MAX_GROUP_SIZE - 1]
+
+    def _update_group(self):
+        """Show the group toggle when the current image has near-duplicates."""
+        similar = self._similar_unsorted() if self.current_index < len(self.images) else []
+        if not similar:
+            self.group_check.pack_forget()
+            return
+        noun = "image" if len(similar) == 1 else "images"
+        self.group_check.config(text=f"Also sort {len(similar)} similar {noun} with this one")
+        self.group_check.pack(after=self.filename_label, pady=(0, 5))
+
+    def _update_suggestion(self):
+        """Highlight the suggested category for the image on screen."""
+        ranked = []
+        if not self._grid_mode and self.current_index < len(self.images):
+            ranked = self._suggester.suggest(self.images[self.current_index], self._categories)
+        self.picker.set_suggestion(ranked[0][0] if ranked else None)
+
+    def _toggle_grid(self):
+        if self.images and not self.done_label.winfo_manager():
+            self._set_grid_mode(not self._grid_mode)
+
+    def _set_grid_mode(self, enabled: bool):
+        """Swap between the single-image view and the contact sheet."""
+        if enabled == self._grid_mode:
+            return
+        self._grid_mode = enabled
+        if enabled:
+            current = self.images[self.current_index] if self.current_index < len(self.images) else None
+            self.image_frame.pack_forget()
+            self.filename_label.pack_forget()
+            self.group_check.pack_forget()
+            self._prefetcher.clear()
+            self.viewer.clear()
+            self.grid_view.pack(before=self.picker, padx=20, pady=10, fill="both", expand=True)
+            self.grid_btn.config(text="▢ Single")
+            self._refresh()
+            if current is not None:
+                self.grid_view.select([current])
+        else:
+            selection = self.grid_view.selection()
+            self._show_sorting_view()
+            if selection:
+                self.current_index = self.images.index(selection[0])
+            elif self.current_index < len(self.images) and self.images[self.current_index] in self._sorted:
+                self.current_index = self._next_unsorted(self.current_index)
+            self._show_current_image()
+
+    def _leave_grid(self):
+        """Hide the contact sheet without redisplaying anything."""
+        self._grid_mode = False
+        self.grid_view.pack_forget()
+        self.grid_view.clear()
+        self.grid_btn.config(text="▦ Grid")
+
+    def _on_category(self, category_name: str):
+        if self._grid_mode:
+            self._sort_selection(category_name)
+        else:
+            self._sort_current(category_name)
+
+    def _sort_selection(self, category_name: str):
+        """Sort every selected tile as one decision, then select the next tile."""
+        selection = self.grid_view.selection()
+        if not selection:
+            return
+        chosen = set(selection)
+        remaining = self.grid_view.images
+        after = remaining.index(selection[-1]) + 1
+        following = next((p for p in remaining[after:] if p not in chosen), None)
+
+        for path in selection:
+            self._suggester.learn(path, category_name)
+            self._moves.submit(path, category_name)
+            self._sorted.add(path)
+        self._decisions.append(selection)
+        self.undo_btn.config(state="normal")
+
+        self.grid_view.set_images([p for p in remaining if p not in chosen])
+        if following is not None:
+            self.grid_view.select([following])
+        if not self.grid_view.images and self._scan is None:
+            self._show_done()
+        else:
+            self._update_progress()
 
     def _sort_current(self, category_name: str):
         if self.current_index >= len(self.images):
             return
 
         image_path = self.images[self.current_index]
+        group = [image_path]
+        if self.group_var.get():
+            group += self._similar_unsorted()
+
+        for path in group:
+            self._suggester.learn(path, category_name)
+            self._moves.submit(path, category_name)
+            self._sorted.add(path)
+            self._prefetcher.discard(path)
+        self._decisions.append(group)
+        self.undo_btn.config(state="normal")
+        self.current_index = self._next_unsorted(self.current_index + 1)
+        self._show_current_image()
 
-        try:
-            sorting_service.sort_image(image_path, category_name)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to sort image:\n{e}")
+    def _undo(self):
+        """Take back the last decision, moving its images back if need be."""
+        if not self._decisions:
+            return
+        group = self._decisions.pop()
+        self.undo_btn.config(state="normal" if self._decisions else "disabled")
+
+        # Moves still queued are simply withdrawn; the rest must land first,
+        # which _poll_background waits for without blocking the UI
+        moved = [path for path in group if not self._moves.cancel(path)]
+        self._undoing.append((group, moved))
+        self._finish_undos()
+
+    def _finish_undos(self):
+        """Complete undos, in order, whose moves have all landed."""
+        while self._undoing:
+            group, moved = self._undoing[0]
+            if any(self._moves.is_pending(path) for path in moved):
+                return
+            self._undoing.pop(0)
+            self._restore(group, moved)
+
+    def _restore(self, group: list[Path], moved: list[Path]):
+        """Move an undone decision's images back and show the first of them."""
+        failed = {}
+        for path in moved:
+            try:
+                sorting_service.undo_move(path, self._journal)
+            except OSError as e:
+                failed[path] = e
+        restored = [path for path in group if path not in failed]
+        self._sorted.difference_update(restored)
+        for path in restored:
+            self._suggester.forget(path)
+
+        if failed:
+            details = "\n".join(f"{path.name}: {error}" for path, error in failed.items())
+            messagebox.showerror("Error", f"Failed to undo:\n{details}")
+        if not restored:
             return
 
-        self.current_index += 1
-        self._show_current_image()
+        if self.done_label.winfo_manager():
+            self._show_sorting_view()
+        self.current_index = self.images.index(restored[0])
+        self._refresh()
+        if self._grid_mode:
+            self.grid_view.select(restored)
+
+    def _show_waiting(self):
+        if self._held is not None:
+            self.viewer.show_message("Looking for images…\nThe first one is shown once all are found and in order.")
+        else:
+            self.viewer.show_message("Looking for images…")
+        self.filename_label.config(text="")
+        self._update_group()
+        self._update_progress()
 
     def _show_no_images(self):
         input_dir = settings_service.get_input_dir()
-        self.image_label.config(
-            image="",
-            text=f"No images found in:\n{input_dir}\n\nAdd images to the input folder and restart.",
-            font=("Segoe UI", 14),
+        self.group_check.pack_forget()
+        self.viewer.show_message(
+            f"No images found in:\n{input_dir}\n\nImages added to the input folder will show up here.",
             fg="#fbbf24",
+            font=("Segoe UI", 14),
         )
         self.filename_label.config(text="")
         self.progress_label.config(text="0 images")
 
     def _show_done(self):
-        self.image_label.config(image="", text="")
-        self._photo_ref = None
+        index = self._find_unsorted(0, 1)
+        if index is not None:
+            # Skipped images are still waiting: not done, and still resumable
+            self.current_index = index
+            if self._grid_mode:
+                self._set_grid_mode(False)
+            else:
+                self._show_current_image()
+            return
+
+        self.viewer.clear()
         self.filename_label.config(text="")
-        self.progress_label.config(text="Done")
+        self._update_progress()
 
         # Hide image frame & buttons, show done label
+        self._leave_grid()
         self.image_frame.pack_forget()
-        self.btn_frame.pack_forget()
+        self.picker.pack_forget()
         self.filename_label.pack_forget()
+        self.group_check.pack_forget()
         self.done_label.pack(expand=True)
 
-        # Unbind keys
-        root = self.winfo_toplevel()
-        for k in ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]:
-            root.unbind(f"<Key-{k}>")
+        # Unbind sorting keys and drop decoded previews; undo still works
+        self._unbind_keys()
+        self._prefetcher.clear()
+        self._journal.record("end")
+
+    def _show_sorting_view(self):
+        """Lay out the single-image view (after "all done" or the grid)."""
+        self.done_label.pack_forget()
+        self._leave_grid()
+        # Re-packing in order restores the layout whatever was shown before
+        self.image_frame.pack(padx=20, pady=10, fill="both", expand=True)
+        self.filename_label.pack(pady=(0, 5))
+        self.picker.pack(padx=20, pady=(5, 15), fill="x")
+        self._bind_keys()
+
+    def destroy(self):
+        self.deactivate()
+        self._prefetcher.shutdown()
+        self.grid_view.shutdown()
+        self.viewer.shutdown()
+        super().destroy()
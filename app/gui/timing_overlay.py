@@ -0,0 +1,99 @@
+"""Latency overlay — live span percentiles over the sorting screen."""
+
+import tkinter as tk
+from datetime import datetime
+from pathlib import Path
+from tkinter import filedialog, messagebox
+
+from app.services import timing_service
+from app.services.memory_service import get_memory_manager
+
+REFRESH_MS = 500
+
+
+class TimingOverlay(tk.Frame):
+    """Floating panel placed over its master's top-right corner."""
+
+    def __init__(self, master):
+        super().__init__(master, bg="#11111b", highlightthickness=1, highlightbackground="#c084fc")
+        self._refresh_job = None
+
+        self.table_label = tk.Label(
+            self,
+            text="",
+            font=("Consolas", 9),
+            fg="#e0e0e0",
+            bg="#11111b",
+            justify="left",
+            anchor="w",
+        )
+        self.table_label.pack(padx=8, pady=(6, 2), fill="x")
+
+        self.memory_label = tk.Label(
+            self,
+            text="",
+            font=("Consolas", 9),
+            fg="#888",
+            bg="#11111b",
+            anchor="w",
+        )
+        self.memory_label.pack(padx=8, fill="x")
+
+        buttons = tk.Frame(self, bg="#11111b")
+        buttons.pack(padx=8, pady=(4, 6), fill="x")
+        for text, command in (("Export…", self._export), ("Reset", self._reset)):
+            tk.Button(
+                buttons,
+                text=text,
+                font=("Segoe UI", 9),
+                bg="#374151",
+                fg="#e0e0e0",
+                activebackground="#4b5563",
+                activeforeground="white",
+                relief="flat",
+                cursor="hand2",
+                command=command,
+            ).pack(side="left", padx=(0, 6))
+
+    def toggle(self) -> None:
+        if self.winfo_manager():
+            self.hide()
+        else:
+            self.show()
+
+    def show(self) -> None:
+        self.place(relx=1.0, y=50, x=-20, anchor="ne")
+        self.lift()
+        self._refresh()
+
+    def hide(self) -> None:
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        self.place_forget()
+
+    def _refresh(self):
+        stats = timing_service.snapshot()
+        self.table_label.config(
+            text=timing_service.format_table(stats) if stats else "No spans recorded yet",
+        )
+        self.memory_label.config(text="memory " + get_memory_manager().usage().describe())
+        self._refresh_job = self.after(REFRESH_MS, self._refresh)
+
+    def _reset(self):
+        timing_service.reset()
+        self.table_label.config(text="No spans recorded yet")
+
+    def _export(self):
+        filename = filedialog.asksaveasfilename(
+            title="Export Timings",
+            defaultextension=".json",
+            initialfile=f"timings-{datetime.now():%Y%m%d-%H%M%S}.json",
+            filetypes=[("JSON", "*.json")],
+        )
+        if not filename:
+            return
+        try:
+            timing_service.export(Path(filename))
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to export timings:\n{e}")
@@ -0,0 +1,348 @@
+"""Zoomable image view for the sorting screen."""
+
+import math
+import queue
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageTk
+
+from app.services import timing_service
+from app.services.memory_service import KIND_PHOTO, get_memory_manager, photo_bytes
+from app.services.preview_service import DISPLAY_SIZE
+from app.services.pyramid_service import TILE_SIZE, ImagePyramid
+
+# Zoom factor per wheel notch or key press
+ZOOM_STEP = 1.25
+
+# Most screen pixels per image pixel
+MAX_SCALE = 8.0
+
+# Workers cutting and resizing tiles
+TILE_WORKERS = 2
+
+# Above this enlargement tiles are scaled with NEAREST, showing real pixels
+PIXEL_SCALE = 2.0
+
+
+class ZoomView(tk.Canvas):
+    """Canvas showing one image (or a message) with zoom and pan."""
+
+    def __init__(self, master, bg: str):
+        super().__init__(master, bg=bg, highlightthickness=0)
+        self.path: Path | None = None
+        self._memory = get_memory_manager()
+        self._memory.register(self, self._evict)
+        self._executor = ThreadPoolExecutor(max_workers=TILE_WORKERS, thread_name_prefix="tiles")
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+
+        self._preview: Image.Image | None = None
+        self._pyramid: ImagePyramid | None = None
+        # The pyramid of the image shown, while its header is read on a worker
+        self._opening: Future | None = None
+        self._message: tuple[str, str, tuple] | None = None
+        # Screen pixels per image pixel, and the image point at the view's centre
+        self._scale = 1.0
+        self._center = (0.0, 0.0)
+        self._fit = True
+
+        self._base_photo: ImageTk.PhotoImage | None = None
+        # Tiles at the current level and scale: (level, col, row) -> photo
+        self._tile_scale: tuple[int, float] | None = None
+        self._tiles: dict[tuple[int, int, int], ImageTk.PhotoImage] = {}
+        self._pending: dict[tuple[int, int, int], Future] = {}
+        self._generation = 0
+        self._render_job = None
+        self._drag: tuple[int, int, tuple[float, float]] | None = None
+
+        self.bind("<Configure>", lambda e: self._schedule_render())
+        self.bind("<MouseWheel>", lambda e: self.zoom(ZOOM_STEP if e.delta > 0 else 1 / ZOOM_STEP, e.x, e.y))
+        self.bind("<Button-4>", lambda e: self.zoom(ZOOM_STEP, e.x, e.y))
+        self.bind("<Button-5>", lambda e: self.zoom(1 / ZOOM_STEP, e.x, e.y))
+        self.bind("<ButtonPress-1>", self._on_press)
+        self.bind("<B1-Motion>", self._on_drag)
+        self.bind("<ButtonRelease-1>", lambda e: setattr(self, "_drag", None))
+        self.bind("<Double-Button-1>", self._on_double_click)
+
+    # ── Public API ──
+
+    def show(self, path: Path, preview: Image.Image) -> None:
+        """Display ``preview`` of ``path``; a sharper preview of the same image keeps the zoom."""
+        if path != self.path:
+            self._reset(path)
+            # Opening the file reads its header: kept off the Tk thread, the
+            # preview is shown meanwhile
+            self._opening = self._executor.submit(ImagePyramid, path, self._memory)
+        self._preview = preview
+        self._message = None
+        self._render()
+
+    def show_message(self, text: str, fg: str = "#888", font: tuple = ("Segoe UI", 12)) -> None:
+        """Replace the image with a line of text."""
+        self._reset(None)
+        self._message = (text, fg, font)
+        self._render()
+
+    def clear(self) -> None:
+        self.show_message("")
+
+    def zoom(self, factor: float, x: float | None = None, y: float | None = None) -> None:
+        """Zoom by ``factor`` keeping the image point under (x, y) in place."""
+        if self._preview is None:
+            return
+        width, height = self._view_size()
+        x = width / 2 if x is None else x
+        y = height / 2 if y is None else y
+        fit = self._fit_scale()
+        scale = min(max(self._scale * factor, fit), MAX_SCALE)
+        cx, cy = self._center
+        point = cx + (x - width / 2) / self._scale, cy + (y - height / 2) / self._scale
+        self._center = point[0] - (x - width / 2) / scale, point[1] - (y - height / 2) / scale
+        self._scale = scale
+        self._fit = scale <= fit
+        self._schedule_render()
+
+    def zoom_fit(self) -> None:
+        self._fit = True
+        self._schedule_render()
+
+    def poll(self) -> None:
+        """Pick up tiles and levels finished by the workers (call from the Tk loop)."""
+        if self._opening is not None and self._opening.done():
+            self._attach_pyramid()
+        if self._pyramid is not None:
+            for level, nbytes in self._pyramid.take_built():
+                self._memory.track(self, ("level", level), nbytes)
+
+        landed = False
+        while True:
+            try:
+                generation, key, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if generation != self._generation or future.cancelled() or future.exception() is not None:
+                continue  # stale, or unreadable: the preview stays
+            with timing_service.span("photo.convert"):
+                photo = ImageTk.PhotoImage(future.result())
+            self._tiles[key] = photo
+            self._memory.track(self, ("tile", key), photo_bytes(photo), KIND_PHOTO, pinned=True)
+            landed = True
+        if landed:
+            self._schedule_render()
+
+    def shutdown(self) -> None:
+        self._reset(None)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._memory.unregister(self)
+
+    def _attach_pyramid(self):
+        opening, self._opening = self._opening, None
+        if opening.cancelled() or opening.exception() is not None:
+            return  # the preview is all there is
+        pyramid = opening.result()
+        if self._preview is not None and not self._fit:
+            # Zoomed in on the preview already: keep the view, in image pixels
+            ratio = pyramid.size[0] / self._preview.width
+            self._scale /= ratio
+            self._center = self._center[0] * ratio, self._center[1] * ratio
+        self._pyramid = pyramid
+        self._schedule_render()
+
+    # ── Rendering ──
+
+    def _schedule_render(self):
+        # Coalesce bursts of wheel / drag / resize events into one render
+        if self._render_job is None:
+            self._render_job = self.after_idle(self._render)
+
+    def _render(self):
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        self.delete("all")
+        width, height = self._view_size()
+        if self._message is not None:
+            text, fg, font = self._message
+            self.create_text(width / 2, height / 2, text=text, fill=fg, font=font, justify="center")
+            return
+        if self._preview is None:
+            return
+
+        image_width, image_height = self._image_size()
+        if self._fit:
+            self._scale = self._fit_scale()
+            self._center = image_width / 2, image_height / 2
+        self._clamp_center()
+        scale = self._scale
+        # Whole pixels, so tiles and the base line up however the view pans
+        left = round(width / 2 - self._center[0] * scale)
+        top = round(height / 2 - self._center[1] * scale)
+        visible = (
+            max(0.0, -left / scale),
+            max(0.0, -top / scale),
+            min(image_width, (width - left) / scale),
+            min(image_height, (height - top) / scale),
+        )
+        if visible[2] <= visible[0] or visible[3] <= visible[1]:
+            return
+
+        with timing_service.span("zoom.render"):
+            self._draw_base(left, top, visible)
+            if self._pyramid is not None and scale * image_width > self._preview.width * 1.01:
+                self._draw_tiles(left, top, visible)
+            else:
+                self._drop_tiles()
+
+    def _draw_base(self, left: int, top: int, visible: tuple[float, float, float, float]):
+        """The preview, cropped to what is in view and scaled to the screen."""
+        ratio = self._preview.width / self._image_size()[0]
+        box = (
+            math.floor(visible[0] * ratio),
+            math.floor(visible[1] * ratio),
+            min(self._preview.width, math.ceil(visible[2] * ratio)),
+            min(self._preview.height, math.ceil(visible[3] * ratio)),
+        )
+        screen = self._scale / ratio
+        x0, y0 = left + round(box[0] * screen), top + round(box[1] * screen)
+        size = (max(1, left + round(box[2] * screen) - x0), max(1, top + round(box[3] * screen) - y0))
+
+        crop = self._preview
+        if box != (0, 0, crop.width, crop.height):
+            crop = crop.crop(box)
+        if crop.size != size:
+            crop = crop.resize(size, Image.BILINEAR, reducing_gap=2.0)
+        with timing_service.span("photo.convert"):
+            self._base_photo = ImageTk.PhotoImage(crop)
+        self._memory.track(self, "base", photo_bytes(self._base_photo), KIND_PHOTO, pinned=True)
+        self.create_image(x0, y0, image=self._base_photo, anchor="nw")
+
+    def _draw_tiles(self, left: int, top: int, visible: tuple[float, float, float, float]):
+        """Sharp tiles from the pyramid over the base, requesting missing ones."""
+        pyramid = self._pyramid
+        level = pyramid.level_for(self._scale)
+        if self._tile_scale != (level, self._scale):
+            # Other sizes now: start over (levels stay decoded)
+            self._drop_tiles()
+            self._tile_scale = level, self._scale
+        factor = 2 ** level
+        screen = self._scale * factor  # screen pixels per level pixel
+        columns, rows = pyramid.tile_grid(level)
+        first_col = int(visible[0] / factor // TILE_SIZE)
+        last_col = min(columns - 1, int(visible[2] / factor // TILE_SIZE))
+        first_row = int(visible[1] / factor // TILE_SIZE)
+        last_row = min(rows - 1, int(visible[3] / factor // TILE_SIZE))
+
+        wanted = set()
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                key = level, col, row
+                wanted.add(key)
+                box = pyramid.tile_box(level, col, row)
+                x0, y0 = round(box[0] * screen), round(box[1] * screen)
+                photo = self._tiles.get(key)
+                if photo is not None:
+                    self.create_image(left + x0, top + y0, image=photo, anchor="nw")
+                elif key not in self._pending:
+                    size = round(box[2] * screen) - x0, round(box[3] * screen) - y0
+                    self._request_tile(key, size, screen)
+
+        # Whatever scrolled out of view is dropped or withdrawn
+        for key in [k for k in self._tiles if k not in wanted]:
+            del self._tiles[key]
+            self._memory.release(self, ("tile", key))
+        for key in [k for k in self._pending if k not in wanted]:
+            self._pending.pop(key).cancel()
+
+    def _request_tile(self, key: tuple[int, int, int], size: tuple[int, int], screen: float):
+        future = self._executor.submit(_render_tile, self._pyramid, key, size, screen)
+        self._pending[key] = future
+        generation = self._generation
+        future.add_done_callback(lambda f: self._done.put((generation, key, f)))
+
+    def _drop_tiles(self):
+        self._generation += 1
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        for key in self._tiles:
+            self._memory.release(self, ("tile", key))
+        self._tiles.clear()
+        self._tile_scale = None
+
+    def _reset(self, path: Path | None):
+        """Forget the current image: its tiles, photos and pyramid levels."""
+        self._drop_tiles()
+        if self._opening is not None:
+            self._opening.cancel()
+            self._opening = None
+        if self._pyramid is not None:
+            for level in range(self._pyramid.level_count):
+                self._memory.release(self, ("level", level))
+            self._pyramid = None
+        self._base_photo = None
+        self._memory.release(self, "base")
+        self.path = path
+        self._preview = None
+        self._fit = True
+
+    def _evict(self, key):
+        # Only levels are ever evicted; photos are pinned while in view
+        if isinstance(key, tuple) and key[0] == "level" and self._pyramid is not None:
+            self._pyramid.drop(key[1])
+
+    # ── Geometry ──
+
+    def _view_size(self) -> tuple[int, int]:
+        width, height = self.winfo_width(), self.winfo_height()
+        if width <= 1 or height <= 1:
+            return DISPLAY_SIZE  # not laid out yet
+        return width, height
+
+    def _image_size(self) -> tuple[int, int]:
+        return self._pyramid.size if self._pyramid is not None else self._preview.size
+
+    def _fit_scale(self) -> float:
+        """Scale at which the whole image fits the view (never enlarging)."""
+        width, height = self._view_size()
+        image_width, image_height = self._image_size()
+        return min(width / image_width, height / image_height, 1.0)
+
+    def _clamp_center(self):
+        """Keep the image covering the view, or centred when it is smaller."""
+        width, height = self._view_size()
+        center = []
+        for view, extent, value in zip((width, height), self._image_size(), self._center):
+            half = view / 2 / self._scale
+            center.append(extent / 2 if 2 * half >= extent else min(max(value, half), extent - half))
+        self._center = center[0], center[1]
+
+    # ── Mouse ──
+
+    def _on_press(self, event):
+        self._drag = event.x, event.y, self._center
+
+    def _on_drag(self, event):
+        if self._drag is None or self._preview is None:
+            return
+        x, y, (cx, cy) = self._drag
+        self._center = cx - (event.x - x) / self._scale, cy - (event.y - y) / self._scale
+        self._schedule_render()
+
+    def _on_double_click(self, event):
+        if self._fit and self._fit_scale() < 1.0:
+            self.zoom(1.0 / self._scale, event.x, event.y)
+        else:
+            self.zoom_fit()
+
+
+def _render_tile(pyramid: ImagePyramid, key: tuple[int, int, int], size: tuple[int, int], screen: float):
+    """Cut a tile and scale it to screen pixels (worker thread)."""
+    with timing_service.span("zoom.tile"):
+        tile = pyramid.tile(*key)
+        if tile.size == size:
+            return tile
+        resample = Image.NEAREST if screen >= PIXEL_SCALE else Image.BILINEAR if screen > 1 else Image.LANCZOS
+        return tile.resize(size, resample)
@@ -0,0 +1,79 @@
+"""Prefix trie over category names for type-ahead filtering."""
+
+from typing import Iterable
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        # Indexes of every name indexed at or below this node
+        self.ids: list[int] = []
+
+
+def is_subsequence(query: str, name: str) -> bool:
+    """Whether the characters of ``query`` appear in ``name`` in order."""
+    position = 0
+    for char in query:
+        position = name.find(char, position) + 1
+        if position == 0:
+            return False
+    return True
+
+
+class CategoryTrie:
+    """Ranks category names against a typed query."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: list[str] = []
+        self._root = _Node()
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        index = len(self._names)
+        self._names.append(name)
+        words = name.split("-")
+        for start in range(len(words)):
+            self._insert("-".join(words[start:]), index)
+
+    def _insert(self, key: str, index: int) -> None:
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            # A name can reach the same node through two tails ("a-a")
+            if not node.ids or node.ids[-1] != index:
+                node.ids.append(index)
+
+    def search(self, query: str, fuzzy: bool = True) -> list[str]:
+        """Names matching ``query``, best first.
+
+        Order: names starting with the query, then names with a word
+        starting with it, then (if ``fuzzy``) subsequence matches; each
+        group keeps the original category order.
+        """
+        query = query.lower()
+        if not query:
+            return list(self._names)
+
+        node = self._root
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                break
+
+        hits = node.ids if node is not None else []
+        ranked = sorted(hits, key=lambda i: (not self._names[i].startswith(query), i))
+        matches = [self._names[i] for i in ranked]
+
+        if fuzzy and len(query) > 1:
+            found = set(hits)
+            matches += [
+                name for i, name in enumerate(self._names)
+                if i not in found and is_subsequence(query, name)
+            ]
+        return matches
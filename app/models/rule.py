@@ -0,0 +1,157 @@
+"""Sorting rule model and validation."""
+
+import fnmatch
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from app.models.category import validate_category_name
+
+# Conditions that can be answered from the file name alone
+NAME_FIELDS = ("glob", "regex")
+
+# Conditions that need header metadata
+METADATA_FIELDS = (
+    "camera", "date_from", "date_to",
+    "min_width", "max_width", "min_height", "max_height", "format",
+)
+
+# Conditions on the image size, in pixels
+DIMENSION_FIELDS = ("min_width", "max_width", "min_height", "max_height")
+
+
+@dataclass
+class Rule:
+    """One entry of a rule file: conditions plus the category they map to."""
+
+    category: str
+    glob: str | None = None
+    regex: str | None = None
+    camera: str | None = None
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    min_width: int | None = None
+    max_width: int | None = None
+    min_height: int | None = None
+    max_height: int | None = None
+    format: list[str] = field(default_factory=list)
+    _pattern: re.Pattern | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.regex is not None:
+            self._pattern = re.compile(self.regex, re.IGNORECASE)
+
+    @property
+    def needs_metadata(self) -> bool:
+        return any(getattr(self, name) not in (None, []) for name in METADATA_FIELDS)
+
+    def matches_name(self, image_path: Path) -> bool:
+        name = image_path.name
+        if self.glob is not None and not fnmatch.fnmatch(name.lower(), self.glob.lower()):
+            return False
+        if self._pattern is not None and not self._pattern.search(name):
+            return False
+        return True
+
+    def matches_metadata(self, metadata) -> bool:
+        """Check the header conditions against an ``ImageMetadata``."""
+        if self.camera is not None and not fnmatch.fnmatch(metadata.camera.lower(), self.camera.lower()):
+            return False
+        if self.date_from is not None or self.date_to is not None:
+            if metadata.taken_at is None:
+                return False
+            if self.date_from is not None and metadata.taken_at < self.date_from:
+                return False
+            if self.date_to is not None and metadata.taken_at > self.date_to:
+                return False
+        if self.min_width is not None and metadata.width < self.min_width:
+            return False
+        if self.max_width is not None and metadata.width > self.max_width:
+            return False
+        if self.min_height is not None and metadata.height < self.min_height:
+            return False
+        if self.max_height is not None and metadata.height > self.max_height:
+            return False
+        if self.format and metadata.format.upper() not in self.format:
+            return False
+        return True
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rule":
+        formats = data.get("format", [])
+        if isinstance(formats, str):
+            formats = [formats]
+        return cls(
+            category=data["category"],
+            glob=data.get("glob"),
+            regex=data.get("regex"),
+            camera=data.get("camera"),
+            date_from=_parse_date(data.get("date_from")),
+            date_to=_parse_date(data.get("date_to"), end_of_day=True),
+            min_width=data.get("min_width"),
+            max_width=data.get("max_width"),
+            min_height=data.get("min_height"),
+            max_height=data.get("max_height"),
+            format=[f.upper() for f in formats],
+        )
+
+
+def _parse_date(value: str | None, end_of_day: bool = False) -> datetime | None:
+    """Parse ``YYYY-MM-DD`` or a full ISO timestamp."""
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+    return parsed
+
+
+def validate_rule(data: dict) -> str | None:
+    """Validate one raw rule entry.
+
+    Returns an error message string if invalid, or None if valid.
+    """
+    if not isinstance(data, dict):
+        return "Each rule must be an object."
+
+    error = validate_category_name(data.get("category", ""))
+    if error:
+        return error
+
+    unknown = set(data) - {"category", *NAME_FIELDS, *METADATA_FIELDS}
+    if unknown:
+        return f"Unknown rule field(s): {', '.join(sorted(unknown))}"
+
+    if len(data) == 1:
+        return f"Rule for '{data['category']}' has no conditions."
+
+    category = data["category"]
+    for name in DIMENSION_FIELDS:
+        value = data.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            return f"'{name}' in rule for '{category}' must be a whole number of pixels."
+
+    formats = data.get("format")
+    if isinstance(formats, str):
+        formats = [formats]
+    if formats is not None and (
+        not isinstance(formats, list) or not formats or not all(isinstance(f, str) and f for f in formats)
+    ):
+        # An empty list would match every image
+        return f"'format' in rule for '{category}' must be a format name or a non-empty list of them."
+
+    try:
+        rule = Rule.from_dict(data)
+    except re.error as e:
+        return f"Invalid regex in rule for '{category}': {e}"
+    except (ValueError, TypeError) as e:
+        return f"Invalid value in rule for '{category}': {e}"
+
+    for name in ("date_from", "date_to"):
+        value = getattr(rule, name)
+        if value is not None and value.tzinfo is not None:
+            # EXIF capture times carry no time zone, so they cannot be compared
+            return f"'{name}' in rule for '{category}' must not have a time zone."
+
+    return None
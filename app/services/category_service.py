@@ -1,38 +1,33 @@
 """Service for managing categories (CRUD + persistence)."""
 
-import json
 from pathlib import Path
 
 from app.models.category import Category, validate_category_name
+from app.services.config_store import JsonStore
 
 # Path to the persisted categories file
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 CATEGORIES_FILE = DATA_DIR / "categories.json"
 
-
-def _ensure_data_dir() -> None:
-    """Create the data directory if it doesn't exist."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+_store = JsonStore(CATEGORIES_FILE, list)
 
 
 def get_categories() -> list[Category]:
-    """Load categories from disk. Returns empty list if none exist."""
-    if not CATEGORIES_FILE.exists():
-        return []
-
+    """Load categories (cached in memory). Returns empty list if none exist."""
     try:
-        with open(CATEGORIES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return [Category.from_dict(item) for item in data]
-    except (json.JSONDecodeError, KeyError):
+        return [Category.from_dict(item) for item in _store.read()]
+    except (KeyError, TypeError):
         return []
 
 
+def preload() -> None:
+    """Read the categories file ahead of the first lookup (safe off the Tk thread)."""
+    _store.preload()
+
+
 def save_categories(categories: list[Category]) -> None:
-    """Persist the full category list to disk."""
-    _ensure_data_dir()
-    with open(CATEGORIES_FILE, "w", encoding="utf-8") as f:
-        json.dump([cat.to_dict() for cat in categories], f, indent=2)
+    """Persist the full category list (written shortly after, coalescing bursts)."""
+    _store.write([cat.to_dict() for cat in categories])
 
 
 def add_category(name: str) -> str | None:
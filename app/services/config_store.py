@@ -0,0 +1,97 @@
+"""In-memory cache for the small JSON files under ``data/``."""
+
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+# Seconds between mtime checks for external edits
+CHECK_INTERVAL = 1.0
+
+# Seconds a write is held back so that bursts coalesce into one
+WRITE_DELAY = 0.5
+
+
+class JsonStore:
+    """A JSON document cached in memory with delayed, atomic persistence."""
+
+    def __init__(self, path: Path, default_factory: Callable[[], Any]):
+        self.path = path
+        self._default_factory = default_factory
+        self._lock = threading.Lock()
+        self._data: Any = None
+        self._loaded = False
+        self._mtime_ns: int | None = None
+        self._checked_at = 0.0
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        atexit.register(self.flush)
+
+    def read(self) -> Any:
+        """Return a copy of the current document (the default if unreadable)."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            elif not self._dirty and time.monotonic() - self._checked_at >= CHECK_INTERVAL:
+                self._checked_at = time.monotonic()
+                if self._current_mtime() != self._mtime_ns:
+                    self._load()
+            return copy.deepcopy(self._data)
+
+    def preload(self) -> None:
+        """Load the file now (e.g. on a worker thread) so reads start from memory."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+    def write(self, data: Any) -> None:
+        """Replace the document; it is saved to disk after ``WRITE_DELAY``."""
+        with self._lock:
+            self._data = copy.deepcopy(data)
+            self._loaded = True
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(WRITE_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.path)
+
+            self._dirty = False
+            self._mtime_ns = self._current_mtime()
+            self._checked_at = time.monotonic()
+
+    def _load(self) -> None:
+        self._mtime_ns = self._current_mtime()
+        self._checked_at = time.monotonic()
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._data = self._default_factory()
+
+    def _current_mtime(self) -> int | None:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,195 @@
+"""Decode backends for display previews and grid thumbnails."""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+from PIL import Image
+
+from app.services import preview_service, timing_service
+from app.services.preview_service import DISPLAY_SIZE
+from app.services.settings_service import get_settings
+
+# Where previews are rendered (the "decode_backend" setting)
+DECODE_BACKENDS = ("thread", "process")
+DEFAULT_DECODE_BACKEND = "thread"
+
+# Prefetch threads per prefetcher with the thread backend
+THREAD_WORKERS = 2
+
+# Decode processes: every core but one, which is left to the Tk thread
+PROCESS_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Preview mode -> layout it crosses the process boundary in; other modes
+# are converted to RGBA
+SHARED_MODES = {"RGB": "RGBX", "RGBA": "RGBA", "L": "L"}
+
+
+def get_backend() -> str:
+    """The configured backend, or the default if the setting is unknown."""
+    backend = get_settings()["decode_backend"]
+    return backend if backend in DECODE_BACKENDS else DEFAULT_DECODE_BACKEND
+
+
+def prefetch_workers() -> int:
+    """How many threads a prefetcher should render with.
+
+    With the process backend every prefetcher gets enough threads to fill
+    the pool on its own; the decoder's render slots are shared between
+    them, so no more renders are in flight than there are processes.
+    """
+    return PROCESS_WORKERS if get_backend() == "process" else THREAD_WORKERS
+
+
+def load_preview(image_path: Path, size: tuple[int, int] = DISPLAY_SIZE) -> Image.Image:
+    """High-quality preview (see :func:`preview_service.load_preview`), on the configured backend."""
+    if get_backend() == "process":
+        return get_decoder().render(image_path, size)
+    return preview_service.load_preview(image_path, size)
+
+
+def _render_shared(image_path: Path, size: tuple[int, int]) -> tuple[str, str, tuple[int, int]]:
+    """Worker process: render a preview into a new shared memory block.
+
+    Returns (block name, mode, size).  The block is left for the caller to
+    unlink.
+    """
+    preview = preview_service.load_preview(image_path, size)
+    mode = SHARED_MODES.get(preview.mode)
+    if mode is None:
+        preview, mode = preview.convert("RGBA"), "RGBA"
+    data = preview.tobytes("raw", mode)
+    block = SharedMemory(create=True, size=max(1, len(data)))
+    try:
+        block.buf[:len(data)] = data
+    except BaseException:
+        block.unlink()
+        raise
+    finally:
+        block.close()
+    return block.name, mode, preview.size
+
+
+class ProcessDecoder:
+    """Pool of decode processes handing previews back through shared memory.
+
+    Thread-safe: :meth:`render` blocks its caller until the preview is
+    ready, so any number of threads can keep the pool busy.  Only
+    ``workers`` renders are submitted at a time; other callers wait for a
+    slot rather than queueing blocks up in the pool.
+    """
+
+    def __init__(self, workers: int = PROCESS_WORKERS):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._pool = self._start()
+        # Submitted renders whose block nobody has taken over yet
+        self._pending: set[Future] = set()
+        # Blocks whose image was collected, closed on the next reap
+        self._retired: list[SharedMemory] = []
+
+    def render(self, image_path: Path, size: tuple[int, int] = DISPLAY_SIZE) -> Image.Image:
+        """Render a preview in a worker process and wrap its pixels in place.
+
+        Raises whatever the worker's Pillow raised for unreadable files.
+        """
+        self._reap()
+        with self._slots:
+            with self._lock:
+                pool = self._pool
+                future = pool.submit(_render_shared, image_path, size)
+                self._pending.add(future)
+            try:
+                with timing_service.span("decode.process"):
+                    name, mode, preview_size = future.result()
+            except BrokenProcessPool:
+                # A worker died (killed, out of memory); start over, render this one here
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = self._start()
+                return preview_service.load_preview(image_path, size)
+            finally:
+                claimed = self._claim(future)
+        if not claimed:
+            raise RuntimeError("decoder closed")  # close() unlinks the block
+
+        block = SharedMemory(name)
+        block.unlink()  # the mapping lives on; nothing is left behind on a crash
+        image = Image.frombuffer(mode, preview_size, block.buf, "raw", mode, 0, 1)
+        # The image still holds the buffer while its finalizer runs, so
+        # the block can only be closed later
+        weakref.finalize(image, self._retire, block)
+        return image
+
+    def close(self) -> None:
+        """Stop the worker processes.
+
+        Blocks of renders still in flight are unlinked as they finish, since
+        no caller will pick them up.
+        """
+        with self._lock:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            pending = list(self._pending)
+        for future in pending:
+            future.add_done_callback(self._discard)
+        self._reap()
+
+    def _start(self) -> ProcessPoolExecutor:
+        # Never fork: the app process runs Tk and a number of threads
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _claim(self, future: Future) -> bool:
+        """Take over the block ``future`` renders into; False if already taken."""
+        with self._lock:
+            if future not in self._pending:
+                return False
+            self._pending.remove(future)
+            return True
+
+    def _discard(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None or not self._claim(future):
+            return
+        try:
+            block = SharedMemory(future.result()[0])
+        except FileNotFoundError:
+            return
+        block.unlink()
+        block.close()
+
+    def _retire(self, block: SharedMemory) -> None:
+        with self._lock:
+            self._retired.append(block)
+
+    def _reap(self) -> None:
+        with self._lock:
+            retired, self._retired = self._retired, []
+        in_use = []
+        for block in retired:
+            try:
+                block.close()
+            except BufferError:
+                in_use.append(block)  # image not fully torn down yet
+        if in_use:
+            with self._lock:
+                self._retired.extend(in_use)
+
+
+_decoder: ProcessDecoder | None = None
+_decoder_lock = threading.Lock()
+
+
+def get_decoder() -> ProcessDecoder:
+    """Return the app-wide process pool, starting it on first use."""
+    global _decoder
+    with _decoder_lock:
+        if _decoder is None:
+            _decoder = ProcessDecoder()
+            atexit.register(_decoder.close)
+        return _decoder
@@ -0,0 +1,172 @@
+"""Perceptual hashing and near-duplicate grouping."""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Side of the grayscale grid the DCT is taken over
+DCT_SIZE = 32
+
+# Side of the hash grids (8x8 = 64 bits)
+HASH_SIZE = 8
+
+# Max pHash / dHash Hamming distances for two images to count as similar
+PHASH_THRESHOLD = 10
+DHASH_THRESHOLD = 14
+
+# Most images one decision sorts together (the current one included)
+MAX_GROUP_SIZE = 20
+
+# Hashing shares the CPU with preview decoding, so keep it modest
+HASH_WORKERS = 2
+
+
+@dataclass(frozen=True)
+class ImageHashes:
+    """Perceptual hashes of one image, each a 64-bit int."""
+
+    dhash: int
+    phash: int
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so ``M @ X @ M.T`` is the 2-D DCT of ``X``."""
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(DCT_SIZE)
+
+
+def hash_pixels(gray: np.ndarray, gradient: np.ndarray) -> ImageHashes:
+    """Compute both hashes from a DCT_SIZE² grayscale grid and a 9x8 one."""
+    dhash = _bits_to_int(gradient[:, 1:] > gradient[:, :-1])
+
+    low = (_DCT @ gray @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    # The DC term dwarfs everything else; leave it out of the median
+    phash = _bits_to_int(low > np.median(low.ravel()[1:]))
+
+    return ImageHashes(dhash, phash)
+
+
+def compute_hashes(image_path: Path) -> ImageHashes:
+    """Decode a small grayscale version of an image and hash it."""
+    with Image.open(image_path) as pil_image:
+        pil_image.draft("L", (DCT_SIZE * 2, DCT_SIZE * 2))
+        gray = pil_image.convert("L")
+        grid = np.asarray(gray.resize((DCT_SIZE, DCT_SIZE), Image.BOX), dtype=np.float32)
+        gradient = np.asarray(gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX), dtype=np.int16)
+    return hash_pixels(grid, gradient)
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes under Hamming distance."""
+
+    def __init__(self):
+        # Node: [hash, items, {distance: child}]
+        self._root: list | None = None
+
+    def add(self, value: int, item) -> None:
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list:
+        """Items whose hash is within ``radius`` of ``value``."""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend(node[1])
+            # Triangle inequality: only these subtrees can hold matches
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+class DuplicateFinder:
+    """Hashes images on a background pool and groups near-duplicates.
+
+    :meth:`add_images` may be called repeatedly as a scan progresses.
+    Results are merged into the tree on the caller's thread by
+    :meth:`poll`, so the GUI calls it from its ``after()`` loop.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="phash")
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._submitted: set[Path] = set()
+        self._hashes: dict[Path, ImageHashes] = {}
+        self._tree = BKTree()
+        # Direct matches of each image, with their pHash distance
+        self._matches: dict[Path, dict[Path, int]] = {}
+
+    def add_images(self, paths: list[Path]) -> None:
+        for path in paths:
+            if path not in self._submitted:
+                self._submitted.add(path)
+                future = self._executor.submit(compute_hashes, path)
+                future.add_done_callback(lambda f, p=path: self._done.put((p, f)))
+
+    def poll(self) -> bool:
+        """Merge finished hashes. Returns True if any group changed."""
+        changed = False
+        while True:
+            try:
+                path, future = self._done.get_nowait()
+            except queue.Empty:
+                return changed
+            if future.cancelled() or future.exception() is not None:
+                continue  # unreadable images simply never group
+            changed |= self._insert(path, future.result())
+
+    def group_of(self, path: Path) -> list[Path]:
+        """``path`` followed by its direct matches, closest first."""
+        matches = self._matches.get(path, {})
+        return [path, *sorted(matches, key=matches.get)]
+
+    def hashed_count(self) -> int:
+        return len(self._hashes)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _insert(self, path: Path, hashes: ImageHashes) -> bool:
+        self._hashes[path] = hashes
+        matched = False
+        for other in self._tree.search(hashes.phash, PHASH_THRESHOLD):
+            if hamming(hashes.dhash, self._hashes[other].dhash) <= DHASH_THRESHOLD:
+                distance = hamming(hashes.phash, self._hashes[other].phash)
+                self._matches.setdefault(path, {})[other] = distance
+                self._matches.setdefault(other, {})[path] = distance
+                matched = True
+        self._tree.add(hashes.phash, path)
+        return matched
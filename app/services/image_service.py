@@ -1,29 +1,355 @@
 """Service for listing images from the input folder."""
 
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Iterator
 
-from app.services.settings_service import get_input_dir
+from app.services import timing_service
+from app.services.settings_service import get_input_roots, get_output_dir, get_settings
 
 # Supported image extensions
 SUPPORTED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
 
+# Other names worth sniffing: JPEG aliases, and files with no extension at all
+SNIFFED_EXTENSIONS = {"", ".jpe", ".jfif", ".jif"}
 
-def get_image_list() -> list[Path]:
-    """Return a sorted list of image file paths from the input directory.
+# Bytes read from the start of each file to identify its format
+SNIFF_BYTES = 32
 
-    Only includes files with supported image extensions.
-    Returns an empty list if the directory doesn't exist or contains no images.
+# Files sniffed concurrently
+SNIFF_WORKERS = 8
+
+# Files per pool task when sniffing many at once
+SNIFF_CHUNK = 256
+
+# Valid sizes of the BMP info header that follows the 14-byte file header
+_BMP_HEADER_SIZES = {12, 40, 52, 56, 64, 108, 124}
+
+# Paths handed out per batch while scanning
+SCAN_BATCH_SIZE = 500
+
+# Directories listed concurrently when walking folder trees; listing is
+# I/O-bound, so this is not tied to the CPU count
+WALK_WORKERS = 8
+
+# Orders images can be presented in (the "sort_order" setting):
+# name, name with numbers compared by value, EXIF capture time (falling
+# back to mtime), file mtime, file size and pixel count
+SORT_ORDERS = ("name", "natural", "taken", "mtime", "size", "dimensions")
+DEFAULT_SORT_ORDER = "name"
+
+# Orders that need header metadata (read once, then kept in the index)
+METADATA_ORDERS = {"taken", "dimensions"}
+
+# Numbers are zero-padded to this many digits for natural ordering
+NATURAL_DIGITS = 20
+_DIGIT_RUN = re.compile(r"[0-9]+")
+
+
+def sort_key(path: Path) -> tuple[str, str]:
+    """Key giving the order images are presented in: by folder, then name."""
+    # Splitting the string skips building a parent Path per call, which
+    # dominates sorting hundreds of thousands of paths (str() of a Path only
+    # ever uses os.sep)
+    folder, _, name = str(path).rpartition(os.sep)
+    return folder.lower(), name.lower()
+
+
+def natural_key(path: Path) -> tuple[str, str]:
+    """Like :func:`sort_key`, but numbers compare by value (IMG_2 before IMG_10)."""
+    folder, name = sort_key(path)
+    return _DIGIT_RUN.sub(_pad_digits, folder), _DIGIT_RUN.sub(_pad_digits, name)
+
+
+def _pad_digits(match: re.Match) -> str:
+    return match.group().rjust(NATURAL_DIGITS, "0")
+
+
+def has_image_name(name: str) -> bool:
+    """Check whether a file name has an extension images may carry."""
+    extension = os.path.splitext(name)[1].lower()
+    return extension in SUPPORTED_EXTENSIONS or extension in SNIFFED_EXTENSIONS
+
+
+def claims_image(path: Path) -> bool:
+    """Whether a file's extension says it is an image.
+
+    Only these are reported when they fail the sniff: a file without an
+    extension that is not an image is simply not one of ours.
+    """
+    return path.suffix != "" and has_image_name(path.name)
+
+
+def is_image_entry(entry: os.DirEntry) -> bool:
+    """Check whether a scandir entry may be an image, without an extra stat call.
+
+    The extension is checked first; ``DirEntry.is_file()`` then answers from
+    the type information the directory listing already returned.  The
+    contents are confirmed later by :func:`validate_images`.
+    """
+    if not has_image_name(entry.name):
+        return False
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def sniff_format(image_path: Path) -> str | None:
+    """Identify a supported image format from the file's magic bytes.
+
+    Returns the Pillow format name, or None for empty, unreadable or
+    unsupported files.
+    """
+    try:
+        with open(image_path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return None
+
+    if head.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    if head[:2] == b"BM" and len(head) >= 18 and int.from_bytes(head[14:18], "little") in _BMP_HEADER_SIZES:
+        return "BMP"
+    return None
+
+
+_sniff_lock = threading.Lock()
+_sniff_pool: ThreadPoolExecutor | None = None
+
+
+def _get_sniff_pool() -> ThreadPoolExecutor:
+    global _sniff_pool
+    with _sniff_lock:
+        if _sniff_pool is None:
+            _sniff_pool = ThreadPoolExecutor(max_workers=SNIFF_WORKERS, thread_name_prefix="sniff")
+        return _sniff_pool
+
+
+def _sniff_chunk(paths: list[Path]) -> list[str | None]:
+    return [sniff_format(path) for path in paths]
+
+
+def sniff_formats(paths: list[Path]) -> list[str | None]:
+    """:func:`sniff_format` for many files, in parallel.
+
+    Files go to the pool in chunks: a 32-byte read is cheaper than handing
+    a single file to another thread.
+    """
+    if len(paths) <= SNIFF_CHUNK:
+        return _sniff_chunk(paths)
+    chunks = [paths[i:i + SNIFF_CHUNK] for i in range(0, len(paths), SNIFF_CHUNK)]
+    return [fmt for chunk in _get_sniff_pool().map(_sniff_chunk, chunks) for fmt in chunk]
+
+
+def validate_images(paths: list[Path], rejected: list[Path] | None = None) -> list[Path]:
+    """Keep the paths whose contents are a supported image, checked in parallel.
+
+    Paths that fail the check are appended to ``rejected`` when given.
+    """
+    valid = []
+    for path, image_format in zip(paths, _get_sniff_pool().map(sniff_format, paths)):
+        if image_format is not None:
+            valid.append(path)
+        elif rejected is not None and claims_image(path):
+            rejected.append(path)
+    return valid
+
+
+def _list_directory(directory: Path, recursive: bool) -> tuple[list[Path], list[Path]]:
+    """List one directory: its images and (if recursive) its subdirectories."""
+    images, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if is_image_entry(entry):
+                    images.append(Path(entry.path))
+                elif recursive:
+                    try:
+                        # Symlinked folders are not followed, so loops can't occur
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(Path(entry.path))
+                    except OSError:
+                        pass
+    except OSError:
+        # Unreadable folder (permissions, vanished mid-walk) — skip it
+        pass
+    return images, subdirs
+
+
+def walk_image_batches(
+    roots: list[Path],
+    recursive: bool = True,
+    exclude: set[Path] = frozenset(),
+    batch_size: int = SCAN_BATCH_SIZE,
+    workers: int = WALK_WORKERS,
+    rejected: list[Path] | None = None,
+) -> Iterator[list[Path]]:
+    """Yield images from several folder trees, listing directories in parallel.
+
+    Each directory is listed by a pool task, and its subdirectories are
+    queued as new tasks as soon as it completes, so wide and deep trees keep
+    every worker busy.  Batches come out in completion order; sort the
+    collected paths with :func:`sort_key` for a deterministic order.
+    Directories in ``exclude`` (and anything below them) are skipped, and
+    files that turn out not to be images go to ``rejected`` when given.
+    """
+    seen = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    pending = set()
+    batch: list[Path] = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="walk") as pool:
+
+        def visit(directory: Path) -> None:
+            key = os.path.normcase(os.path.abspath(directory))
+            if key not in seen:
+                seen.add(key)
+                pending.add(pool.submit(_list_directory, directory, recursive))
+
+        for root in roots:
+            if root.is_dir():
+                visit(root)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                images, subdirs = future.result()
+                for subdir in subdirs:
+                    visit(subdir)
+                batch.extend(images)
+
+            while len(batch) >= batch_size:
+                yield sorted(validate_images(batch[:batch_size], rejected), key=sort_key)
+                del batch[:batch_size]
+
+    if batch:
+        yield sorted(validate_images(batch, rejected), key=sort_key)
+
+
+def _get_index():
+    # Imported late: index_service builds on this module's helpers
+    from app.services.index_service import get_index
+
+    return get_index()
+
+
+def input_scope() -> tuple[list[Path], bool, set[Path]]:
+    """The configured input folders as (roots, recursive, excluded folders)."""
+    return get_input_roots(), get_settings()["recursive"], {get_output_dir()}
+
+
+def get_sort_order() -> str:
+    """The configured order, or the default if the setting is unknown."""
+    order = get_settings()["sort_order"]
+    return order if order in SORT_ORDERS else DEFAULT_SORT_ORDER
+
+
+def iter_input_batches(
+    batch_size: int = SCAN_BATCH_SIZE,
+    rejected: list[Path] | None = None,
+) -> Iterator[list[Path]]:
+    """Yield images from all configured input folders, updating the index."""
+    roots, recursive, exclude = input_scope()
+    yield from _get_index().scan(roots, recursive, exclude, batch_size=batch_size, rejected=rejected)
+
+
+def get_image_list(order: str = DEFAULT_SORT_ORDER) -> list[Path]:
+    """Return image file paths from the input directories, sorted by ``order``.
+
+    ``order`` is one of :data:`SORT_ORDERS`.  Only includes files whose
+    contents are a supported image format.  Returns an empty list if the
+    directory doesn't exist or contains no images.
     """
-    images_dir = get_input_dir()
+    _get_index().refresh(*input_scope())
+    return ordered_input_images(order)
+
+
+def ordered_input_images(order: str = DEFAULT_SORT_ORDER) -> list[Path]:
+    """The images found by the last scan, in ``order``.
+
+    Orders by dimensions or capture time first read any headers the index
+    does not have yet (in parallel, no pixels decoded).
+    """
+    index = _get_index()
+    scope = input_scope()
+    with timing_service.span(f"order.{order}"):
+        if order in METADATA_ORDERS:
+            index.fill_metadata(*scope)
+        return index.images(*scope, order=order)
+
+
+class ImageScan:
+    """Runs an image listing (by default :func:`iter_input_batches`) on a worker thread.
+
+    The GUI collects what has been found so far with :meth:`poll` (from an
+    ``after()`` loop) and can show the first image long before a huge
+    folder has been fully listed.  Files skipped as broken or non-images
+    accumulate in :attr:`rejected`.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        source: Callable[..., Iterator[list[Path]]] = iter_input_batches,
+        order: str | None = None,
+    ):
+        self.done = False
+        self.error: Exception | None = None
+        self.rejected: list[Path] = []
+        # With an ``order``, every image found, in that order, once done
+        self.order = order
+        self.ordered: list[Path] | None = None
+        self._batches: queue.SimpleQueue = queue.SimpleQueue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(source,), name="image-scan", daemon=True)
+        self._thread.start()
 
-    if not images_dir.exists():
-        images_dir.mkdir(parents=True, exist_ok=True)
-        return []
+    def poll(self) -> list[Path]:
+        """Return the images found since the last call."""
+        found = []
+        while True:
+            try:
+                item = self._batches.get_nowait()
+            except queue.Empty:
+                return found
+            if item is self._DONE:
+                self.done = True
+            else:
+                found.extend(item)
 
-    images = [
-        f
-        for f in images_dir.iterdir()
-        if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS
-    ]
+    def cancel(self) -> None:
+        self._cancelled.set()
 
-    return sorted(images, key=lambda p: p.name.lower())
+    def _run(self, source: Callable[..., Iterator[list[Path]]]) -> None:
+        start = waited_from = time.perf_counter()
+        first = True
+        try:
+            for batch in source(rejected=self.rejected):
+                if self._cancelled.is_set():
+                    return
+                now = time.perf_counter()
+                timing_service.record("scan.first_batch" if first else "scan.batch", now - waited_from)
+                first = False
+                self._batches.put(batch)
+                waited_from = time.perf_counter()
+            timing_service.record("scan.total", time.perf_counter() - start)
+            if self.order is not None:
+                # Off the Tk thread: may read headers for thousands of files
+                self.ordered = ordered_input_images(self.order)
+        except OSError as e:
+            self.error = e
+        finally:
+            self._batches.put(self._DONE)
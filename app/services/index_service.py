@@ -0,0 +1,450 @@
+"""Persistent SQLite index of the images in the input folders."""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator
+
+from app.services import image_service
+from app.services.metadata_service import read_metadata
+from app.services.settings_service import DATA_DIR
+
+INDEX_FILE = DATA_DIR / "index.sqlite3"
+
+SCHEMA_VERSION = 2
+
+# A folder modified this recently may still change within the same mtime
+# tick, so it is listed again next time instead of being trusted
+RACY_SECONDS = 2.0
+
+# Header reads run in parallel, this many files per pool task
+METADATA_WORKERS = 8
+METADATA_CHUNK = 64
+
+# ORDER BY clause for each of image_service.SORT_ORDERS
+SQL_ORDERS = {
+    "name": "order_key",
+    "natural": "natural_key, order_key",
+    # Images without an EXIF date fall in among the others by mtime (EXIF
+    # times are local, so the mtime is converted to local time too)
+    "taken": (
+        "COALESCE(taken_at, strftime('%Y-%m-%dT%H:%M:%S', mtime_ns / 1000000000, 'unixepoch', 'localtime')),"
+        " order_key"
+    ),
+    "mtime": "mtime_ns, order_key",
+    "size": "size, order_key",
+    "dimensions": "width * height, order_key",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    format TEXT,            -- NULL: not a supported image (rejected)
+    width INTEGER,          -- NULL until the header is read; 0 if unreadable
+    height INTEGER,
+    taken_at TEXT,          -- EXIF capture time, ISO 8601
+    decision TEXT,          -- category it was sorted into, NULL while unsorted
+    order_key TEXT NOT NULL,    -- image_service.sort_key, joined by NUL
+    natural_key TEXT NOT NULL   -- image_service.natural_key, joined by NUL
+);
+CREATE INDEX IF NOT EXISTS images_folder ON images (folder);
+-- Covers listing and counting unsorted images without touching the table
+CREATE INDEX IF NOT EXISTS images_unsorted ON images (folder, order_key, path)
+    WHERE format IS NOT NULL AND decision IS NULL;
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,  -- 0: list again on the next scan
+    subdirs TEXT NOT NULL       -- subfolder names, newline-separated
+);
+"""
+
+
+def _order_keys(path: Path) -> tuple[str, str]:
+    # Compare like the key tuples: NUL sorts before any character
+    return "\0".join(image_service.sort_key(path)), "\0".join(image_service.natural_key(path))
+
+
+def _unsettled(size: int, mtime_ns: int, image_format: str | None, now_ns: int) -> bool:
+    """Whether a rejected file may still be being written: empty, or changed within the last tick."""
+    return image_format is None and (size == 0 or now_ns - mtime_ns < RACY_SECONDS * 1e9)
+
+
+def _read_headers(paths: list[str]) -> list[tuple[int, int, str | None, str]]:
+    """(width, height, taken_at, path) rows for :meth:`ImageIndex.fill_metadata`."""
+    rows = []
+    for path in paths:
+        try:
+            metadata = read_metadata(Path(path))
+        except Exception:
+            rows.append((0, 0, None, path))  # unreadable: don't try again until it changes
+            continue
+        taken_at = metadata.taken_at.isoformat(timespec="seconds") if metadata.taken_at else None
+        rows.append((metadata.width, metadata.height, taken_at, path))
+    return rows
+
+
+class ImageIndex:
+    """SQLite-backed listing of image folders. Thread-safe."""
+
+    def __init__(self, db_file: Path):
+        self.db_file = db_file
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Only a cache of the disk — rebuild rather than migrate
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS images; DROP TABLE IF EXISTS folders;"
+                + _SCHEMA
+                + f"PRAGMA user_version={SCHEMA_VERSION};"
+            )
+
+    # ── Scanning ──
+
+    def scan(
+        self,
+        roots: list[Path],
+        recursive: bool = False,
+        exclude: set[Path] = frozenset(),
+        batch_size: int = image_service.SCAN_BATCH_SIZE,
+        workers: int = image_service.WALK_WORKERS,
+        rejected: list[Path] | None = None,
+    ) -> Iterator[list[Path]]:
+        """Bring the index up to date with the disk, yielding images in batches.
+
+        Mirrors :func:`image_service.walk_image_batches`: folders are
+        refreshed in parallel, batches come out in completion order (each
+        sorted with ``sort_key``), ``exclude`` trees are skipped and files
+        that are not images go to ``rejected`` when given.
+        """
+        batch: list[Path] = []
+        mixed = False  # whether the batch spans folders (and needs sorting)
+        for images, skipped in self._walk(roots, recursive, exclude, workers, listing=True):
+            if rejected is not None:
+                rejected.extend(skipped)
+            if not images:
+                continue
+            mixed = mixed or bool(batch)
+            batch.extend(images)
+            while len(batch) >= batch_size:
+                # Each folder arrives in order, so one-folder batches are ready
+                chunk = batch[:batch_size]
+                yield sorted(chunk, key=image_service.sort_key) if mixed else chunk
+                del batch[:batch_size]
+                mixed = False
+        if batch:
+            yield sorted(batch, key=image_service.sort_key) if mixed else batch
+
+    def refresh(
+        self,
+        roots: list[Path],
+        recursive: bool = False,
+        exclude: set[Path] = frozenset(),
+        workers: int = image_service.WALK_WORKERS,
+    ) -> None:
+        """Bring the index up to date without listing anything.
+
+        Unchanged folders cost a single ``stat``; use :meth:`images` afterwards.
+        """
+        for _ in self._walk(roots, recursive, exclude, workers, listing=False):
+            pass
+
+    def _walk(
+        self, roots: list[Path], recursive: bool, exclude: set[Path], workers: int, listing: bool,
+    ) -> Iterator[tuple[list[Path], list[Path]]]:
+        """Refresh folders in parallel, yielding (images, rejected) per folder."""
+        seen = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="index") as pool:
+
+            def visit(directory: Path) -> None:
+                key = os.path.normcase(os.path.abspath(directory))
+                if key not in seen:
+                    seen.add(key)
+                    pending.add(pool.submit(self._refresh_folder, directory, listing))
+
+            for root in roots:
+                if root.is_dir():
+                    visit(root)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    images, skipped, subdirs = future.result()
+                    if recursive:
+                        for subdir in subdirs:
+                            visit(subdir)
+                    yield images, skipped
+
+    def _refresh_folder(self, directory: Path, listing: bool) -> tuple[list[Path], list[Path], list[Path]]:
+        """Sync one folder's rows with the disk: (images, rejected, subfolders).
+
+        Images come back in ``sort_key`` order; with ``listing`` off an
+        unchanged folder is not read from the index at all.
+        """
+        folder = str(directory)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            # Vanished or unreadable — nothing in it can be listed
+            self._forget_folder(folder)
+            return [], [], []
+
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns, subdirs FROM folders WHERE path = ?", (folder,)).fetchone()
+        if row is not None and row[0] == mtime_ns:
+            subdirs = [directory / name for name in row[1].split("\n") if name]
+            if not listing:
+                return [], [], subdirs
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT name, format FROM images WHERE folder = ? AND decision IS NULL ORDER BY order_key",
+                    (folder,),
+                ).fetchall()
+            images = [directory / name for name, fmt in rows if fmt is not None]
+            skipped = [directory / name for name, fmt in rows if fmt is None]
+            return images, [path for path in skipped if image_service.claims_image(path)], subdirs
+
+        listed: dict[str, tuple[int, int]] = {}
+        subdir_names: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if image_service.is_image_entry(entry):
+                            stat = entry.stat()
+                            listed[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdir_names.append(entry.name)
+                    except OSError:
+                        pass  # deleted while listing
+        except OSError:
+            self._forget_folder(folder)
+            return [], [], []
+
+        with self._lock:
+            stored = {
+                name: (size, mtime, fmt, decision)
+                for name, size, mtime, fmt, decision in self._conn.execute(
+                    "SELECT name, size, mtime_ns, format, decision FROM images WHERE folder = ?",
+                    (folder,),
+                )
+            }
+
+        # Names in one folder order like their paths do
+        names = sorted(listed, key=str.lower)
+        paths = [directory / name for name in names]
+        formats = {name: fmt for name, (_, _, fmt, _) in stored.items()}
+        # Originals of copied images stay listed on disk but are already sorted
+        decided = {name for name, (*_, decision) in stored.items() if decision is not None}
+
+        # Only new or modified files are read (a 32-byte sniff each, in
+        # parallel), and rejects that may have been caught mid-write
+        now_ns = time.time_ns()
+        changed = [
+            (name, path) for name, path in zip(names, paths)
+            if name not in stored or stored[name][:2] != listed[name] or _unsettled(*stored[name][:3], now_ns)
+        ]
+        sniffed = image_service.sniff_formats([path for _, path in changed])
+        rows = []
+        for (name, path), image_format in zip(changed, sniffed):
+            formats[name] = image_format
+            decided.discard(name)  # modified since: offered again
+            rows.append((str(path), folder, name, *listed[name], image_format, *_order_keys(path)))
+        removed = [(str(directory / name),) for name in stored.keys() - listed.keys()]
+
+        # A folder changed within the last tick is listed again next time, and
+        # so is one with unsettled rejects: filling in a file leaves the
+        # folder's own mtime alone
+        trusted = mtime_ns if now_ns - mtime_ns > RACY_SECONDS * 1e9 else 0
+        if any(_unsettled(*listed[name], formats[name], now_ns) for name in names):
+            trusted = 0
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM images WHERE path = ?", removed)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO images (path, folder, name, size, mtime_ns, format, order_key, natural_key)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO folders (path, mtime_ns, subdirs) VALUES (?, ?, ?)",
+                (folder, trusted, "\n".join(subdir_names)),
+            )
+
+        subdirs = [directory / name for name in subdir_names]
+        if not listing:
+            return [], [], subdirs
+        images, skipped = [], []
+        for name, path in zip(names, paths):
+            if name in decided:
+                continue
+            if formats[name] is not None:
+                images.append(path)
+            elif image_service.claims_image(path):
+                skipped.append(path)
+        return images, skipped, subdirs
+
+    def _forget_folder(self, folder: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM images WHERE folder = ?", (folder,))
+            self._conn.execute("DELETE FROM folders WHERE path = ?", (folder,))
+
+    # ── Queries (answered from the index alone, as of the last scan) ──
+
+    def images(
+        self,
+        roots: list[Path],
+        recursive: bool = False,
+        exclude: set[Path] = frozenset(),
+        order: str = "name",
+    ) -> list[Path]:
+        """Unsorted images under ``roots``, in one of the ``SQL_ORDERS``."""
+        where, params = self._scope(roots, recursive, exclude)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path FROM images WHERE {where} ORDER BY {SQL_ORDERS[order]}", params,
+            ).fetchall()
+        return [Path(path) for path, in rows]
+
+    def fill_metadata(
+        self,
+        roots: list[Path],
+        recursive: bool = False,
+        exclude: set[Path] = frozenset(),
+        workers: int = METADATA_WORKERS,
+    ) -> int:
+        """Read the headers of images under ``roots`` not read yet; returns how many."""
+        where, params = self._scope(roots, recursive, exclude)
+        with self._lock:
+            paths = [path for path, in self._conn.execute(
+                f"SELECT path FROM images WHERE {where} AND width IS NULL", params,
+            )]
+        if not paths:
+            return 0
+
+        chunks = [paths[i:i + METADATA_CHUNK] for i in range(0, len(paths), METADATA_CHUNK)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="headers") as pool:
+            for rows in pool.map(_read_headers, chunks):
+                with self._lock, self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany(
+                        "UPDATE images SET width = ?, height = ?, taken_at = ? WHERE path = ?", rows,
+                    )
+        return len(paths)
+
+    def folders(self, roots: list[Path], recursive: bool = False, exclude: set[Path] = frozenset()) -> list[Path]:
+        """Folders under ``roots`` as of the last scan."""
+        where, params = self._scope(roots, recursive, exclude, column="path")
+        with self._lock:
+            rows = self._conn.execute(f"SELECT path FROM folders WHERE {where}", params).fetchall()
+        return [Path(path) for path, in rows]
+
+    def folder_state(self, directory: Path) -> tuple[int, set[str]]:
+        """A folder's mtime when last listed (0 if unknown) and its image file names then."""
+        folder = str(directory)
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns FROM folders WHERE path = ?", (folder,)).fetchone()
+            names = {name for name, in self._conn.execute(
+                "SELECT name FROM images WHERE folder = ?", (folder,),
+            )}
+        return (row[0] if row is not None else 0), names
+
+    def decisions(self) -> list[tuple[Path, str]]:
+        """Every sorted image still on record: (current path, category)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT path, decision FROM images WHERE decision IS NOT NULL").fetchall()
+        return [(Path(path), decision) for path, decision in rows]
+
+    @staticmethod
+    def _scope(roots: list[Path], recursive: bool, exclude: set[Path], column: str = "folder") -> tuple[str, list]:
+        """WHERE clause selecting unsorted images in the given folders.
+
+        With ``column="path"`` it selects rows of the ``folders`` table instead.
+        """
+
+        def subtree(path: Path) -> tuple[str, list]:
+            # Range over the prefix "<path>/" — uses the folder index, unlike LIKE
+            prefix = os.path.join(str(path), "")
+            return f"({column} = ? OR ({column} >= ? AND {column} < ?))", [
+                str(path), prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1),
+            ]
+
+        clauses, params = [], []
+        for root in roots:
+            if recursive:
+                clause, values = subtree(root)
+                clauses.append(clause)
+                params += values
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(str(root))
+        where = f"({' OR '.join(clauses) or '0'})"
+        if column == "folder":
+            where = "format IS NOT NULL AND decision IS NULL AND " + where
+        for path in exclude:
+            clause, values = subtree(path)
+            where += f" AND NOT {clause}"
+            params += values
+        return where, params
+
+    # ── Updates ──
+
+    def note_moved(self, old_path: Path, new_path: Path, decision: str | None) -> None:
+        """Re-key a moved image's row (keeping its metadata) and set its decision."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM images WHERE path = ?", (str(new_path),))
+            self._conn.execute(
+                "UPDATE images SET path = ?, folder = ?, name = ?, decision = ?, order_key = ?, natural_key = ?"
+                " WHERE path = ?",
+                (str(new_path), str(new_path.parent), new_path.name, decision, *_order_keys(new_path), str(old_path)),
+            )
+
+    def note_decided(self, path: Path, decision: str | None) -> None:
+        """Set (or clear) the decision of an image that stays where it is."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE images SET decision = ? WHERE path = ?", (decision, str(path)))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_index: ImageIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> ImageIndex:
+    """Return the app-wide index, opening (or creating) it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ImageIndex(INDEX_FILE)
+            atexit.register(_index.close)
+        return _index
+
+
+def note_moved(old_path: Path, new_path: Path, decision: str | None) -> None:
+    """Tell the index (if it is open) that an image was sorted or put back."""
+    if _index is not None:
+        _index.note_moved(old_path, new_path, decision)
+
+
+def note_decided(path: Path, decision: str | None) -> None:
+    """Tell the index (if it is open) that an image was copied into a category, or the copy undone."""
+    if _index is not None:
+        _index.note_decided(path, decision)
@@ -0,0 +1,269 @@
+"""Append-only journal of sort sessions."""
+
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+JOURNAL_DIR = DATA_DIR / "journal"
+
+# fsync after this many records, or this many seconds after the first
+# unsynced one — whichever comes first
+FSYNC_EVERY = 32
+FSYNC_INTERVAL = 2.0
+
+
+@dataclass
+class SessionState:
+    """A session reconstructed from its journal file."""
+
+    session_id: str
+    roots: list[str] = field(default_factory=list)
+    images: list[Path] | None = None
+    # Moves (and copies) still in effect, oldest first: source -> destination
+    moved: dict[Path, Path] = field(default_factory=dict)
+    # Moves undone by a rollback, newest first; what a replay redoes
+    rolled_back: dict[Path, Path] = field(default_factory=dict)
+    # Sources whose latest sort was a copy rather than a move
+    copied: set[Path] = field(default_factory=set)
+    position: Path | None = None
+    finished: bool = False
+
+    def remaining_images(self) -> list[Path]:
+        """The snapshot minus everything that was sorted away."""
+        if self.images is None:
+            return []
+        return [p for p in self.images if p not in self.moved]
+
+
+class Journal:
+    """An open session file. Thread-safe; moves are recorded from workers."""
+
+    def __init__(self, session_id: str, state: SessionState | None = None):
+        self.session_id = session_id
+        self.path = JOURNAL_DIR / f"{session_id}.jsonl"
+        self._lock = threading.Lock()
+        self._moved: dict[Path, Path] = dict(state.moved) if state else {}
+        self._copied: set[Path] = state.copied & state.moved.keys() if state else set()
+        # Opened on first write and reopened if a late record arrives after
+        # close() — moves finishing in the background still get journaled
+        self._file = None
+        self._unsynced = 0
+        self._timer: threading.Timer | None = None
+        # Latest image on screen, not written yet
+        self._position: str | None = None
+
+    def record(self, op: str, **fields) -> None:
+        """Append one record."""
+        entry = {"op": op, "t": round(time.time(), 3), **fields}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if op in ("move", "copy"):
+                self._moved[Path(fields["src"])] = Path(fields["dst"])
+                if op == "copy":
+                    self._copied.add(Path(fields["src"]))
+            elif op == "undo":
+                self._moved.pop(Path(fields["src"]), None)
+                self._copied.discard(Path(fields["src"]))
+
+            self._write(line)
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_EVERY:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(FSYNC_INTERVAL, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def note_position(self, path: Path) -> None:
+        """Remember the image on screen; it is written with the next sync or close."""
+        with self._lock:
+            self._position = str(path)
+
+    def destination_of(self, source: Path) -> Path | None:
+        """Where ``source`` was moved in this session, if the move still stands."""
+        with self._lock:
+            return self._moved.get(source)
+
+    def was_copied(self, source: Path) -> bool:
+        """Whether ``source`` was copied (not moved) by a sort that still stands."""
+        with self._lock:
+            return source in self._copied
+
+    def moves(self) -> list[tuple[Path, Path]]:
+        """Moves still in effect, oldest first."""
+        with self._lock:
+            return list(self._moved.items())
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def close(self, finished: bool = False) -> None:
+        if finished:
+            self.record("end")
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write(self, line: str) -> None:
+        if self._file is None:
+            JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line)
+        self._file.flush()
+
+    def _sync(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._position is not None:
+            entry = {"op": "position", "t": round(time.time(), 3), "path": self._position}
+            self._write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._position = None
+            self._unsynced += 1
+        if self._unsynced and self._file is not None:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+
+_active: Journal | None = None
+_active_lock = threading.Lock()
+
+
+def _new_session_id() -> str:
+    session_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    candidate = session_id
+    while (JOURNAL_DIR / f"{candidate}.jsonl").exists():
+        candidate = f"{session_id}-{suffix}"
+        suffix += 1
+    return candidate
+
+
+def start_session(roots: list[Path]) -> Journal:
+    """Open a new session and make it the one moves are recorded into."""
+    journal = Journal(_new_session_id())
+    journal.record("begin", roots=[str(r) for r in roots])
+    _set_active(journal)
+    return journal
+
+
+def resume_session(state: SessionState) -> Journal:
+    """Reopen an unfinished session and append to it."""
+    active = _active
+    if active is not None and active.session_id == state.session_id:
+        return active
+    journal = Journal(state.session_id, state)
+    journal.record("resume")
+    _set_active(journal)
+    return journal
+
+
+def _set_active(journal: Journal | None) -> None:
+    global _active
+    with _active_lock:
+        previous, _active = _active, journal
+    if previous is not None and previous is not journal:
+        previous.close()
+
+
+def get_active_journal() -> Journal | None:
+    return _active
+
+
+def _sync_active() -> None:
+    journal = _active
+    if journal is not None:
+        journal.sync()
+
+
+atexit.register(_sync_active)
+
+
+def end_active_session(finished: bool) -> None:
+    """Close the active session (marking it finished if all was sorted)."""
+    global _active
+    with _active_lock:
+        journal, _active = _active, None
+    if journal is not None:
+        journal.close(finished)
+
+
+def record_move(source: Path, destination: Path, copy: bool = False) -> None:
+    """Record a move (or copy) in the active session, if there is one."""
+    journal = _active
+    if journal is not None:
+        journal.record("copy" if copy else "move", src=str(source), dst=str(destination))
+
+
+def load_session(session_id: str) -> SessionState:
+    """Rebuild a session's state by reading its journal."""
+    state = SessionState(session_id)
+    path = JOURNAL_DIR / f"{session_id}.jsonl"
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn write from a crash
+            op = entry.get("op")
+            if op == "begin":
+                state.roots = entry.get("roots", [])
+            elif op == "snapshot":
+                state.images = [Path(p) for p in entry.get("images", [])]
+            elif op == "added" and state.images is not None:
+                state.images.extend(Path(p) for p in entry.get("images", []))
+                state.finished = False
+            elif op == "removed" and state.images is not None:
+                gone = {Path(p) for p in entry.get("images", [])}
+                state.images = [p for p in state.images if p not in gone]
+            elif op in ("move", "copy"):
+                move = Path(entry["src"]), Path(entry["dst"])
+                state.moved[move[0]] = move[1]
+                state.rolled_back.pop(move[0], None)
+                if op == "copy":
+                    state.copied.add(move[0])
+                else:
+                    state.copied.discard(move[0])
+                state.finished = False
+            elif op == "undo":
+                destination = state.moved.pop(Path(entry["src"]), None)
+                if entry.get("rollback") and destination is not None:
+                    state.rolled_back[Path(entry["src"])] = destination
+                state.finished = False
+            elif op == "position":
+                state.position = Path(entry["path"])
+            elif op == "end":
+                state.finished = True
+    return state
+
+
+def list_sessions() -> list[str]:
+    """Session ids, newest first."""
+    if not JOURNAL_DIR.exists():
+        return []
+    return sorted((p.stem for p in JOURNAL_DIR.glob("*.jsonl")), reverse=True)
+
+
+def find_resumable(roots: list[Path]) -> SessionState | None:
+    """The newest unfinished session over the same input folders, if any."""
+    wanted = [str(r) for r in roots]
+    for session_id in list_sessions():
+        try:
+            state = load_session(session_id)
+        except OSError:
+            continue
+        if state.roots != wanted:
+            continue
+        if state.finished or state.images is None or not state.remaining_images():
+            return None
+        return state
+    return None
@@ -0,0 +1,160 @@
+"""Shared memory budget for decoded images and Tk photos."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from app.services import settings_service
+
+KIND_PIL = "pil"
+KIND_PHOTO = "photo"
+
+
+def pil_bytes(image) -> int:
+    """Approximate the memory held by a decoded PIL image."""
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+def photo_bytes(photo) -> int:
+    """Tk stores photo images as 32-bit RGBA, whatever the source mode."""
+    return photo.width() * photo.height() * 4
+
+
+@dataclass
+class MemoryUsage:
+    """Snapshot of what the manager is tracking."""
+
+    pil_bytes: int
+    pil_count: int
+    photo_bytes: int
+    photo_count: int
+    pinned_bytes: int
+    max_bytes: int
+    evictions: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.pil_bytes + self.photo_bytes
+
+    def describe(self) -> str:
+        mb = 1024 * 1024
+        return (
+            f"{self.total_bytes / mb:.0f} / {self.max_bytes / mb:.0f} MB  "
+            f"(images {self.pil_count}: {self.pil_bytes / mb:.0f} MB, "
+            f"photos {self.photo_count}: {self.photo_bytes / mb:.0f} MB, "
+            f"{self.evictions} evicted)"
+        )
+
+
+class MemoryManager:
+    """Global LRU ledger of image bytes, evicting through owner callbacks.
+
+    Owners call :meth:`register` once with a callback that drops one of
+    their entries, then :meth:`track` / :meth:`touch` / :meth:`release` as
+    they store, use and drop images.  Thread-safe, although eviction
+    callbacks run on whichever thread pushed the total over budget — owners
+    in this app only track from the Tk thread.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        # (owner id, key) -> (kind, bytes, pinned)
+        self._entries: OrderedDict[tuple[int, Hashable], tuple[str, int, bool]] = OrderedDict()
+        self._evictors: dict[int, Callable[[Hashable], None]] = {}
+        self._total = 0
+        self._evictions = 0
+
+    def register(self, owner, evict: Callable[[Hashable], None]) -> None:
+        with self._lock:
+            self._evictors[id(owner)] = evict
+
+    def unregister(self, owner) -> None:
+        """Forget an owner and everything it tracked."""
+        with self._lock:
+            owner_id = id(owner)
+            self._evictors.pop(owner_id, None)
+            for entry in [e for e in self._entries if e[0] == owner_id]:
+                self._total -= self._entries.pop(entry)[1]
+
+    def track(self, owner, key: Hashable, nbytes: int, kind: str = KIND_PIL, pinned: bool = False) -> None:
+        """Record (or replace) an entry as most recently used, then enforce the budget."""
+        with self._lock:
+            entry = (id(owner), key)
+            previous = self._entries.pop(entry, None)
+            if previous is not None:
+                self._total -= previous[1]
+            self._entries[entry] = (kind, nbytes, pinned)
+            self._total += nbytes
+            self._enforce(keep=entry)
+
+    def touch(self, owner, key: Hashable) -> None:
+        with self._lock:
+            entry = (id(owner), key)
+            if entry in self._entries:
+                self._entries.move_to_end(entry)
+
+    def release(self, owner, key: Hashable) -> None:
+        with self._lock:
+            previous = self._entries.pop((id(owner), key), None)
+            if previous is not None:
+                self._total -= previous[1]
+
+    def set_budget(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._enforce()
+
+    def usage(self) -> MemoryUsage:
+        with self._lock:
+            totals = {KIND_PIL: [0, 0], KIND_PHOTO: [0, 0]}
+            pinned = 0
+            for kind, nbytes, is_pinned in self._entries.values():
+                totals[kind][0] += nbytes
+                totals[kind][1] += 1
+                if is_pinned:
+                    pinned += nbytes
+            return MemoryUsage(
+                pil_bytes=totals[KIND_PIL][0],
+                pil_count=totals[KIND_PIL][1],
+                photo_bytes=totals[KIND_PHOTO][0],
+                photo_count=totals[KIND_PHOTO][1],
+                pinned_bytes=pinned,
+                max_bytes=self.max_bytes,
+                evictions=self._evictions,
+            )
+
+    def _enforce(self, keep: tuple | None = None) -> None:
+        if self._total <= self.max_bytes:
+            return
+        for entry in list(self._entries):
+            if self._total <= self.max_bytes:
+                break
+            value = self._entries.get(entry)
+            if value is None:
+                continue  # released by an earlier eviction callback
+            kind, nbytes, pinned = value
+            if pinned or entry == keep:
+                continue
+            del self._entries[entry]
+            self._total -= nbytes
+            self._evictions += 1
+            evict = self._evictors.get(entry[0])
+            if evict is not None:
+                evict(entry[1])
+
+
+_manager: MemoryManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_memory_manager() -> MemoryManager:
+    """Return the app-wide manager, sized from the ``memory_budget_mb`` setting."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            budget_mb = settings_service.get_settings()["memory_budget_mb"]
+            _manager = MemoryManager(budget_mb * 1024 * 1024)
+        return _manager
@@ -0,0 +1,58 @@
+"""Service for reading image properties from file headers."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from PIL import Image
+
+# EXIF tags (see the EXIF 2.3 specification)
+_TAG_MAKE = 0x010F
+_TAG_MODEL = 0x0110
+_TAG_DATETIME = 0x0132
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATETIME_ORIGINAL = 0x9003
+
+_EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+
+@dataclass
+class ImageMetadata:
+    """Header-level facts about an image file."""
+
+    width: int
+    height: int
+    format: str
+    camera: str = ""
+    taken_at: datetime | None = None
+
+
+def _parse_exif_date(value) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value.strip("\x00 "), _EXIF_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def read_metadata(image_path: Path) -> ImageMetadata:
+    """Read dimensions, format, camera and capture time without decoding.
+
+    Raises whatever Pillow raises for unreadable files.
+    """
+    with Image.open(image_path) as pil_image:
+        width, height = pil_image.size
+        metadata = ImageMetadata(width=width, height=height, format=pil_image.format or "")
+
+        exif = pil_image.getexif()
+        if exif:
+            make = str(exif.get(_TAG_MAKE, "")).strip("\x00 ")
+            model = str(exif.get(_TAG_MODEL, "")).strip("\x00 ")
+            # Models usually repeat the make ("Canon" + "Canon EOS R5")
+            metadata.camera = model if model.startswith(make) else f"{make} {model}".strip()
+            metadata.taken_at = (
+                _parse_exif_date(exif.get_ifd(_TAG_EXIF_IFD).get(_TAG_DATETIME_ORIGINAL))
+                or _parse_exif_date(exif.get(_TAG_DATETIME))
+            )
+    return metadata
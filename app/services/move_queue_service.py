@@ -0,0 +1,149 @@
+"""Write-behind queue that performs sort moves on a background thread."""
+
+import atexit
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services import journal_service, sorting_service, timing_service
+from app.services.journal_service import Journal
+from app.services.settings_service import get_output_dir, get_transfer_mode
+
+
+@dataclass
+class MoveJob:
+    """A single sort decision and, once processed, its outcome."""
+
+    source: Path
+    category_name: str
+    destination: Path | None = None
+    error: Exception | None = None
+    # Session the move is recorded in, fixed when the decision is made
+    journal: Journal | None = None
+    started: bool = False
+    cancelled: bool = False
+    submitted_at: float = 0.0
+
+
+class MoveQueue:
+    """Single worker thread draining sort decisions in batches."""
+
+    def __init__(self):
+        self._jobs: queue.Queue = queue.Queue()
+        self._finished: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending: dict[Path, MoveJob] = {}
+        self._thread = threading.Thread(target=self._run, name="move-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, source: Path, category_name: str) -> MoveJob:
+        """Queue ``source`` to be sorted into ``category_name``."""
+        job = MoveJob(
+            source, category_name,
+            journal=journal_service.get_active_journal(),
+            submitted_at=time.perf_counter(),
+        )
+        with self._lock:
+            self._pending[source] = job
+        self._jobs.put(job)
+        return job
+
+    def poll(self) -> list[MoveJob]:
+        """Return jobs that finished (or failed) since the last call."""
+        finished = []
+        while True:
+            try:
+                finished.append(self._finished.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def cancel(self, source: Path) -> bool:
+        """Withdraw a queued move. False if it already started or finished."""
+        with self._lock:
+            job = self._pending.get(source)
+            if job is None or job.started:
+                return False
+            job.cancelled = True
+            del self._pending[source]
+            return True
+
+    def is_pending(self, source: Path) -> bool:
+        """Whether a move of ``source`` is queued or in progress."""
+        with self._lock:
+            return source in self._pending
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def pending_sources(self) -> set[Path]:
+        """Images queued but not moved yet — they are still in the input folder."""
+        with self._lock:
+            return set(self._pending)
+
+    def flush(self) -> None:
+        """Block until every queued move has been processed."""
+        self._jobs.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._jobs.get()]
+            while True:
+                try:
+                    batch.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process(batch)
+            finally:
+                for _ in batch:
+                    self._jobs.task_done()
+
+    def _process(self, batch: list[MoveJob]) -> None:
+        # One settings lookup per batch rather than per image
+        try:
+            output_dir = get_output_dir()
+            copy = get_transfer_mode() == "copy"
+        except Exception as e:
+            for job in batch:
+                if not job.cancelled:
+                    job.error = e
+                    self._finish(job)
+            return
+
+        for job in batch:
+            with self._lock:
+                if job.cancelled:
+                    continue
+                job.started = True
+            timing_service.record("move.queue_wait", time.perf_counter() - job.submitted_at)
+            try:
+                job.destination = sorting_service.move_into(
+                    job.source, output_dir / job.category_name, job.journal, copy,
+                )
+            except Exception as e:
+                job.error = e
+            self._finish(job)
+
+    def _finish(self, job: MoveJob) -> None:
+        with self._lock:
+            if self._pending.get(job.source) is job:
+                del self._pending[job.source]
+        self._finished.put(job)
+
+
+_move_queue: MoveQueue | None = None
+_move_queue_lock = threading.Lock()
+
+
+def get_move_queue() -> MoveQueue:
+    """Return the app-wide move queue, starting its worker on first use."""
+    global _move_queue
+    with _move_queue_lock:
+        if _move_queue is None:
+            _move_queue = MoveQueue()
+            # Never exit with decisions still sitting in memory
+            atexit.register(_move_queue.flush)
+        return _move_queue
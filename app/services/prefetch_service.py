@@ -0,0 +1,227 @@
+"""Background prefetch of display-ready previews for the sorting screen."""
+
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from app.services.memory_service import MemoryManager, pil_bytes
+from app.services.preview_service import (
+    DISPLAY_SIZE,
+    load_fast_preview,
+    load_preview,
+    supports_fast_preview,
+)
+
+# How many images to keep decoded on each side of the current one
+DEFAULT_AHEAD = 6
+DEFAULT_BEHIND = 2
+
+# Upper bound for decoded previews held in memory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Render stages, tagged on finished futures
+_FAST = "fast"
+_HIGH = "high"
+
+
+class Prefetcher:
+    """Keeps a bounded window of decoded previews around the current image.
+
+    Results are either a PIL image or the exception raised while loading it,
+    so the screen can report broken files without decoding them again.
+
+    With a ``memory`` manager, previews also count against the app-wide
+    budget and may be dropped by it when other views need the room.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Path], object] = load_preview,
+        fast_loader: Callable[[Path], object] | None = load_fast_preview,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        workers: int = 2,
+        memory: MemoryManager | None = None,
+    ):
+        self._loader = loader
+        self._fast_loader = fast_loader
+        self._max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        # Own worker so a fast preview never queues behind full renders
+        self._fast_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending: dict[Path, Future] = {}
+        self._fast_pending: dict[Path, Future] = {}
+        self._fast: dict[Path, object] = {}
+        self._ready: OrderedDict[Path, object] = OrderedDict()
+        self._ready_bytes = 0
+        self._window: list[Path] = []
+        self._memory = memory
+        if memory is not None:
+            memory.register(self, self._drop)
+
+    # ── Public API (Tk thread only) ──
+
+    def update(self, current: Path, ahead: list[Path], behind: list[Path]) -> None:
+        """Move the prefetch window.
+
+        ``current`` is loaded first, then ``ahead`` in order, then ``behind``.
+        Pending loads that fell out of the window are cancelled, so jumping
+        around never leaves the pool busy with images nobody will look at.
+        """
+        window = [current, *ahead, *behind]
+        wanted = set(window)
+        self._window = window
+
+        for path in [p for p in self._pending if p not in wanted]:
+            self._pending.pop(path).cancel()
+        for path in [p for p in self._fast_pending if p != current]:
+            self._fast_pending.pop(path).cancel()
+        self._fast = {p: r for p, r in self._fast.items() if p == current}
+
+        self._evict(wanted)
+
+        if (
+            self._fast_loader is not None
+            and current not in self._ready
+            and current not in self._fast
+            and current not in self._fast_pending
+            and supports_fast_preview(current)
+        ):
+            self._submit(current, _FAST)
+
+        # Previews outside the window are evicted as new ones arrive,
+        # so only the ones inside it count against the budget here
+        budget = self._max_bytes - sum(
+            pil_bytes(r) for p, r in self._ready.items()
+            if p in wanted and not isinstance(r, BaseException)
+        )
+        per_image = self._average_bytes()
+        for path in window:
+            if path in self._ready or path in self._pending:
+                continue
+            if path != current and budget < per_image:
+                break
+            self._submit(path, _HIGH)
+            budget -= per_image
+
+    def get(self, path: Path):
+        """Return the best preview (or load error) for ``path``, or None.
+
+        Falls back to the fast preview while the high-quality one is pending.
+        """
+        result = self._ready.get(path)
+        if result is not None:
+            self._ready.move_to_end(path)
+            if self._memory is not None:
+                self._memory.touch(self, path)
+            return result
+        return self._fast.get(path)
+
+    def is_final(self, path: Path) -> bool:
+        """Whether the high-quality render (or its error) is available."""
+        return path in self._ready
+
+    def poll(self) -> list[Path]:
+        """Collect finished loads. Returns the paths that became ready."""
+        arrived = []
+        while True:
+            try:
+                stage, path, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            pending = self._fast_pending if stage == _FAST else self._pending
+            if pending.get(path) is not future:
+                continue  # cancelled or superseded while decoding
+            del pending[path]
+            error = future.exception()
+            result = error if error is not None else future.result()
+
+            if stage == _FAST:
+                # Late or failed fast previews are useless; the full render
+                # reports errors on its own
+                if path in self._ready or error is not None:
+                    continue
+                self._fast[path] = result
+            else:
+                self._fast.pop(path, None)
+                self._store(path, result)
+            arrived.append(path)
+        if arrived:
+            self._evict(set(self._window))
+        return arrived
+
+    def discard(self, path: Path) -> None:
+        """Forget everything about ``path`` (e.g. after it was moved away)."""
+        for pending in (self._pending, self._fast_pending):
+            future = pending.pop(path, None)
+            if future is not None:
+                future.cancel()
+        self._fast.pop(path, None)
+        self._drop(path)
+
+    def memory_usage(self) -> int:
+        """Bytes currently held by decoded previews."""
+        return self._ready_bytes
+
+    def clear(self) -> None:
+        """Cancel outstanding work and release all previews; workers stay up."""
+        for pending in (self._pending, self._fast_pending):
+            for future in pending.values():
+                future.cancel()
+            pending.clear()
+        self._fast.clear()
+        for path in list(self._ready):
+            self._drop(path)
+        self._window = []
+
+    def shutdown(self) -> None:
+        """Cancel outstanding work, release all previews and stop the workers."""
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._fast_executor.shutdown(wait=False, cancel_futures=True)
+        if self._memory is not None:
+            self._memory.unregister(self)
+
+    # ── Internals ──
+
+    def _submit(self, path: Path, stage: str) -> None:
+        if stage == _FAST:
+            future = self._fast_executor.submit(self._fast_loader, path)
+            self._fast_pending[path] = future
+        else:
+            future = self._executor.submit(self._loader, path)
+            self._pending[path] = future
+        future.add_done_callback(lambda f, s=stage, p=path: self._done.put((s, p, f)))
+
+    def _store(self, path: Path, result) -> None:
+        self._drop(path)
+        self._ready[path] = result
+        if not isinstance(result, BaseException):
+            nbytes = pil_bytes(result)
+            self._ready_bytes += nbytes
+            if self._memory is not None:
+                self._memory.track(self, path, nbytes)
+
+    def _drop(self, path: Path) -> None:
+        result = self._ready.pop(path, None)
+        if result is not None and not isinstance(result, BaseException):
+            self._ready_bytes -= pil_bytes(result)
+            if self._memory is not None:
+                self._memory.release(self, path)
+
+    def _evict(self, wanted: set[Path]) -> None:
+        """Drop previews outside the window, then the least recently used."""
+        for path in [p for p in self._ready if p not in wanted]:
+            if self._ready_bytes <= self._max_bytes:
+                break
+            self._drop(path)
+        while self._ready_bytes > self._max_bytes and len(self._ready) > 1:
+            self._drop(next(iter(self._ready)))
+
+    def _average_bytes(self) -> int:
+        sizes = [pil_bytes(r) for r in self._ready.values() if not isinstance(r, BaseException)]
+        if sizes:
+            return sum(sizes) // len(sizes)
+        return DISPLAY_SIZE[0] * DISPLAY_SIZE[1] * 3
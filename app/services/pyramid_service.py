@@ -0,0 +1,140 @@
+"""Resolution pyramids for zooming into large images."""
+
+import math
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+from app.services import timing_service
+from app.services.memory_service import MemoryManager, pil_bytes
+
+# Edge of a square tile, in level pixels
+TILE_SIZE = 256
+
+# Formats that decode at 1/2, 1/4 or 1/8 scale via draft() (DCT scaling)
+DRAFT_FORMATS = {"JPEG"}
+MAX_DRAFT_LEVEL = 3
+
+# Modes Image.reduce() averages correctly (not palette indices)
+REDUCIBLE_MODES = {"L", "LA", "RGB", "RGBA"}
+
+
+class ImagePyramid:
+    """Lazily decoded resolution levels of one image, served as tiles.
+
+    Thread-safe: tiles are cut on worker threads.  Levels built since the
+    last call are returned by :meth:`take_built` so the caller can report
+    them to the memory manager from its own thread.
+    """
+
+    def __init__(self, path: Path, memory: MemoryManager):
+        self.path = path
+        with Image.open(path) as pil_image:
+            self.size = pil_image.size
+            self.format = pil_image.format
+        self.level_count = 1
+        while max(self.level_size(self.level_count - 1)) > TILE_SIZE:
+            self.level_count += 1
+
+        # Half the budget at most, so one image cannot evict everything else
+        bytes_per_pixel = 3
+        self.finest_level = 0
+        while (
+            self.finest_level < self.level_count - 1
+            and math.prod(self.level_size(self.finest_level)) * bytes_per_pixel > memory.max_bytes // 2
+        ):
+            self.finest_level += 1
+
+        self._levels: dict[int, Image.Image] = {}
+        self._built: list[tuple[int, int]] = []
+        self._lock = threading.Lock()
+
+    def level_size(self, level: int) -> tuple[int, int]:
+        width, height = self.size
+        return max(1, math.ceil(width / 2 ** level)), max(1, math.ceil(height / 2 ** level))
+
+    def level_for(self, scale: float) -> int:
+        """Coarsest level with at least ``scale`` display pixels per image pixel."""
+        if scale >= 1.0:
+            return self.finest_level
+        level = int(math.floor(math.log2(1.0 / scale)))
+        return min(max(level, self.finest_level), self.level_count - 1)
+
+    def tile_grid(self, level: int) -> tuple[int, int]:
+        """Number of (columns, rows) of tiles in a level."""
+        width, height = self.level_size(level)
+        return math.ceil(width / TILE_SIZE), math.ceil(height / TILE_SIZE)
+
+    def tile_box(self, level: int, col: int, row: int) -> tuple[int, int, int, int]:
+        """A tile's bounds in level pixels."""
+        width, height = self.level_size(level)
+        left, top = col * TILE_SIZE, row * TILE_SIZE
+        return left, top, min(left + TILE_SIZE, width), min(top + TILE_SIZE, height)
+
+    def tile(self, level: int, col: int, row: int) -> Image.Image:
+        """Cut one tile out of a level, decoding the level first if needed."""
+        return self.level(level).crop(self.tile_box(level, col, row))
+
+    def level(self, level: int) -> Image.Image:
+        with self._lock:
+            image = self._levels.get(level)
+            if image is None:
+                with timing_service.span("pyramid.level"):
+                    image = self._build(level)
+                self._levels[level] = image
+                self._built.append((level, pil_bytes(image)))
+            return image
+
+    def take_built(self) -> list[tuple[int, int]]:
+        """(level, bytes) of the levels built since the last call."""
+        with self._lock:
+            built, self._built = self._built, []
+            return built
+
+    def drop(self, level: int) -> None:
+        """Forget a level (memory manager eviction callback)."""
+        with self._lock:
+            self._levels.pop(level, None)
+
+    def _build(self, level: int) -> Image.Image:
+        # Reduce from the nearest finer level already decoded...
+        for finer in range(level - 1, self.finest_level - 1, -1):
+            source = self._levels.get(finer)
+            if source is not None:
+                return _reduce(source, 2 ** (level - finer), self.level_size(level))
+
+        # ...or decode the file, at a reduced DCT scale when possible
+        with Image.open(self.path) as pil_image:
+            decoded_level = 0
+            if pil_image.format in DRAFT_FORMATS and level > 0:
+                draft_level = min(level, MAX_DRAFT_LEVEL)
+                pil_image.draft(None, self.level_size(draft_level))
+                decoded_level = round(math.log2(self.size[0] / pil_image.size[0]))
+            pil_image.load()
+            image = pil_image
+            if decoded_level < self.finest_level and image.mode in REDUCIBLE_MODES:
+                # Pillow decodes other formats only at full size; shrink that
+                # to the finest level kept before any converted copy is made
+                image = _reduce(image, 2 ** (self.finest_level - decoded_level), self.level_size(self.finest_level))
+                decoded_level = self.finest_level
+            if image.mode not in ("RGB", "RGBA", "L"):
+                image = image.convert("RGB")
+            elif image is pil_image:
+                image = image.copy()
+        if decoded_level == level and image.size == self.level_size(level):
+            return image
+        if decoded_level >= self.finest_level and image.size == self.level_size(decoded_level):
+            # Keep the finer decode too: zooming in further is likely next
+            self._levels[decoded_level] = image
+            self._built.append((decoded_level, pil_bytes(image)))
+        return _reduce(image, 2 ** (level - decoded_level), self.level_size(level))
+
+
+def _reduce(image: Image.Image, factor: int, size: tuple[int, int]) -> Image.Image:
+    """Shrink by an integer factor (box filter), landing exactly on ``size``."""
+    if factor > 1:
+        image = image.reduce(factor)
+    if image.size != size:
+        image = image.resize(size, Image.BILINEAR)
+    return image
@@ -0,0 +1,127 @@
+"""Service for rule-based (headless) sorting."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from app.models.rule import Rule, validate_rule
+from app.services import category_service, metadata_service, sorting_service
+
+# Classification and moves are I/O-bound (header reads, renames)
+RULE_WORKERS = 8
+
+
+@dataclass
+class PlannedMove:
+    """What happens (or would happen) to one image."""
+
+    source: Path
+    category_name: str | None
+    destination: Path | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "source": str(self.source),
+            "category": self.category_name,
+            "destination": str(self.destination) if self.destination else None,
+            "error": self.error,
+        }
+
+
+def load_rules(rules_file: Path) -> list[Rule]:
+    """Read and validate a rule file.
+
+    Raises ValueError with a readable message when the file is invalid or
+    refers to categories that don't exist in ``categories.json``.
+    """
+    try:
+        with open(rules_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read rule file {rules_file}: {e}") from e
+
+    entries = data.get("rules") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Rule file must contain a non-empty list of rules.")
+
+    known = {cat.name for cat in category_service.get_categories()}
+    rules = []
+    for number, entry in enumerate(entries, start=1):
+        error = validate_rule(entry)
+        if error:
+            raise ValueError(f"Rule {number}: {error}")
+        if entry["category"] not in known:
+            raise ValueError(f"Rule {number}: category '{entry['category']}' does not exist.")
+        rules.append(Rule.from_dict(entry))
+    return rules
+
+
+def classify(image_path: Path, rules: list[Rule]) -> str | None:
+    """Return the category of the first matching rule, or None.
+
+    The image header is read at most once, and only if a rule whose name
+    conditions matched also has header conditions.
+    """
+    metadata = None
+    for rule in rules:
+        if not rule.matches_name(image_path):
+            continue
+        if rule.needs_metadata:
+            if metadata is None:
+                metadata = metadata_service.read_metadata(image_path)
+            if not rule.matches_metadata(metadata):
+                continue
+        return rule.category
+    return None
+
+
+def apply_rules(
+    batches: Iterator[list[Path]],
+    rules: list[Rule],
+    output_dir: Path,
+    dry_run: bool = False,
+    workers: int = RULE_WORKERS,
+    copy: bool = False,
+) -> Iterator[PlannedMove]:
+    """Classify and move (or copy, or with ``dry_run`` only plan) each image.
+
+    Batches are processed one at a time, so memory stays flat no matter how
+    many files the input holds.  Dry runs resolve collisions against an
+    in-memory view of the output folders and never touch the disk.
+    """
+    dry_indexes: dict[str, sorting_service.CategoryIndex] = {}
+
+    def plan(image_path: Path) -> PlannedMove:
+        try:
+            return PlannedMove(image_path, classify(image_path, rules))
+        except Exception as e:
+            return PlannedMove(image_path, None, error=f"cannot read header: {e}")
+
+    def move(planned: PlannedMove) -> PlannedMove:
+        category_dir = output_dir / planned.category_name
+        try:
+            planned.destination = sorting_service.move_into(planned.source, category_dir, copy=copy)
+        except Exception as e:
+            planned.error = str(e)
+        return planned
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rules") as pool:
+        for batch in batches:
+            planned = list(pool.map(plan, batch))
+            matched = [p for p in planned if p.category_name is not None]
+
+            if dry_run:
+                for p in matched:
+                    index = dry_indexes.get(p.category_name)
+                    if index is None:
+                        index = dry_indexes[p.category_name] = sorting_service.CategoryIndex(
+                            output_dir / p.category_name, create=False,
+                        )
+                    p.destination = index.reserve(p.source.name)
+            else:
+                list(pool.map(move, matched))
+
+            yield from planned
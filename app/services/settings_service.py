@@ -1,8 +1,9 @@
 """Service for managing app settings (folder paths)."""
 
-import json
 from pathlib import Path
 
+from app.services.config_store import JsonStore
+
 # Persist settings alongside categories
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 SETTINGS_FILE = DATA_DIR / "settings.json"
@@ -10,40 +11,60 @@ SETTINGS_FILE = DATA_DIR / "settings.json"
 # Default — current working directory (the folder the user launches from)
 DEFAULT_INPUT_DIR = str(Path.cwd())
 
+# How sorted images reach their category folder
+TRANSFER_MODES = ("move", "copy")
+DEFAULT_TRANSFER_MODE = "move"
+
+_store = JsonStore(SETTINGS_FILE, dict)
 
-def _ensure_data_dir() -> None:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+# Input folders already created this session (skip repeated mkdir calls)
+_ensured_dirs: set[Path] = set()
 
 
 def get_settings() -> dict:
-    """Load settings from disk. Returns defaults if file doesn't exist."""
+    """Load settings (cached in memory). Returns defaults if file doesn't exist."""
     defaults = {
         "input_dir": DEFAULT_INPUT_DIR,
+        # Additional folders scanned alongside input_dir
+        "extra_input_dirs": [],
+        # Also look inside subfolders (the sorted/ output is always skipped)
+        "recursive": False,
+        # Sort near-duplicate images together with the one being sorted
+        "group_similar": False,
+        # Memory for decoded previews and on-screen photos, shared by all views
+        "memory_budget_mb": 512,
+        # Order images are presented in (see image_service.SORT_ORDERS)
+        "sort_order": "name",
+        # Move images into categories, or copy them and leave the originals
+        "transfer_mode": DEFAULT_TRANSFER_MODE,
+        # Render previews on threads or in worker processes (see decode_service)
+        "decode_backend": "thread",
     }
 
-    if not SETTINGS_FILE.exists():
+    data = _store.read()
+    if not isinstance(data, dict):
         return defaults
+    # Merge with defaults so new keys are always present
+    return {**defaults, **data}
 
-    try:
-        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Merge with defaults so new keys are always present
-        return {**defaults, **data}
-    except (json.JSONDecodeError, KeyError):
-        return defaults
+
+def preload() -> None:
+    """Read settings and create the input folder ahead of first use (safe off the Tk thread)."""
+    _store.preload()
+    get_input_dir()
 
 
 def save_settings(settings: dict) -> None:
-    """Persist settings to disk."""
-    _ensure_data_dir()
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
+    """Persist settings (written to disk shortly after, coalescing bursts)."""
+    _store.write(settings)
 
 
 def get_input_dir() -> Path:
     """Return the configured input directory as a Path."""
     p = Path(get_settings()["input_dir"])
-    p.mkdir(parents=True, exist_ok=True)
+    if p not in _ensured_dirs:
+        p.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(p)
     return p
 
 
@@ -57,3 +78,70 @@ def set_input_dir(path: str) -> None:
     settings = get_settings()
     settings["input_dir"] = path
     save_settings(settings)
+
+
+def get_input_roots() -> list[Path]:
+    """Return every folder images are collected from, primary first."""
+    settings = get_settings()
+    roots = [get_input_dir()]
+    for extra in settings["extra_input_dirs"]:
+        path = Path(extra)
+        if path not in roots:
+            roots.append(path)
+    return roots
+
+
+def add_extra_input_dir(path: str) -> None:
+    """Scan ``path`` in addition to the input directory."""
+    settings = get_settings()
+    if path != settings["input_dir"] and path not in settings["extra_input_dirs"]:
+        settings["extra_input_dirs"] = [*settings["extra_input_dirs"], path]
+        save_settings(settings)
+
+
+def clear_extra_input_dirs() -> None:
+    """Go back to scanning only the input directory."""
+    settings = get_settings()
+    settings["extra_input_dirs"] = []
+    save_settings(settings)
+
+
+def set_recursive(recursive: bool) -> None:
+    """Enable or disable scanning of subfolders."""
+    settings = get_settings()
+    settings["recursive"] = recursive
+    save_settings(settings)
+
+
+def set_sort_order(order: str) -> None:
+    """Choose the order images are presented in."""
+    settings = get_settings()
+    settings["sort_order"] = order
+    save_settings(settings)
+
+
+def set_group_similar(enabled: bool) -> None:
+    """Enable or disable sorting near-duplicates as one group."""
+    settings = get_settings()
+    settings["group_similar"] = enabled
+    save_settings(settings)
+
+
+def get_transfer_mode() -> str:
+    """The configured transfer mode, or the default if the setting is unknown."""
+    mode = get_settings()["transfer_mode"]
+    return mode if mode in TRANSFER_MODES else DEFAULT_TRANSFER_MODE
+
+
+def set_transfer_mode(mode: str) -> None:
+    """Choose whether sorting moves or copies images."""
+    settings = get_settings()
+    settings["transfer_mode"] = mode
+    save_settings(settings)
+
+
+def set_decode_backend(backend: str) -> None:
+    """Choose where previews are rendered (takes effect for new views)."""
+    settings = get_settings()
+    settings["decode_backend"] = backend
+    save_settings(settings)
@@ -1,31 +1,348 @@
-"""Service for sorting (moving) images into category folders."""
+"""Service for sorting (moving or copying) images into category folders."""
 
+import errno
+import os
 import shutil
+import threading
 from pathlib import Path
+from typing import BinaryIO
 
-from app.services.settings_service import get_output_dir
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
+from app.services import index_service, journal_service, thumbnail_cache_service, timing_service
+from app.services.journal_service import Journal
+from app.services.settings_service import get_output_dir, get_transfer_mode
 
-def sort_image(image_path: Path, category_name: str) -> None:
-    """Move an image into <output_dir>/<category_name>/.
+# Buffer used when a move has to copy across devices (network shares,
+# other drives); large reads keep throughput up on high-latency storage
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Ways copy_file can duplicate a file, cheapest first
+COPY_STRATEGIES = ("hardlink", "reflink", "copy_file_range", "sendfile", "buffered")
+
+# ioctl cloning one file's extents into another (Linux, <linux/fs.h>)
+FICLONE = 0x40049409
+
+# errno values meaning "this strategy does not work between these folders"
+# rather than "the copy failed"; remembered per device pair
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+    errno.ENOSYS, errno.ENOTTY, errno.EBADF, errno.ENOTSOCK,
+}
+# ...and ones that only rule it out for the file at hand (protected
+# hardlinks, link count limit)
+_UNSUPPORTED_FOR_FILE_ERRNOS = {errno.EPERM, errno.EMLINK}
+
+# (strategy, source device, destination device) found not to work
+_unsupported: set[tuple[str, int, int]] = set()
+
+
+class CategoryIndex:
+    """In-memory listing of one category folder for collision-free naming.
+
+    The folder is scanned once; afterwards every name handed out is recorded
+    here, and the next free numeric suffix is remembered per base name, so
+    resolving a collision costs O(1) instead of one ``exists()`` per suffix.
+    Reservations are made under a lock, so concurrent moves into the same
+    folder never pick the same name.
+    """
+
+    def __init__(self, directory: Path, create: bool = True):
+        self.directory = directory
+        self._names: set[str] = set()
+        if create:
+            directory.mkdir(parents=True, exist_ok=True)
+        # Without ``create`` (dry runs) a missing folder just plans as empty
+        if create or directory.is_dir():
+            with os.scandir(directory) as entries:
+                self._names = {os.path.normcase(entry.name) for entry in entries}
+        self._next_suffix: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, filename: str) -> Path:
+        """Claim a free name for ``filename``, adding ``_1``, ``_2``… if taken."""
+        with self._lock:
+            key = os.path.normcase(filename)
+            if key not in self._names:
+                self._names.add(key)
+                return self.directory / filename
+
+            stem, suffix = os.path.splitext(filename)
+            counter = self._next_suffix.get(key, 1)
+            while os.path.normcase(f"{stem}_{counter}{suffix}") in self._names:
+                counter += 1
+            self._next_suffix[key] = counter + 1
+
+            candidate = f"{stem}_{counter}{suffix}"
+            self._names.add(os.path.normcase(candidate))
+            return self.directory / candidate
+
+    def release(self, destination: Path) -> None:
+        """Give back a reserved name whose move did not happen."""
+        with self._lock:
+            self._names.discard(os.path.normcase(destination.name))
+
+
+_indexes: dict[Path, CategoryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_category_index(category_dir: Path) -> CategoryIndex:
+    """Return the (shared) index of ``category_dir``, scanning it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(category_dir)
+        if index is None:
+            index = _indexes[category_dir] = CategoryIndex(category_dir)
+        return index
+
+
+def forget_category_index(category_dir: Path) -> None:
+    """Drop a cached index so the folder is rescanned next time."""
+    with _indexes_lock:
+        _indexes.pop(category_dir, None)
+
+
+def sort_image(image_path: Path, category_name: str) -> Path:
+    """Move (or copy, per the transfer mode setting) an image into <output_dir>/<category_name>/.
 
     Creates the category subdirectory if it doesn't exist.
     If a file with the same name already exists in the target directory,
     a numeric suffix is appended to avoid overwriting.
+    Returns the final destination path.
     """
-    sorted_dir = get_output_dir()
-    category_dir = sorted_dir / category_name
-    category_dir.mkdir(parents=True, exist_ok=True)
+    return move_into(image_path, get_output_dir() / category_name, copy=get_transfer_mode() == "copy")
+
+
+def move_into(image_path: Path, category_dir: Path, journal: Journal | None = None, copy: bool = False) -> Path:
+    """Move an image into ``category_dir``, avoiding name collisions.
+
+    With ``copy`` the original stays where it is and only its index row is
+    marked as sorted, so it is not offered again.  The move is recorded in
+    ``journal``, or in the active session if none is given.
+    """
+    index = get_category_index(category_dir)
+    destination = index.reserve(image_path.name)
+
+    # Files added behind the index's back are already taken: reserve the next
+    # name until one is free on disk, as os.rename would silently overwrite
+    # them on POSIX
+    while os.path.lexists(destination):
+        destination = index.reserve(image_path.name)
+
+    try:
+        if copy:
+            copy_file(image_path, destination)
+        else:
+            with timing_service.span("move.file"):
+                move_file(image_path, destination)
+    except OSError:
+        index.release(destination)
+        if not category_dir.is_dir():
+            # Folder removed while the app was running — rescan next time
+            forget_category_index(category_dir)
+        raise
+    if copy:
+        index_service.note_decided(image_path, category_dir.name)
+    else:
+        thumbnail_cache_service.note_moved(image_path, destination)
+        index_service.note_moved(image_path, destination, category_dir.name)
+    op = "copy" if copy else "move"
+    if journal is not None:
+        journal.record(op, src=str(image_path), dst=str(destination))
+    else:
+        journal_service.record_move(image_path, destination, copy)
+    return destination
+
+
+def undo_move(source: Path, journal: Journal | None = None, rollback: bool = False) -> bool:
+    """Move a sorted image back to where it came from (or delete its copy).
+
+    Looks the move up in ``journal`` (default: the active session).
+    ``rollback`` marks the undo as part of a session rollback, so a replay
+    redoes it.  Returns False if no move of ``source`` is on record.
+    """
+    extra = {"rollback": True} if rollback else {}
+    journal = journal or journal_service.get_active_journal()
+    if journal is None:
+        return False
+    destination = journal.destination_of(source)
+    if destination is None:
+        return False
+    if journal.was_copied(source):
+        destination.unlink(missing_ok=True)
+        get_category_index(destination.parent).release(destination)
+        index_service.note_decided(source, None)
+        journal.record("undo", src=str(source), dst=str(destination), **extra)
+        return True
+    if os.path.lexists(source):
+        raise FileExistsError(errno.EEXIST, "Another file now has the original name", str(source))
+
+    source.parent.mkdir(parents=True, exist_ok=True)
+    move_file(destination, source)
+    get_category_index(destination.parent).release(destination)
+    thumbnail_cache_service.note_moved(destination, source)
+    index_service.note_moved(destination, source, None)
+    journal.record("undo", src=str(source), dst=str(destination), **extra)
+    return True
+
+
+def rollback_session(session_id: str) -> list[tuple[Path, Exception]]:
+    """Undo every move of a session, newest first.
+
+    Returns the moves that could not be undone, with the reason.
+    """
+    journal = Journal(session_id, journal_service.load_session(session_id))
+    failed = []
+    try:
+        for source, _ in reversed(journal.moves()):
+            try:
+                undo_move(source, journal, rollback=True)
+            except OSError as e:
+                failed.append((source, e))
+    finally:
+        journal.close()
+    return failed
+
+
+def replay_session(session_id: str) -> list[tuple[Path, Exception]]:
+    """Redo the moves a rollback undid, oldest first.
+
+    Only the decisions that stood when the session was rolled back are
+    redone, not ones the user had undone or replaced.  Images that are no
+    longer in their original place are skipped.
+    Returns the moves that failed, with the reason.
+    """
+    state = journal_service.load_session(session_id)
+    journal = Journal(session_id, state)
+    failed = []
+    try:
+        for source, destination in reversed(list(state.rolled_back.items())):
+            if journal.destination_of(source) is not None or not source.exists():
+                continue
+            try:
+                move_into(source, destination.parent, journal, copy=source in state.copied)
+            except OSError as e:
+                failed.append((source, e))
+    finally:
+        journal.close()
+    return failed
+
+
+def move_file(source: Path, destination: Path) -> None:
+    """Move a file, renaming in place when source and destination share a device.
+
+    Across devices the file is copied with :func:`copy_file` (minus the
+    hardlink, which cannot cross devices) and the original deleted after.
+    """
+    try:
+        os.rename(source, destination)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    copy_file(source, destination, COPY_STRATEGIES[1:])
+    os.unlink(source)
+
+
+class _Unsupported(Exception):
+    """A copy strategy cannot be used for this file; the next one is tried."""
+
+    def __init__(self, error: OSError, per_file: bool):
+        super().__init__(str(error))
+        self.error = error
+        self.per_file = per_file
+
+
+def copy_file(source: Path, destination: Path, strategies: tuple[str, ...] = COPY_STRATEGIES) -> str:
+    """Copy a file with the cheapest of ``strategies`` that works; returns its name.
+
+    A hardlink is created in place.  Every other strategy writes a temporary
+    file next to the destination, which is renamed into place only once
+    complete, so an interrupted copy never leaves a truncated image behind.
+    Strategies found unsupported between two devices are skipped for later
+    files; with none left the last refusal is raised.
+    """
+    devices = os.stat(source).st_dev, os.stat(destination.parent).st_dev
+    error: OSError | None = None
+    for strategy in strategies:
+        if (strategy, *devices) in _unsupported:
+            continue
+        try:
+            with timing_service.span(f"copy.{strategy}"):
+                if strategy == "hardlink":
+                    _hardlink(source, destination)
+                else:
+                    _copy_via_partial(strategy, source, destination)
+            return strategy
+        except _Unsupported as e:
+            if not e.per_file:
+                _unsupported.add((strategy, *devices))
+            error = e.error
+    raise error or OSError(errno.ENOTSUP, "No copy strategy left to try", str(source))
+
+
+def _refusal(e: OSError) -> _Unsupported | None:
+    """Wrap ``e`` if it means "strategy unsupported" rather than a real failure."""
+    if e.errno in _UNSUPPORTED_ERRNOS:
+        return _Unsupported(e, per_file=False)
+    if e.errno in _UNSUPPORTED_FOR_FILE_ERRNOS:
+        return _Unsupported(e, per_file=True)
+    return None
+
+
+def _hardlink(source: Path, destination: Path) -> None:
+    try:
+        os.link(source, destination)
+    except OSError as e:
+        raise _refusal(e) or e
+
+
+def _copy_via_partial(strategy: str, source: Path, destination: Path) -> None:
+    partial = destination.with_name(destination.name + ".partial")
+    try:
+        with open(source, "rb") as src, open(partial, "wb") as dst:
+            _copy_data(strategy, src, dst)
+        shutil.copystat(source, partial)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
 
-    destination = category_dir / image_path.name
+def _copy_data(strategy: str, src: BinaryIO, dst: BinaryIO) -> None:
+    """Copy an open file's contents with one strategy."""
+    if strategy == "buffered":
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        return
 
-    # Handle filename collisions
-    if destination.exists():
-        stem = image_path.stem
-        suffix = image_path.suffix
-        counter = 1
-        while destination.exists():
-            destination = category_dir / f"{stem}_{counter}{suffix}"
-            counter += 1
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    if strategy == "reflink":
+        if fcntl is None:
+            raise _Unsupported(OSError(errno.ENOTSUP, "reflinks need fcntl"), per_file=False)
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        except OSError as e:
+            raise _refusal(e) or e
+        return
 
-    shutil.move(str(image_path), str(destination))
+    kernel_copy = getattr(os, strategy, None)
+    if kernel_copy is None:
+        raise _Unsupported(OSError(errno.ENOSYS, f"os.{strategy} is not available"), per_file=False)
+    size = os.fstat(src_fd).st_size
+    offset = 0
+    while offset < size:
+        try:
+            if strategy == "copy_file_range":
+                sent = os.copy_file_range(src_fd, dst_fd, size - offset)
+            else:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        except OSError as e:
+            # Once data went through, a failure is real (disk full, I/O error)
+            raise (_refusal(e) if offset == 0 else None) or e
+        if sent == 0:
+            break  # file shrank while copying
+        offset += sent
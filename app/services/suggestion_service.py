@@ -0,0 +1,390 @@
+"""Category suggestions learned from past sort decisions."""
+
+import atexit
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from app.services import timing_service
+from app.services.metadata_service import read_metadata
+from app.services.settings_service import DATA_DIR
+
+MODEL_FILE = DATA_DIR / "suggestions.npz"
+
+# Feature layout: colour histogram, luminance grid, header fields
+COLOR_LEVELS = 4
+COLOR_BINS = COLOR_LEVELS ** 3
+GRID_SIZE = 8
+HEADER_FIELDS = 5
+FEATURE_SIZE = COLOR_BINS + GRID_SIZE * GRID_SIZE + HEADER_FIELDS
+
+# Relative weight of each block in the (unit-length) vector
+COLOR_WEIGHT = 1.0
+GRID_WEIGHT = 0.6
+HEADER_WEIGHT = 0.4
+
+# Images are shrunk to this before any statistics are taken
+SAMPLE_SIZE = 32
+
+# Neighbours voting, and how much their vote counts against the centroids
+NEIGHBOURS = 10
+NEIGHBOUR_WEIGHT = 0.6
+
+# No suggestion until this many decisions have been learned
+MIN_EXAMPLES = 5
+
+FEATURE_WORKERS = 2
+# Features kept for images seen but not (yet) sorted
+FEATURE_CACHE_SIZE = 256
+# Seed from at most this many earlier decisions
+SEED_LIMIT = 2000
+SAVE_INTERVAL = 30.0
+
+
+def extract_features(image_path: Path) -> np.ndarray:
+    """Compute an image's unit-length feature vector. Raises for unreadable files."""
+    metadata = read_metadata(image_path)
+    with Image.open(image_path) as pil_image:
+        pil_image.draft("RGB", (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+        sample = pil_image.convert("RGB").resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.BOX)
+    pixels = np.asarray(sample).reshape(-1, 3)
+
+    levels = (pixels // (256 // COLOR_LEVELS)).astype(np.intp)
+    bins = (levels[:, 0] * COLOR_LEVELS + levels[:, 1]) * COLOR_LEVELS + levels[:, 2]
+    color = np.sqrt(np.bincount(bins, minlength=COLOR_BINS) / len(bins))
+
+    grid = np.asarray(sample.convert("L").resize((GRID_SIZE, GRID_SIZE), Image.BOX), dtype=np.float32).ravel()
+    grid -= grid.mean()
+    grid /= np.linalg.norm(grid) or 1.0
+
+    header = np.zeros(HEADER_FIELDS, dtype=np.float32)
+    header[0] = math.log(metadata.width / metadata.height) if metadata.width and metadata.height else 0.0
+    header[1] = math.log10(max(metadata.width * metadata.height, 1) / 1e6)
+    if metadata.taken_at is not None:
+        hour = metadata.taken_at.hour + metadata.taken_at.minute / 60
+        header[2] = math.sin(2 * math.pi * hour / 24)
+        header[3] = math.cos(2 * math.pi * hour / 24)
+        header[4] = 1.0
+    header /= np.linalg.norm(header) or 1.0
+
+    vector = np.concatenate([color * COLOR_WEIGHT, grid * GRID_WEIGHT, header * HEADER_WEIGHT]).astype(np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+def _features_or_none(image_path: Path) -> np.ndarray | None:
+    with timing_service.span("suggest.features"):
+        try:
+            return extract_features(image_path)
+        except Exception:
+            return None  # unreadable (or already moved away): no example
+
+
+class CategorySuggester:
+    """Incrementally trained nearest-neighbour / centroid category ranker.
+
+    Call :meth:`prepare` for images about to be shown, :meth:`poll` from
+    the GUI loop, :meth:`suggest` to rank, and :meth:`learn` / :meth:`forget`
+    as decisions are made and undone.  Not thread-safe apart from the
+    feature workers, which only hand vectors back through a queue.
+    """
+
+    def __init__(self, model_file: Path = MODEL_FILE, workers: int = FEATURE_WORKERS):
+        self.model_file = model_file
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="features")
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._requested: set[Path] = set()
+        # Features of images not learned yet, most recent last
+        self._cache: dict[Path, np.ndarray] = {}
+        # Decisions made before their image's features were ready
+        self._waiting: dict[Path, str] = {}
+        # Where the move queue put images of waiting decisions, and decisions
+        # whose image could not be read (yet) — retried once it is found
+        self._moved_to: dict[Path, Path] = {}
+        self._unread: dict[Path, str] = {}
+        # Model files are written here, never on the Tk thread
+        self._saver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="suggest-save")
+        self._saving: Future | None = None
+
+        self._features = np.zeros((0, FEATURE_SIZE), dtype=np.float32)
+        self._labels = np.zeros(0, dtype=np.int32)
+        self._count = 0
+        self._rows: dict[str, int] = {}   # image path -> row
+        self._paths: list[str] = []
+        self._categories: list[str] = []
+        self._category_ids: dict[str, int] = {}
+        self._sums = np.zeros((0, FEATURE_SIZE), dtype=np.float64)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._load()
+
+    @property
+    def example_count(self) -> int:
+        return self._count
+
+    # ── Features ──
+
+    def prepare(self, paths: list[Path]) -> None:
+        """Start extracting features for images that will be ranked soon."""
+        for path in paths:
+            if path not in self._cache and path not in self._requested:
+                self._submit(path)
+
+    def _submit(self, path: Path, read_from: Path | None = None) -> None:
+        self._requested.add(path)
+        future = self._executor.submit(_features_or_none, read_from or path)
+        future.add_done_callback(lambda f, p=path: self._done.put((p, f)))
+
+    def poll(self) -> bool:
+        """Take in finished features. Returns True if any arrived."""
+        arrived = False
+        while True:
+            try:
+                path, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._requested.discard(path)
+            vector = None if future.cancelled() else future.result()
+            category = self._waiting.pop(path, None)
+            destination = self._moved_to.pop(path, None)
+            if vector is None:
+                if category is not None:
+                    self._retry(path, category, destination)
+                continue
+            arrived = True
+            if category is not None:
+                self._add(path, vector, category)
+            else:
+                self._cache[path] = vector
+                if len(self._cache) > FEATURE_CACHE_SIZE:
+                    del self._cache[next(iter(self._cache))]
+        if self._saving is not None and self._saving.done():
+            if self._saving.exception() is not None:
+                self._dirty = True  # try again next interval
+            self._saving = None
+        if self._dirty and time.monotonic() - self._saved_at > SAVE_INTERVAL:
+            self.save()
+        return arrived
+
+    def note_moved(self, source: Path, destination: Path) -> None:
+        """Follow an image the move queue moved, so its decision is still learned."""
+        category = self._unread.pop(source, None)
+        if category is not None:
+            self._waiting[source] = category
+            self._submit(source, destination)
+        elif source in self._waiting:
+            self._moved_to[source] = destination
+
+    def _retry(self, path: Path, category: str, destination: Path | None) -> None:
+        """The image of a decision could not be read where it was asked for."""
+        if destination is not None:
+            self._waiting[path] = category
+            self._submit(path, destination)
+            return
+        # Probably moved before it was read; note_moved will say where to
+        self._unread[path] = category
+        if len(self._unread) > FEATURE_CACHE_SIZE:
+            del self._unread[next(iter(self._unread))]
+
+    # ── Ranking ──
+
+    def suggest(self, path: Path, categories: list[str]) -> list[tuple[str, float]]:
+        """``categories`` ranked for ``path``, best first, with scores in [0, 1].
+
+        Empty while the image's features are not ready or too few decisions
+        have been learned; categories never used so far are left out.
+        """
+        vector = self._cache.get(path)
+        if vector is None or self._count < MIN_EXAMPLES:
+            return []
+        with timing_service.span("suggest.rank"):
+            features = self._features[:self._count]
+            similarity = features @ vector
+
+            # Nearest neighbours vote with their similarity
+            k = min(NEIGHBOURS, self._count)
+            nearest = np.argpartition(-similarity, k - 1)[:k]
+            votes = np.zeros(len(self._categories), dtype=np.float64)
+            np.add.at(votes, self._labels[:self._count][nearest], np.maximum(similarity[nearest], 0.0))
+            votes /= votes.sum() or 1.0
+
+            # Cosine to each category's mean vector
+            norms = np.linalg.norm(self._sums, axis=1)
+            centroid = np.divide(self._sums @ vector, norms, out=np.zeros_like(norms), where=norms > 0)
+            scores = NEIGHBOUR_WEIGHT * votes + (1 - NEIGHBOUR_WEIGHT) * np.maximum(centroid, 0.0)
+
+        ranked = []
+        for name in categories:
+            category_id = self._category_ids.get(name)
+            if category_id is not None and self._counts[category_id] > 0:
+                ranked.append((name, float(scores[category_id])))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked
+
+    # ── Learning ──
+
+    def learn(self, path: Path, category: str) -> None:
+        """Record that ``path`` was sorted into ``category``."""
+        vector = self._cache.pop(path, None)
+        if vector is not None:
+            self._add(path, vector, category)
+            return
+        # Features still on their way (or never asked for)
+        self._waiting[path] = category
+        if path not in self._requested:
+            self._submit(path)
+
+    def forget(self, path: Path) -> None:
+        """Take back a decision (undo); the image's features are kept for ranking."""
+        self._moved_to.pop(path, None)
+        if self._waiting.pop(path, None) is not None or self._unread.pop(path, None) is not None:
+            return
+        row = self._rows.pop(str(path), None)
+        if row is None:
+            return
+        vector = self._features[row].copy()
+        category_id = self._labels[row]
+        self._sums[category_id] -= vector
+        self._counts[category_id] -= 1
+
+        # Fill the hole with the last row
+        last = self._count - 1
+        if row != last:
+            self._features[row] = self._features[last]
+            self._labels[row] = self._labels[last]
+            self._paths[row] = self._paths[last]
+            self._rows[self._paths[row]] = row
+        self._paths.pop()
+        self._count = last
+        self._cache[path] = vector
+        self._dirty = True
+
+    def _add(self, path: Path, vector: np.ndarray, category: str) -> None:
+        key = str(path)
+        if key in self._rows:
+            self.forget(path)
+            self._cache.pop(path, None)
+        category_id = self._category_id(category)
+        if self._count == len(self._features):
+            # Grow by doubling, so appends stay amortised O(1)
+            grown = np.zeros((max(64, 2 * self._count), FEATURE_SIZE), dtype=np.float32)
+            grown[:self._count] = self._features[:self._count]
+            labels = np.zeros(len(grown), dtype=np.int32)
+            labels[:self._count] = self._labels[:self._count]
+            self._features, self._labels = grown, labels
+        self._features[self._count] = vector
+        self._labels[self._count] = category_id
+        self._rows[key] = self._count
+        self._paths.append(key)
+        self._count += 1
+        self._sums[category_id] += vector
+        self._counts[category_id] += 1
+        self._dirty = True
+
+    def _category_id(self, name: str) -> int:
+        category_id = self._category_ids.get(name)
+        if category_id is None:
+            category_id = self._category_ids[name] = len(self._categories)
+            self._categories.append(name)
+            self._sums = np.vstack([self._sums, np.zeros((1, FEATURE_SIZE))])
+            self._counts = np.append(self._counts, 0)
+        return category_id
+
+    def seed(self, decisions: list[tuple[Path, str]]) -> None:
+        """Learn earlier decisions in the background (only while the model is empty)."""
+        if self._count or self._waiting:
+            return
+        for path, category in decisions[-SEED_LIMIT:]:
+            self._waiting[path] = category
+            self._submit(path)
+
+    # ── Persistence ──
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.model_file, allow_pickle=False) as data:
+                features = data["features"]
+                labels = data["labels"]
+                paths = [str(p) for p in data["paths"]]
+                categories = [str(c) for c in data["categories"]]
+        except (OSError, KeyError, ValueError):
+            return  # missing or unreadable: start empty
+        if (features.ndim != 2 or features.shape[1] != FEATURE_SIZE
+                or len(labels) != len(features) or len(paths) != len(features)):
+            return  # written by a different feature layout
+        # Rows whose category is gone from the list cannot be ranked: drop them
+        keep = (labels >= 0) & (labels < len(categories))
+        if not keep.all():
+            features, labels = features[keep], labels[keep]
+            paths = [path for path, kept in zip(paths, keep) if kept]
+
+        self._features = features.astype(np.float32)
+        self._labels = labels.astype(np.int32)
+        self._count = len(features)
+        self._paths = paths
+        self._rows = {path: row for row, path in enumerate(paths)}
+        self._categories = categories
+        self._category_ids = {name: i for i, name in enumerate(categories)}
+        self._sums = np.zeros((len(categories), FEATURE_SIZE), dtype=np.float64)
+        np.add.at(self._sums, self._labels, self._features)
+        self._counts = np.bincount(self._labels, minlength=len(categories)).astype(np.int64)
+
+    def save(self) -> None:
+        """Write a snapshot of the model in the background, if it changed.
+
+        A failed write (disk full, read-only folder) is retried later.
+        """
+        if not self._dirty or self._saving is not None:
+            return
+        snapshot = {
+            "features": self._features[:self._count].copy(),
+            "labels": self._labels[:self._count].copy(),
+            "paths": np.array(self._paths, dtype=str),
+            "categories": np.array(self._categories, dtype=str),
+        }
+        self._saving = self._saver.submit(_write_model, self.model_file, snapshot)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._saving is not None and self._saving.exception() is not None:  # waits for it
+            self._dirty = True
+        self._saving = None
+        self.save()
+        # A lost save only costs the latest examples
+        self._saver.shutdown(wait=True)
+
+
+def _write_model(model_file: Path, arrays: dict[str, np.ndarray]) -> None:
+    """Write the model atomically, via a temporary file."""
+    model_file.parent.mkdir(parents=True, exist_ok=True)
+    partial = model_file.with_name(model_file.name + ".partial")
+    try:
+        with open(partial, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(partial, model_file)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+_suggester: CategorySuggester | None = None
+_suggester_lock = threading.Lock()
+
+
+def get_suggester() -> CategorySuggester:
+    """Return the app-wide suggester, loading the model on first use."""
+    global _suggester
+    with _suggester_lock:
+        if _suggester is None:
+            _suggester = CategorySuggester()
+            atexit.register(_suggester.close)
+        return _suggester
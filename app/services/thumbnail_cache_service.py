@@ -0,0 +1,260 @@
+"""Persistent on-disk cache of display previews."""
+
+import atexit
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.services import decode_service, timing_service
+from app.services.preview_service import DISPLAY_SIZE, load_fast_preview
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PACK_FILE = DATA_DIR / "thumbnails.pack"
+INDEX_FILE = DATA_DIR / "thumbnails.idx"
+
+# Pack size that triggers compaction, and the size it is compacted down to
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+COMPACT_RATIO = 0.75
+
+# Bytes hashed from each end of a file to identify its content
+IDENTITY_CHUNK = 64 * 1024
+
+# Persist the index at most this often (seconds) while previews are added;
+# close() at exit saves whatever is left
+SAVE_INTERVAL = 30.0
+
+INDEX_VERSION = 1
+
+
+def file_identity(image_path: Path, stat: os.stat_result | None = None) -> str:
+    """Content identity of a file: its size plus a hash of both ends."""
+    stat = stat or image_path.stat()
+    digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+    with open(image_path, "rb") as f:
+        digest.update(f.read(IDENTITY_CHUNK))
+        if stat.st_size > 2 * IDENTITY_CHUNK:
+            f.seek(-IDENTITY_CHUNK, os.SEEK_END)
+            digest.update(f.read(IDENTITY_CHUNK))
+    return digest.hexdigest()
+
+
+class ThumbnailCache:
+    """Pack-file preview cache with an LRU size cap. Thread-safe."""
+
+    def __init__(self, pack_file: Path, index_file: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.pack_file = pack_file
+        self.index_file = index_file
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> [offset, length, last_used]
+        self._entries: dict[str, list] = {}
+        # str(path) -> [size, mtime_ns, identity]
+        self._files: dict[str, list] = {}
+        self._pack_size = 0
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        self._load()
+
+    # ── Lookup ──
+
+    def get(self, image_path: Path, size: tuple[int, int] = DISPLAY_SIZE) -> Image.Image | None:
+        """Return the cached preview of ``image_path`` at ``size``, or None."""
+        key = self._key(image_path, size)
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry[2] = time.time()
+            data = self._read(entry[0], entry[1])
+
+        if data is None:
+            return None
+        try:
+            with Image.open(io.BytesIO(data)) as cached:
+                cached.load()
+                return cached.copy()
+        except Exception:
+            self._forget(key)
+            return None
+
+    def put(self, image_path: Path, size: tuple[int, int], preview: Image.Image) -> None:
+        """Store ``preview`` as the rendering of ``image_path`` at ``size``."""
+        key = self._key(image_path, size)
+        if key is None:
+            return
+
+        buffer = io.BytesIO()
+        if preview.mode in ("RGB", "RGBX", "L"):
+            preview.save(buffer, "JPEG", quality=90)
+        else:
+            preview.save(buffer, "PNG")
+        data = buffer.getvalue()
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self.pack_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.pack_file, "ab") as pack:
+                offset = pack.tell()
+                pack.write(data)
+            self._pack_size = offset + len(data)
+            self._entries[key] = [offset, len(data), time.time()]
+            self._unsaved += 1
+
+            if self._pack_size > self.max_bytes:
+                self._compact()
+            elif time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+                self._save()
+
+    def note_moved(self, old_path: Path, new_path: Path) -> None:
+        """Carry a file's identity over to its new path (saves re-hashing)."""
+        with self._lock:
+            known = self._files.pop(str(old_path), None)
+            if known is not None:
+                self._files[str(new_path)] = known
+
+    def close(self) -> None:
+        """Persist the index."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    # ── Internals ──
+
+    def _key(self, image_path: Path, size: tuple[int, int]) -> str | None:
+        try:
+            stat = image_path.stat()
+        except OSError:
+            return None
+
+        with self._lock:
+            known = self._files.get(str(image_path))
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            identity = known[2]
+        else:
+            try:
+                identity = file_identity(image_path, stat)
+            except OSError:
+                return None
+            with self._lock:
+                self._files[str(image_path)] = [stat.st_size, stat.st_mtime_ns, identity]
+
+        return f"{identity}@{size[0]}x{size[1]}"
+
+    def _read(self, offset: int, length: int) -> bytes | None:
+        try:
+            with open(self.pack_file, "rb") as pack:
+                pack.seek(offset)
+                data = pack.read(length)
+        except OSError:
+            return None
+        return data if len(data) == length else None
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._unsaved += 1
+
+    def _compact(self) -> None:
+        """Rewrite the pack keeping only the most recently used previews."""
+        keep_bytes = self.max_bytes * COMPACT_RATIO
+        kept: dict[str, list] = {}
+        total = 0
+        for key, entry in sorted(self._entries.items(), key=lambda kv: kv[1][2], reverse=True):
+            if total + entry[1] > keep_bytes:
+                break
+            kept[key] = entry
+            total += entry[1]
+
+        tmp_file = self.pack_file.with_suffix(".pack.tmp")
+        with open(self.pack_file, "rb") as src, open(tmp_file, "wb") as dst:
+            for key, entry in kept.items():
+                src.seek(entry[0])
+                data = src.read(entry[1])
+                kept[key] = [dst.tell(), len(data), entry[2]]
+                dst.write(data)
+            self._pack_size = dst.tell()
+        os.replace(tmp_file, self.pack_file)
+        self._entries = kept
+
+        # Paths whose previews are all gone no longer need an identity
+        live = {key.split("@", 1)[0] for key in kept}
+        self._files = {p: f for p, f in self._files.items() if f[2] in live}
+        self._save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError("unknown index version")
+            entries = data["entries"]
+            files = data["files"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # No usable index: whatever is in the pack is unreachable
+            self.pack_file.unlink(missing_ok=True)
+            return
+
+        try:
+            self._pack_size = self.pack_file.stat().st_size
+        except OSError:
+            self._pack_size = 0
+        # Drop entries pointing past the end of a truncated pack
+        self._entries = {k: e for k, e in entries.items() if e[0] + e[1] <= self._pack_size}
+        self._files = files
+
+    def _save(self) -> None:
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix(".idx.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "entries": self._entries, "files": self._files}, f)
+        os.replace(tmp_file, self.index_file)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+
+_cache: ThumbnailCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ThumbnailCache:
+    """Return the app-wide cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache(PACK_FILE, INDEX_FILE)
+            atexit.register(_cache.close)
+        return _cache
+
+
+def note_moved(old_path: Path, new_path: Path) -> None:
+    """Tell the cache (if it is open) that a file was moved."""
+    if _cache is not None:
+        _cache.note_moved(old_path, new_path)
+
+
+def load_cached_preview(image_path: Path, size: tuple[int, int] = DISPLAY_SIZE) -> Image.Image:
+    """High-quality preview, served from the cache or rendered and stored."""
+    cache = get_cache()
+    with timing_service.span("cache.lookup"):
+        preview = cache.get(image_path, size)
+    if preview is None:
+        preview = decode_service.load_preview(image_path, size)
+        cache.put(image_path, size, preview)
+    return preview
+
+
+def load_cached_fast_preview(image_path: Path, size: tuple[int, int] = DISPLAY_SIZE) -> Image.Image:
+    """Fast preview, preferring a cached high-quality one when available."""
+    with timing_service.span("cache.lookup"):
+        preview = get_cache().get(image_path, size)
+    return preview if preview is not None else load_fast_preview(image_path, size)
@@ -0,0 +1,162 @@
+"""Lightweight timing spans aggregated into latency histograms."""
+
+import json
+import math
+import platform
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+# Histogram range: 1 µs … 1000 s, 20 buckets per decade
+MIN_SECONDS = 1e-6
+BUCKETS_PER_DECADE = 20
+BUCKET_COUNT = 9 * BUCKETS_PER_DECADE
+
+PERCENTILES = (50, 95, 99)
+
+_enabled = True
+
+
+@dataclass
+class SpanStats:
+    """Summary of one span's histogram, in milliseconds."""
+
+    name: str
+    count: int
+    total_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class Histogram:
+    """Log-bucketed latency histogram (not thread-safe on its own)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[_bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Approximate ``pct``-th percentile in seconds (bucket midpoint)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * pct / 100)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                # Geometric middle of the bucket, capped by the real maximum
+                return min(_bucket_floor(index + 0.5), self.max)
+        return self.max
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= MIN_SECONDS:
+        return 0
+    index = int(math.log10(seconds / MIN_SECONDS) * BUCKETS_PER_DECADE)
+    return min(index, BUCKET_COUNT - 1)
+
+
+def _bucket_floor(index: float) -> float:
+    return MIN_SECONDS * 10 ** (index / BUCKETS_PER_DECADE)
+
+
+_histograms: dict[str, Histogram] = {}
+_lock = threading.Lock()
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def record(name: str, seconds: float) -> None:
+    """Add one measured duration to the ``name`` histogram."""
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(seconds)
+
+
+@contextmanager
+def span(name: str):
+    """Time the ``with`` block into the ``name`` histogram (also on error)."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def snapshot() -> list[SpanStats]:
+    """Current statistics for every span, by name."""
+    with _lock:
+        items = sorted(_histograms.items())
+        return [
+            SpanStats(
+                name=name,
+                count=h.count,
+                total_ms=h.total * 1000,
+                max_ms=h.max * 1000,
+                **{f"p{pct}_ms": h.percentile(pct) * 1000 for pct in PERCENTILES},
+            )
+            for name, h in items
+        ]
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+
+
+def format_table(stats: list[SpanStats]) -> str:
+    """Fixed-width text table of ``stats`` for the overlay or a terminal."""
+    lines = [f"{'span':<22}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+    for s in stats:
+        lines.append(
+            f"{s.name:<22}{s.count:>7}{s.p50_ms:>9.1f}{s.p95_ms:>9.1f}{s.p99_ms:>9.1f}{s.max_ms:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def export(path: Path) -> None:
+    """Write the current statistics (and raw bucket counts) as JSON."""
+    with _lock:
+        buckets = {
+            name: {str(i): n for i, n in enumerate(h.counts) if n}
+            for name, h in _histograms.items()
+        }
+    data = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "units": "ms",
+        "bucket_floor_seconds": f"{MIN_SECONDS} * 10 ** (index / {BUCKETS_PER_DECADE})",
+        "spans": [asdict(s) for s in snapshot()],
+        "buckets": buckets,
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -0,0 +1,421 @@
+"""Watches the input folders while sorting, reporting images as they come and go."""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import queue
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services import image_service
+from app.services.index_service import RACY_SECONDS, get_index
+
+# A file without a close/rename event must keep its size and mtime this long
+DEBOUNCE_SECONDS = 1.0
+
+# How often folders are polled when inotify is unavailable
+POLL_SECONDS = 1.0
+
+# How often files waiting to settle are checked again
+SETTLE_SECONDS = 0.2
+
+# Event kinds passed from the backends to the watcher thread
+CHANGED = "changed"      # created or written to — may still be incomplete
+COMPLETE = "complete"    # closed after writing, or renamed into place
+REMOVED = "removed"
+FOLDER_ADDED = "folder_added"
+FOLDER_REMOVED = "folder_removed"  # deleted or moved away, with everything in it
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+READ_SIZE = 64 * 1024
+
+
+@dataclass
+class FolderChanges:
+    """Images that appeared in or vanished from the watched folders."""
+
+    added: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def _key(path: Path) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _is_within(path: Path, directory: Path) -> bool:
+    key, prefix = _key(path), _key(directory)
+    return key == prefix or key.startswith(os.path.join(prefix, ""))
+
+
+class _Inotify:
+    """Minimal ctypes binding of inotify(7)."""
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._rm_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.folders: dict[int, Path] = {}
+
+    def watch(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), str(directory))
+        self.folders[wd] = directory
+
+    def unwatch(self, directory: Path) -> None:
+        """Stop watching ``directory`` and every folder below it."""
+        for wd, folder in list(self.folders.items()):
+            if _is_within(folder, directory):
+                self._rm_watch(self.fd, wd)
+                del self.folders[wd]
+
+    def read(self, timeout: float) -> list[tuple[str, Path]] | None:
+        """Events that arrive within ``timeout`` seconds; None if some were lost."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            directory = self.folders.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self.folders.pop(wd, None)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # Usually also reported by the parent's watch; not for roots
+                events.append((FOLDER_REMOVED, directory))
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    events.append((FOLDER_ADDED, path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    events.append((FOLDER_REMOVED, path))
+            elif not image_service.has_image_name(path.name):
+                continue
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                events.append((REMOVED, path))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                events.append((COMPLETE, path))
+            elif mask & IN_CREATE:
+                events.append((CHANGED, path))
+        return None if overflow else events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """Stats each folder and diffs the listing of those that changed."""
+
+    def __init__(self):
+        # folder -> (mtime_ns of the last listing, image file names in it)
+        self._folders: dict[Path, tuple[int, set[str]]] = {}
+        self._subdirs: dict[Path, set[str]] = {}
+
+    def watch(self, directory: Path, mtime_ns: int = 0, names: set[str] = frozenset()) -> None:
+        """Poll ``directory``, starting from a listing with the given state."""
+        self._folders[directory] = mtime_ns, set(names)
+
+    def __bool__(self) -> bool:
+        return bool(self._folders)
+
+    def forget(self, directory: Path) -> None:
+        self._folders.pop(directory, None)
+        self._subdirs.pop(directory, None)
+
+    def read(self) -> list[tuple[str, Path]]:
+        events = []
+        for directory in list(self._folders):
+            events += self.check(directory)
+        return events
+
+    def check(self, directory: Path, force: bool = False) -> list[tuple[str, Path]]:
+        """Diff one folder against its last listing if its mtime moved."""
+        last_mtime, known = self._folders.get(directory, (0, set()))
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return [(FOLDER_REMOVED, directory)]
+        if mtime_ns == last_mtime and not force:
+            return []
+
+        names, subdirs = set(), set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if image_service.is_image_entry(entry):
+                            names.add(entry.name)
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.name)
+                    except OSError:
+                        pass  # deleted while listing
+        except OSError:
+            return []
+        if directory in self._folders:
+            # As in the index: a folder changed within the last tick is listed again
+            trusted = mtime_ns if time.time_ns() - mtime_ns > RACY_SECONDS * 1e9 else 0
+            self._folders[directory] = trusted, names
+
+        events = [(REMOVED, directory / name) for name in known - names]
+        events += [(CHANGED, directory / name) for name in names - known]
+        # Subfolders are news only after the first listing (or when asked)
+        previous = self._subdirs.get(directory, set() if force else subdirs)
+        events += [(FOLDER_ADDED, directory / name) for name in subdirs - previous]
+        events += [(FOLDER_REMOVED, directory / name) for name in previous - subdirs]
+        self._subdirs[directory] = subdirs
+        return events
+
+
+@dataclass
+class _Settling:
+    """A new file waiting to be complete."""
+
+    signature: tuple[int, int] | None = None  # size, mtime_ns
+    since: float = 0.0
+    complete: bool = False
+
+
+class FolderWatcher:
+    """Reports images added to or removed from folders, on a background thread.
+
+    Folders are watched from the state the index last saw them in, so
+    changes made during a scan may be reported as well; callers skip images
+    they already have.  Call :meth:`poll` from the GUI loop and
+    :meth:`close` when done.
+    """
+
+    def __init__(
+        self,
+        roots: list[Path],
+        recursive: bool = False,
+        exclude: set[Path] = frozenset(),
+        use_inotify: bool = True,
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_SECONDS,
+    ):
+        self.roots = list(roots)
+        self.recursive = recursive
+        self.exclude = set(exclude)
+        self._excluded = {_key(p) for p in exclude}
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+
+        self._inotify: _Inotify | None = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                pass  # not Linux, or a libc without inotify
+        self._poller = _Poller()
+        self._watched: set[str] = set()
+        # Image names each watched folder holds, as far as reported
+        self._known: dict[Path, set[str]] = {}
+        self._settling: dict[Path, _Settling] = {}
+        self._next_poll = 0.0
+
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._changes: queue.SimpleQueue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        for root in self.roots:
+            self._requests.put(root)
+        if recursive:
+            self.watch_indexed()
+        self._thread = threading.Thread(target=self._run, name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def backend(self) -> str:
+        """"inotify", or "polling" when the kernel API is not available."""
+        return "inotify" if self._inotify is not None else "polling"
+
+    def watch_indexed(self) -> None:
+        """Also watch the subfolders the index knows of (call again after a scan)."""
+        if self.recursive:
+            self._requests.put(None)
+
+    def poll(self) -> FolderChanges:
+        """Changes reported since the last call."""
+        changes = FolderChanges()
+        while True:
+            try:
+                kind, path = self._changes.get_nowait()
+            except queue.Empty:
+                return changes
+            (changes.added if kind == COMPLETE else changes.removed).append(path)
+
+    def close(self) -> None:
+        """Stop watching; the thread exits within a poll interval."""
+        self._stop.set()
+
+    # ── Watcher thread ──
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self._take_requests()
+                timeout = SETTLE_SECONDS if self._settling else self._poll_interval
+                if self._inotify is not None:
+                    events = self._inotify.read(timeout)
+                    if events is None:
+                        # The kernel queue overflowed: list every folder once
+                        events = []
+                        for directory in list(self._inotify.folders.values()):
+                            events += self._poller.check(directory, force=True)
+                else:
+                    self._stop.wait(timeout)
+                    events = []
+                if self._poller and time.monotonic() >= self._next_poll:
+                    self._next_poll = time.monotonic() + self._poll_interval
+                    events += self._poller.read()
+                self._handle(events)
+                self._settle()
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+
+    def _take_requests(self) -> None:
+        while True:
+            try:
+                directory = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if directory is None:
+                for folder in get_index().folders(self.roots, recursive=True, exclude=self.exclude):
+                    self._watch(folder)
+            else:
+                self._watch(directory)
+
+    def _watch(self, directory: Path, fresh: bool = False) -> bool:
+        """Start watching a folder; False if it is excluded or already watched.
+
+        A ``fresh`` folder just appeared, so none of its images have been
+        reported yet whatever the index remembers of it.
+        """
+        key = _key(directory)
+        if key in self._watched or key in self._excluded:
+            return False
+        self._watched.add(key)
+        mtime_ns, names = (0, set()) if fresh else get_index().folder_state(directory)
+        self._known[directory] = set(names)
+        if self._inotify is not None:
+            try:
+                self._inotify.watch(directory)
+                return True
+            except OSError as e:
+                if e.errno in (errno.ENOENT, errno.ENOTDIR):
+                    self._watched.discard(key)
+                    del self._known[directory]
+                    return False
+                # Out of watches (ENOSPC) or not allowed — poll this one instead
+        self._poller.watch(directory, mtime_ns, names)
+        return True
+
+    def _forget(self, directory: Path) -> None:
+        """A folder was deleted or moved away: report everything in it as removed.
+
+        It is no longer watched, so it is picked up again if it comes back.
+        """
+        for folder in [f for f in self._known if _is_within(f, directory)]:
+            for name in sorted(self._known.pop(folder)):
+                self._changes.put((REMOVED, folder / name))
+            self._watched.discard(_key(folder))
+            self._poller.forget(folder)
+        for path in [p for p in self._settling if _is_within(p, directory)]:
+            del self._settling[path]
+        if self._inotify is not None:
+            self._inotify.unwatch(directory)
+
+    def _handle(self, events: list[tuple[str, Path]]) -> None:
+        for kind, path in events:
+            if kind == FOLDER_ADDED:
+                if self.recursive and self._watch(path, fresh=True):
+                    # Anything already inside arrived before the watch began
+                    self._handle(self._poller.check(path, force=True))
+            elif kind == FOLDER_REMOVED:
+                self._forget(path)
+            elif kind == REMOVED:
+                self._settling.pop(path, None)
+                self._known.get(path.parent, set()).discard(path.name)
+                self._changes.put((REMOVED, path))
+            else:
+                settling = self._settling.setdefault(path, _Settling())
+                settling.complete = kind == COMPLETE
+
+    def _settle(self) -> None:
+        """Report the waiting files that are complete and turn out to be images."""
+        now = time.monotonic()
+        ready = []
+        for path, settling in list(self._settling.items()):
+            try:
+                info = os.stat(path)
+            except OSError:
+                del self._settling[path]  # gone before it settled
+                continue
+            if not stat.S_ISREG(info.st_mode):
+                del self._settling[path]
+                continue
+            signature = info.st_size, info.st_mtime_ns
+            if settling.complete or (signature == settling.signature and now - settling.since >= self._debounce):
+                del self._settling[path]
+                ready.append(path)
+            elif signature != settling.signature:
+                settling.signature, settling.since = signature, now
+        if ready:
+            for path, image_format in zip(ready, image_service.sniff_formats(ready)):
+                if image_format is not None:
+                    self._known.setdefault(path.parent, set()).add(path.name)
+                    self._changes.put((COMPLETE, path))
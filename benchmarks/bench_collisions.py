@@ -0,0 +1,75 @@
+"""Benchmark filename collision resolution in sort_image.
+
+Sorts thousands of files that all share one name (think ``IMG_0001.jpg``
+from several cameras) into a single category, comparing the original
+``exists()`` probing loop with the scandir-backed CategoryIndex.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_collisions [--count 2000]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from app.services import sorting_service
+
+
+def legacy_move_into(image_path: Path, category_dir: Path) -> Path:
+    """Collision handling as sort_image did it before CategoryIndex."""
+    category_dir.mkdir(parents=True, exist_ok=True)
+    destination = category_dir / image_path.name
+    if destination.exists():
+        stem = image_path.stem
+        suffix = image_path.suffix
+        counter = 1
+        while destination.exists():
+            destination = category_dir / f"{stem}_{counter}{suffix}"
+            counter += 1
+    shutil.move(str(image_path), str(destination))
+    return destination
+
+
+def same_named_files(directory: Path, count: int) -> list[Path]:
+    files = []
+    for i in range(count):
+        folder = directory / f"card-{i:05d}"
+        folder.mkdir()
+        path = folder / "IMG_0001.jpg"
+        path.write_bytes(b"\xff\xd8\xff\xd9")
+        files.append(path)
+    return files
+
+
+def run(move, count: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = Path(tmp) / "input"
+        input_dir.mkdir()
+        files = same_named_files(input_dir, count)
+        category_dir = Path(tmp) / "sorted" / "holiday"
+        start = time.perf_counter()
+        for path in files:
+            move(path, category_dir)
+        elapsed = time.perf_counter() - start
+        assert len(list(category_dir.iterdir())) == count
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="number of same-named files")
+    args = parser.parse_args()
+
+    legacy = run(legacy_move_into, args.count)
+    indexed = run(sorting_service.move_into, args.count)
+    print(f"{args.count} files named IMG_0001.jpg")
+    print(f"  exists() probing : {legacy:8.3f} s  ({legacy / args.count * 1e6:8.1f} us/file)")
+    print(f"  CategoryIndex    : {indexed:8.3f} s  ({indexed / args.count * 1e6:8.1f} us/file)")
+    print(f"  speedup          : {legacy / indexed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark the display decode path per supported format.
+
+Compares the original ``Image.open`` + ``thumbnail(LANCZOS)`` path against
+the fast and high-quality loaders in ``preview_service``.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_preview [--size 6000x4000] [--repeat 5]
+"""
+
+import argparse
+import io
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.services.image_service import SUPPORTED_EXTENSIONS
+from app.services.preview_service import DISPLAY_SIZE, load_fast_preview, load_preview
+
+
+def legacy_preview(image_path: Path) -> Image.Image:
+    """The decode path SortingScreen used before preview_service existed."""
+    pil_image = Image.open(image_path)
+    pil_image.thumbnail(DISPLAY_SIZE, Image.LANCZOS)
+    return pil_image
+
+
+def synthetic_photo(size: tuple[int, int]) -> Image.Image:
+    """A photo-like test image: smooth gradients plus sensor-style noise."""
+    width, height = size
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 24)
+    return Image.merge("RGB", (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+
+
+def exif_with_thumbnail(thumbnail: Image.Image) -> bytes:
+    """Build a minimal little-endian EXIF block whose IFD1 holds ``thumbnail``."""
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, "JPEG", quality=85)
+    data = buffer.getvalue()
+
+    ifd1 = 14
+    data_offset = ifd1 + 2 + 2 * 12 + 4
+    return (
+        b"Exif\x00\x00"
+        + b"II*\x00" + struct.pack("<I", 8)
+        + struct.pack("<HI", 0, ifd1)  # IFD0: no entries, next -> IFD1
+        + struct.pack("<H", 2)
+        + struct.pack("<HHII", 0x0201, 4, 1, data_offset)
+        + struct.pack("<HHII", 0x0202, 4, 1, len(data))
+        + struct.pack("<I", 0)
+        + data
+    )
+
+
+def build_corpus(directory: Path, size: tuple[int, int]) -> list[tuple[str, Path]]:
+    source = synthetic_photo(size)
+    corpus = []
+    for ext in sorted(SUPPORTED_EXTENSIONS):
+        path = directory / f"sample{ext}"
+        image = source.convert("P") if ext == ".gif" else source
+        image.save(path)
+        corpus.append((ext, path))
+
+    # JPEG carrying a camera-style embedded preview
+    thumb = source.copy()
+    thumb.thumbnail((480, 320))
+    path = directory / "sample-exif.jpg"
+    source.save(path, quality=90, exif=exif_with_thumbnail(thumb))
+    corpus.append((".jpg+exif", path))
+    return corpus
+
+
+def time_call(func, path: Path, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="6000x4000", help="source image size, WxH")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = build_corpus(Path(tmp), size)
+        print(f"{'format':<11} {'legacy ms':>10} {'fast ms':>9} {'high ms':>9} {'speedup':>8}")
+        for label, path in corpus:
+            legacy = time_call(legacy_preview, path, args.repeat)
+            fast = time_call(load_fast_preview, path, args.repeat)
+            high = time_call(load_preview, path, args.repeat)
+            print(f"{label:<11} {legacy:>10.1f} {fast:>9.1f} {high:>9.1f} {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""Benchmark suite for the hot paths, with baseline comparison.
+
+Generates synthetic corpora in a temporary directory and times:
+
+* ``discovery``   — ``image_service.get_image_list`` over folders of mixed
+  formats, junk files and extension-less images, with a fresh index
+  (``cold``) and reopening an unchanged folder (``warm``)
+* ``decode``      — the preview loaders the sorting screen uses, per format
+* ``backends``    — throughput of a batch of high-quality previews on the
+  thread and process decode backends, for 1, 2, 4… workers up to the
+  number of cores
+* ``order``       — ``get_image_list`` by capture date: reading the headers
+  into the index (``cold``), then from the index alone (``warm``)
+* ``navigation``  — stepping through images with the screen's Prefetcher,
+  i.e. the ``_show_current_image`` path minus the Tk photo conversion
+* ``sort``        — ``sorting_service.sort_image`` with name collisions
+* ``copy``        — copy mode's cost per file for each ``copy_file``
+  strategy (hardlink, reflink, copy_file_range, sendfile, buffered) and
+  for the automatic choice; strategies the temp folder's file system
+  refuses are left out
+* ``suggest``     — feature extraction per photo, and learning plus ranking
+  against a model with many decisions
+* ``persistence`` — category CRUD through the JSON store
+* ``startup``     — importing the GUI entry module in a fresh interpreter;
+  fails outright if Pillow, NumPy or the sorting screen are imported eagerly
+
+Settings, categories, the journal and the preview cache are redirected into
+the temporary directory, so the app's own data is never touched.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                    # print results
+    python -m benchmarks.suite --quick            # smaller corpora
+    python -m benchmarks.suite --save-baseline    # store as the baseline
+    python -m benchmarks.suite --compare          # diff against the baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import PIL
+from PIL import Image
+
+from app.services import (
+    category_service,
+    image_service,
+    index_service,
+    journal_service,
+    settings_service,
+    sorting_service,
+    thumbnail_cache_service,
+)
+from app.services.config_store import JsonStore
+from app.services.decode_service import ProcessDecoder
+from app.services.index_service import ImageIndex
+from app.services.prefetch_service import DEFAULT_AHEAD, DEFAULT_BEHIND, Prefetcher
+from app.services.suggestion_service import FEATURE_SIZE, CategorySuggester, extract_features
+from app.services.preview_service import load_fast_preview, load_preview
+from app.services.thumbnail_cache_service import ThumbnailCache, load_cached_preview
+from benchmarks.bench_preview import synthetic_photo
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+
+# A result this much slower than the baseline is reported as a regression
+DEFAULT_THRESHOLD = 1.25
+
+# (full, quick) parameters
+DISCOVERY_COUNTS = ([1000, 10000], [500])
+DECODE_SIZE = ((4000, 3000), (1600, 1200))
+BACKEND_COUNT = (96, 24)
+NAVIGATION_COUNT = (40, 12)
+SORT_COUNT = (2000, 300)
+COPY_COUNT = (200, 50)
+COPY_FILE_SIZE = (8 * 1024 * 1024, 2 * 1024 * 1024)
+ORDER_COUNT = (5000, 500)
+CATEGORY_COUNT = (500, 100)
+SUGGEST_COUNT = (100, 20)
+SUGGEST_EXAMPLES = (20000, 2000)
+SUGGEST_CATEGORIES = 50
+
+# Pause between steps when simulating someone sorting quickly
+NAVIGATION_THINK_TIME = 0.05
+
+# Importing the GUI should stay well under this (a cold start with a fresh
+# interpreter; Python's own startup is not included)
+STARTUP_TARGET_MS = 100
+STARTUP_RUNS = (7, 3)
+
+# Loaded lazily after the first window is up; importing any of them from
+# app.gui.app puts them back on the critical path
+DEFERRED_MODULES = ("PIL", "numpy", "app.gui.sorting_screen")
+
+_STARTUP_PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import app.gui.app
+elapsed = time.perf_counter() - start
+print(elapsed, *[m for m in {DEFERRED_MODULES!r} if m in sys.modules])
+"""
+
+FORMATS = {".jpg": "JPEG", ".png": "PNG", ".gif": "GIF", ".bmp": "BMP", ".webp": "WEBP"}
+
+
+@contextmanager
+def isolated_app_data(directory: Path):
+    """Point every persistent store of the app at ``directory``."""
+    saved = (
+        settings_service._store,
+        category_service._store,
+        journal_service.JOURNAL_DIR,
+        thumbnail_cache_service._cache,
+        index_service._index,
+    )
+    settings_service._store = JsonStore(directory / "settings.json", dict)
+    category_service._store = JsonStore(directory / "categories.json", list)
+    journal_service.JOURNAL_DIR = directory / "journal"
+    thumbnail_cache_service._cache = ThumbnailCache(directory / "thumbnails.pack", directory / "thumbnails.idx")
+    index_service._index = ImageIndex(directory / "index.sqlite3")
+    try:
+        yield
+    finally:
+        thumbnail_cache_service._cache.close()
+        index_service._index.close()
+        (
+            settings_service._store,
+            category_service._store,
+            journal_service.JOURNAL_DIR,
+            thumbnail_cache_service._cache,
+            index_service._index,
+        ) = saved
+
+
+def encoded_samples(size: tuple[int, int]) -> dict[str, bytes]:
+    """One encoded image per format, to be copied into corpora."""
+    source = synthetic_photo(size)
+    samples = {}
+    for ext, fmt in FORMATS.items():
+        buffer = io.BytesIO()
+        (source.convert("P") if fmt == "GIF" else source).save(buffer, fmt)
+        samples[ext] = buffer.getvalue()
+    return samples
+
+
+def make_corpus(
+    directory: Path,
+    count: int,
+    samples: dict[str, bytes],
+    junk_ratio: float = 0.1,
+    sniffed_ratio: float = 0.05,
+    collision_ratio: float = 0.0,
+) -> list[Path]:
+    """Fill ``directory`` with ``count`` images plus junk; returns the images.
+
+    ``collision_ratio`` of the images share one of a handful of names (in
+    separate subfolders), the way camera dumps repeat ``IMG_0001.jpg``.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    extensions = list(samples)
+    images = []
+    for i in range(count):
+        ext = extensions[i % len(extensions)]
+        if i < count * collision_ratio:
+            folder = directory / f"card-{i % 50:02d}"
+            folder.mkdir(exist_ok=True)
+            path = folder / f"IMG_{i // 50:04d}{ext}"
+        elif sniffed_ratio and i % round(1 / sniffed_ratio) == 0:
+            path = directory / f"download-{i:06d}"  # no extension — sniffed
+        else:
+            path = directory / f"photo-{i:06d}{ext}"
+        path.write_bytes(samples[ext])
+        images.append(path)
+    for i in range(int(count * junk_ratio)):
+        (directory / f"notes-{i:05d}.txt").write_text("not an image")
+        (directory / f"broken-{i:05d}.jpg").write_bytes(b"truncated")
+    return images
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(seconds: float, items: int, **extra) -> dict:
+    return {"seconds": round(seconds, 6), "items": items, "per_item_us": round(seconds / items * 1e6, 2), **extra}
+
+
+# ── Benchmarks ──
+
+
+def bench_discovery(tmp: Path, quick: bool, repeat: int) -> dict:
+    samples = encoded_samples((64, 48))
+    results = {}
+    for count in DISCOVERY_COUNTS[quick]:
+        input_dir = tmp / f"discovery-{count}"
+        make_corpus(input_dir, count, samples)
+        settings_service.set_input_dir(str(input_dir))
+        # Folders modified within the last couple of seconds are re-listed
+        # on purpose; age the corpus so the warm runs can trust the index
+        aged = time.time() - 60
+        os.utime(input_dir, (aged, aged))
+
+        def cold():
+            index_service._index.close()
+            index_service._index = ImageIndex(tmp / f"index-{count}-{time.perf_counter_ns()}.sqlite3")
+            found = image_service.get_image_list()
+            assert len(found) == count, (len(found), count)
+
+        results[f"discovery.cold.{count}"] = result(best_of(cold, repeat), count)
+        results[f"discovery.warm.{count}"] = result(best_of(image_service.get_image_list, repeat), count)
+    return results
+
+
+def bench_decode(tmp: Path, quick: bool, repeat: int) -> dict:
+    size = DECODE_SIZE[quick]
+    samples = encoded_samples(size)
+    results = {}
+    for ext, data in samples.items():
+        path = tmp / f"decode{ext}"
+        path.write_bytes(data)
+        fmt = FORMATS[ext].lower()
+        results[f"decode.high.{fmt}"] = result(best_of(lambda: load_preview(path), repeat), 1)
+        results[f"decode.fast.{fmt}"] = result(best_of(lambda: load_fast_preview(path), repeat), 1)
+        load_cached_preview(path)  # warm the cache
+        results[f"decode.cached.{fmt}"] = result(best_of(lambda: load_cached_preview(path), repeat), 1)
+    return results
+
+
+def bench_backends(tmp: Path, quick: bool, repeat: int) -> dict:
+    count = BACKEND_COUNT[quick]
+    photo = tmp / "backends.jpg"
+    synthetic_photo(DECODE_SIZE[quick]).save(photo, quality=90)
+    paths = [photo] * count
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({*(2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores), cores})
+    results = {}
+    for workers in worker_counts:
+        with ThreadPoolExecutor(workers) as threads:
+            seconds = best_of(lambda: list(threads.map(load_preview, paths)), repeat)
+        results[f"backends.thread.{workers}"] = result(seconds, count, workers=workers)
+
+        decoder = ProcessDecoder(workers)
+        try:
+            with ThreadPoolExecutor(workers) as threads:
+                list(threads.map(decoder.render, [photo] * workers))  # start the processes
+                seconds = best_of(lambda: list(threads.map(decoder.render, paths)), repeat)
+        finally:
+            decoder.close()
+        results[f"backends.process.{workers}"] = result(seconds, count, workers=workers)
+    return results
+
+
+def bench_order(tmp: Path, quick: bool, repeat: int) -> dict:
+    count = ORDER_COUNT[quick]
+    source = synthetic_photo((320, 240))
+    input_dir = tmp / "order"
+    input_dir.mkdir()
+    for i in range(min(count, 50)):
+        exif = Image.Exif()
+        exif[0x0132] = f"2020:01:{i % 28 + 1:02d} 12:{i % 60:02d}:00"  # DateTime
+        source.save(input_dir / f"IMG_{i:05d}.jpg", quality=80, exif=exif)
+    # Copies of the first 50 keep corpus creation quick
+    for i in range(50, count):
+        shutil.copyfile(input_dir / f"IMG_{i % 50:05d}.jpg", input_dir / f"IMG_{i:05d}.jpg")
+    settings_service.set_input_dir(str(input_dir))
+
+    def cold():
+        index_service._index.close()
+        index_service._index = ImageIndex(tmp / f"index-{time.perf_counter_ns()}.sqlite3")
+        image_service.get_image_list()  # listing alone, not timed below
+        start = time.perf_counter()
+        ordered = image_service.ordered_input_images("taken")
+        assert len(ordered) == count, (len(ordered), count)
+        return time.perf_counter() - start
+
+    cold_seconds = min(cold() for _ in range(repeat))
+    warm_seconds = best_of(lambda: image_service.ordered_input_images("taken"), repeat)
+    return {
+        "order.taken.cold": result(cold_seconds, count),
+        "order.taken.warm": result(warm_seconds, count),
+    }
+
+
+def bench_navigation(tmp: Path, quick: bool, repeat: int) -> dict:
+    """Latency until the current image is ready, stepping like the screen does."""
+    count = NAVIGATION_COUNT[quick]
+    source = synthetic_photo(DECODE_SIZE[quick])
+    images = []
+    for i in range(count):
+        path = tmp / "navigation" / f"IMG_{i:04d}.jpg"
+        path.parent.mkdir(exist_ok=True)
+        source.save(path, quality=90)
+        images.append(path)
+
+    latencies = []
+    prefetcher = Prefetcher(loader=load_preview)  # uncached: every image is new
+    try:
+        for index, current in enumerate(images):
+            start = time.perf_counter()
+            prefetcher.update(
+                current,
+                ahead=images[index + 1:index + 1 + DEFAULT_AHEAD],
+                behind=images[max(0, index - DEFAULT_BEHIND):index],
+            )
+            while prefetcher.get(current) is None:
+                time.sleep(0.001)
+                prefetcher.poll()
+            latencies.append(time.perf_counter() - start)
+            time.sleep(NAVIGATION_THINK_TIME)
+            prefetcher.poll()
+    finally:
+        prefetcher.shutdown()
+
+    latencies.sort()
+    return {
+        "navigation.first_preview": result(
+            statistics.median(latencies), 1,
+            p95_ms=round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        ),
+    }
+
+
+def bench_sort(tmp: Path, quick: bool, repeat: int) -> dict:
+    count = SORT_COUNT[quick]
+    samples = {".jpg": encoded_samples((64, 48))[".jpg"]}
+    timings = []
+    for run in range(repeat):
+        input_dir = tmp / f"sort-{run}"
+        images = make_corpus(input_dir, count, samples, junk_ratio=0, sniffed_ratio=0, collision_ratio=0.5)
+        settings_service.set_input_dir(str(input_dir))
+        categories = ["people", "places", "things"]
+        start = time.perf_counter()
+        for i, path in enumerate(images):
+            sorting_service.sort_image(path, categories[i % len(categories)])
+        timings.append(time.perf_counter() - start)
+        shutil.rmtree(input_dir)
+    return {"sort.sort_image": result(min(timings), count, collision_ratio=0.5)}
+
+
+def bench_copy(tmp: Path, quick: bool, repeat: int) -> dict:
+    count, size = COPY_COUNT[quick], COPY_FILE_SIZE[quick]
+    source_dir = tmp / "copy-src"
+    source_dir.mkdir()
+    sources = []
+    for i in range(count):
+        path = source_dir / f"photo-{i:04d}.jpg"
+        path.write_bytes(os.urandom(size))
+        sources.append(path)
+
+    results = {}
+    for strategy in (*sorting_service.COPY_STRATEGIES, None):
+        strategies = sorting_service.COPY_STRATEGIES if strategy is None else (strategy,)
+        timings, used = [], None
+        try:
+            for run in range(repeat):
+                target = tmp / f"copy-{strategy or 'auto'}-{run}"
+                target.mkdir()
+                start = time.perf_counter()
+                for path in sources:
+                    used = sorting_service.copy_file(path, target / path.name, strategies)
+                timings.append(time.perf_counter() - start)
+                shutil.rmtree(target)
+        except OSError as e:
+            print(f"  copy.{strategy}: unsupported here ({e.strerror or e})", file=sys.stderr)
+            continue
+        extra = {"strategy": used} if strategy is None else {}
+        results[f"copy.{strategy or 'auto'}"] = result(min(timings), count, file_mb=size / 2**20, **extra)
+    shutil.rmtree(source_dir)
+    return results
+
+
+def bench_suggest(tmp: Path, quick: bool, repeat: int) -> dict:
+    count = SUGGEST_COUNT[quick]
+    photo = tmp / "suggest.jpg"
+    synthetic_photo(DECODE_SIZE[quick]).save(photo, quality=90)
+    features = best_of(lambda: [extract_features(photo) for _ in range(count)], repeat)
+
+    # Random unit vectors stand in for decided images
+    examples = SUGGEST_EXAMPLES[quick]
+    vectors = np.random.default_rng(0).random((examples + 1, FEATURE_SIZE), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    categories = [f"category-{i}" for i in range(SUGGEST_CATEGORIES)]
+
+    def learn():
+        suggester = CategorySuggester(tmp / f"model-{time.perf_counter_ns()}.npz")
+        for i in range(examples):
+            suggester._cache[Path(f"/img/{i}.jpg")] = vectors[i]
+            suggester.learn(Path(f"/img/{i}.jpg"), categories[i % SUGGEST_CATEGORIES])
+        suggester.close()
+        return suggester
+
+    learn_seconds = best_of(learn, repeat)
+    suggester = learn()
+    query = Path("/img/query.jpg")
+    suggester._cache[query] = vectors[examples]
+    rank_seconds = best_of(lambda: [suggester.suggest(query, categories) for _ in range(count)], repeat)
+    return {
+        "suggest.features": result(features, count),
+        "suggest.learn": result(learn_seconds, examples),
+        "suggest.rank": result(rank_seconds, count, examples=examples),
+    }
+
+
+def bench_persistence(tmp: Path, quick: bool, repeat: int) -> dict:
+    count = CATEGORY_COUNT[quick]
+    names = [f"category-{i:04d}" for i in range(count)]
+
+    def add_all():
+        category_service.save_categories([])
+        for name in names:
+            category_service.add_category(name)
+        category_service._store.flush()
+
+    lookups = 2000
+    add = best_of(add_all, repeat)
+    read = best_of(lambda: [category_service.get_categories() for _ in range(lookups)], repeat)
+    return {
+        "persistence.add_category": result(add, count),
+        "persistence.get_categories": result(read, lookups, categories=count),
+    }
+
+
+def bench_startup(tmp: Path, quick: bool, repeat: int) -> dict:
+    timings = []
+    for _ in range(STARTUP_RUNS[quick]):
+        output = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        eager = output[1:]
+        if eager:
+            raise RuntimeError(f"imported at startup, should be deferred: {', '.join(eager)}")
+        timings.append(float(output[0]))
+    best = min(timings)
+    if best * 1000 > STARTUP_TARGET_MS:
+        print(f"warning: GUI import took {best * 1000:.0f}ms (target {STARTUP_TARGET_MS}ms)", file=sys.stderr)
+    return {"startup.import_gui": result(best, 1, target_ms=STARTUP_TARGET_MS)}
+
+
+BENCHMARKS = {
+    "discovery": bench_discovery,
+    "decode": bench_decode,
+    "backends": bench_backends,
+    "order": bench_order,
+    "navigation": bench_navigation,
+    "sort": bench_sort,
+    "copy": bench_copy,
+    "suggest": bench_suggest,
+    "persistence": bench_persistence,
+    "startup": bench_startup,
+}
+
+
+# ── Reporting ──
+
+
+def run_suite(names: list[str], quick: bool, repeat: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, isolated_app_data(Path(tmp) / "data"):
+        for name in names:
+            print(f"running {name}…", file=sys.stderr)
+            workdir = Path(tmp) / name
+            workdir.mkdir()
+            results.update(BENCHMARKS[name](workdir, quick, repeat))
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table; returns the names that regressed."""
+    regressions = []
+    print(f"{'benchmark':<34} {'baseline':>11} {'current':>11} {'ratio':>7}")
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<34} {'—':>11} {now['per_item_us']:>9.1f}us {'new':>7}")
+            continue
+        ratio = now["per_item_us"] / before["per_item_us"] if before["per_item_us"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  ← slower"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  ← faster"
+        print(f"{name:<34} {before['per_item_us']:>9.1f}us {now['per_item_us']:>9.1f}us {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def print_results(current: dict) -> None:
+    print(f"{'benchmark':<34} {'total':>10} {'per item':>12}")
+    for name, entry in current["results"].items():
+        print(f"{name:<34} {entry['seconds'] * 1000:>8.1f}ms {entry['per_item_us']:>10.1f}us")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="run only these (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="smaller corpora for a fast check")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--output", type=Path, help="also write the results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="slowdown ratio reported as a regression (default %(default)s)",
+    )
+    args = parser.parse_args()
+
+    current = run_suite(args.only or list(BENCHMARKS), args.quick, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    exit_code = 0
+    if args.compare and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline["meta"].get("quick") != args.quick:
+            print("warning: baseline was recorded with a different --quick setting", file=sys.stderr)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.2f}x", file=sys.stderr)
+            exit_code = 1
+    else:
+        if args.compare:
+            print(f"no baseline at {args.baseline}; showing results only", file=sys.stderr)
+        print_results(current)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
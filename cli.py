@@ -0,0 +1,127 @@
+"""Image Sorter — headless entry point.
+
+Sorts images into categories using a rule file instead of the GUI:
+
+    python cli.py --rules rules.json --dry-run
+    python cli.py --rules rules.json --input D:/dump --recursive
+
+Each output line is a JSON object describing one image (source, category,
+destination, error), so the plan can be reviewed or post-processed.
+
+Every sort session (GUI or headless) is journaled, so it can be undone:
+
+    python cli.py --sessions
+    python cli.py --rollback 20240501-093000
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+from app.services import image_service, journal_service, rule_service, settings_service, sorting_service
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Sort images into categories using a rule file.")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--rules", type=Path, help="JSON rule file")
+    action.add_argument("--sessions", action="store_true", help="list journaled sort sessions")
+    action.add_argument("--rollback", metavar="SESSION", help="move every image of a session back")
+    action.add_argument("--replay", metavar="SESSION", help="redo the moves of a rolled-back session")
+    parser.add_argument(
+        "--input", action="append", type=Path,
+        help="folder to sort (repeatable; default: the folders configured in the app)",
+    )
+    parser.add_argument("--recursive", action="store_true", help="include subfolders")
+    parser.add_argument("--output", type=Path, help="output folder (default: <input>/sorted)")
+    parser.add_argument("--copy", action="store_true", help="copy images instead of moving them")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan without moving anything")
+    parser.add_argument("--plan", type=Path, help="write the JSON Lines plan/report here instead of stdout")
+    parser.add_argument(
+        "--workers", type=int, default=rule_service.RULE_WORKERS, help="parallel classification/move workers",
+    )
+    return parser
+
+
+def list_sessions() -> int:
+    for session_id in journal_service.list_sessions():
+        state = journal_service.load_session(session_id)
+        status = "finished" if state.finished else "unfinished"
+        print(f"{session_id}  {len(state.moved):>6} moved  {status}  {', '.join(state.roots)}")
+    return 0
+
+
+def run_journal(session_id: str, replay: bool) -> int:
+    if session_id not in journal_service.list_sessions():
+        print(f"error: no session '{session_id}'", file=sys.stderr)
+        return 2
+    if replay:
+        failed = sorting_service.replay_session(session_id)
+    else:
+        failed = sorting_service.rollback_session(session_id)
+    for source, error in failed:
+        print(f"{source}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.sessions:
+        return list_sessions()
+    if args.rollback or args.replay:
+        return run_journal(args.rollback or args.replay, replay=args.replay is not None)
+
+    try:
+        rules = rule_service.load_rules(args.rules)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    roots = args.input or settings_service.get_input_roots()
+    recursive = args.recursive or (args.input is None and settings_service.get_settings()["recursive"])
+    output_dir = args.output or roots[0] / "sorted"
+    copy = args.copy or (args.input is None and settings_service.get_transfer_mode() == "copy")
+
+    rejected: list[Path] = []
+    batches = image_service.walk_image_batches(
+        roots, recursive=recursive, exclude={output_dir}, rejected=rejected,
+    )
+
+    counts: Counter = Counter()
+    unmatched = errors = 0
+    if not args.dry_run:
+        journal_service.start_session(roots)
+    report = open(args.plan, "w", encoding="utf-8") if args.plan else sys.stdout
+    try:
+        for planned in rule_service.apply_rules(batches, rules, output_dir, args.dry_run, args.workers, copy):
+            report.write(json.dumps(planned.to_dict()) + "\n")
+            if planned.error:
+                errors += 1
+            elif planned.category_name is None:
+                unmatched += 1
+            else:
+                counts[planned.category_name] += 1
+    finally:
+        if report is not sys.stdout:
+            report.close()
+        journal_service.end_active_session(finished=True)
+
+    if args.dry_run:
+        verb = "would copy" if copy else "would move"
+    else:
+        verb = "copied" if copy else "moved"
+    for category, count in sorted(counts.items()):
+        print(f"{category}: {count} {verb}", file=sys.stderr)
+    if unmatched:
+        print(f"{unmatched} matched no rule and were left in place", file=sys.stderr)
+    if rejected:
+        print(f"{len(rejected)} unreadable or non-image files skipped", file=sys.stderr)
+    if errors:
+        print(f"{errors} errors (see report)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 """Image Sorter App — entry point."""
 
+import multiprocessing
+
 from app.gui.app import ImageSorterApp
 
 
@@ -9,4 +11,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Decode worker processes re-enter here in the packaged .exe
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,25 @@
+"""Shared fixtures: every test gets its own app data folder."""
+
+import pytest
+
+from app.services import category_service, index_service, journal_service, settings_service, thumbnail_cache_service
+from app.services.config_store import JsonStore
+from app.services.index_service import ImageIndex
+from app.services.thumbnail_cache_service import ThumbnailCache
+
+
+@pytest.fixture
+def app_data(tmp_path, monkeypatch):
+    """Point every persistent store of the app at a temporary folder."""
+    data = tmp_path / "data"
+    cache = ThumbnailCache(data / "thumbnails.pack", data / "thumbnails.idx")
+    index = ImageIndex(data / "index.sqlite3")
+    monkeypatch.setattr(settings_service, "_store", JsonStore(data / "settings.json", dict))
+    monkeypatch.setattr(category_service, "_store", JsonStore(data / "categories.json", list))
+    monkeypatch.setattr(journal_service, "JOURNAL_DIR", data / "journal")
+    monkeypatch.setattr(thumbnail_cache_service, "_cache", cache)
+    monkeypatch.setattr(index_service, "_index", index)
+    yield data
+    journal_service.end_active_session(finished=False)
+    cache.close()
+    index.close()
@@ -0,0 +1,63 @@
+import pytest
+
+from app.gui.category_picker import chord_is_complete
+from app.models.category_trie import CategoryTrie, is_subsequence
+
+NAMES = ["nature-photos", "photos", "city-views", "dogs", "black-and-white", "a-a"]
+
+
+def test_empty_query_lists_everything_in_order():
+    assert CategoryTrie(NAMES).search("") == NAMES
+
+
+def test_names_starting_with_the_query_come_before_word_matches():
+    assert CategoryTrie(NAMES).search("ph") == ["photos", "nature-photos"]
+
+
+def test_word_matches_keep_category_order():
+    trie = CategoryTrie(["wild-cats", "cats", "house-cats"])
+    assert trie.search("ca") == ["cats", "wild-cats", "house-cats"]
+
+
+def test_subsequence_matches_come_last_and_only_when_fuzzy():
+    trie = CategoryTrie(NAMES)
+    assert trie.search("ntph") == ["nature-photos"]
+    assert trie.search("ntph", fuzzy=False) == []
+    assert trie.search("ci") == ["city-views", "black-and-white"]
+
+
+def test_repeated_words_are_listed_once():
+    assert CategoryTrie(NAMES).search("a") == ["a-a", "black-and-white"]
+
+
+def test_query_is_case_insensitive():
+    assert CategoryTrie(NAMES).search("DOG") == ["dogs"]
+
+
+def test_is_subsequence():
+    assert is_subsequence("bw", "black-and-white")
+    assert not is_subsequence("wb", "black-and-white")
+
+
+@pytest.mark.parametrize("chord, count, complete", [
+    ("1", 15, False),   # 10-15 may follow
+    ("2", 15, True),    # 20 is out of range: pick 2 right away
+    ("1", 10, False),   # 10 may follow
+    ("1", 9, True),
+    ("9", 100, False),
+    ("10", 100, False),  # 100 may follow
+    ("10", 99, True),
+    ("11", 100, True),
+    ("12", 125, False),
+    ("13", 125, True),
+])
+def test_chord_waits_only_while_a_longer_number_is_possible(chord, count, complete):
+    assert chord_is_complete(chord, count) is complete
+
+
+def test_chord_completion_matches_brute_force():
+    for count in range(11, 130):
+        for number in range(1, count + 1):
+            chord = str(number)
+            longer = any(str(n).startswith(chord) and n != number for n in range(1, count + 1))
+            assert chord_is_complete(chord, count) is not longer, (chord, count)
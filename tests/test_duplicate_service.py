@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from app.services.duplicate_service import (
+    DHASH_THRESHOLD,
+    PHASH_THRESHOLD,
+    BKTree,
+    DuplicateFinder,
+    ImageHashes,
+    compute_hashes,
+    hamming,
+)
+
+
+def scene(seed: int, noise: float = 0.0) -> Image.Image:
+    """A smooth random scene; ``noise`` adds per-pixel jitter to it."""
+    rng = np.random.default_rng(seed)
+    coarse = rng.random((6, 8)) * 255
+    image = Image.fromarray(coarse.astype(np.uint8)).resize((320, 240), Image.BICUBIC)
+    if noise:
+        pixels = np.asarray(image, dtype=np.float32)
+        pixels += np.random.default_rng(seed + 1000).normal(0, noise, pixels.shape)
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return image.convert("RGB")
+
+
+def test_hamming():
+    assert hamming(0, 0) == 0
+    assert hamming(0b1011, 0b0001) == 2
+    assert hamming(0, 2 ** 64 - 1) == 64
+
+
+def test_near_copies_are_within_thresholds_and_different_scenes_are_not(tmp_path):
+    scene(1).save(tmp_path / "a.png")
+    scene(1, noise=4).save(tmp_path / "a-noisy.jpg", quality=80)
+    scene(2).save(tmp_path / "b.png")
+    a, copy, other = (compute_hashes(tmp_path / name) for name in ("a.png", "a-noisy.jpg", "b.png"))
+
+    assert hamming(a.phash, copy.phash) <= PHASH_THRESHOLD
+    assert hamming(a.dhash, copy.dhash) <= DHASH_THRESHOLD
+    assert hamming(a.phash, other.phash) > PHASH_THRESHOLD
+
+
+def test_bktree_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    values = [int(v) for v in rng.integers(0, 2 ** 63, 300)]
+    values += [v ^ (1 << bit) for v, bit in zip(values[:50], range(50))]  # close neighbours
+    tree = BKTree()
+    for i, value in enumerate(values):
+        tree.add(value, i)
+
+    for query in values[:20]:
+        for radius in (0, 3, 12):
+            expected = {i for i, v in enumerate(values) if hamming(v, query) <= radius}
+            assert set(tree.search(query, radius)) == expected
+
+
+def hashes(phash: int) -> ImageHashes:
+    return ImageHashes(dhash=0, phash=phash)
+
+
+def test_groups_are_direct_matches_only():
+    finder = DuplicateFinder()
+    a, b, c = Path("a"), Path("b"), Path("c")
+    step = (1 << PHASH_THRESHOLD) - 1  # PHASH_THRESHOLD bits
+    finder._insert(a, hashes(0))
+    finder._insert(b, hashes(step))                              # a ~ b
+    finder._insert(c, hashes(step | (step << PHASH_THRESHOLD)))  # b ~ c, but a is 2x too far
+
+    assert finder.group_of(a) == [a, b]
+    assert finder.group_of(c) == [c, b]
+    assert set(finder.group_of(b)) == {a, b, c}
+    finder.shutdown()
+
+
+def test_group_is_ordered_closest_first():
+    finder = DuplicateFinder()
+    finder._insert(Path("x"), hashes(0))
+    finder._insert(Path("far"), hashes(0b111))
+    finder._insert(Path("near"), hashes(0b1))
+
+    assert finder.group_of(Path("x")) == [Path("x"), Path("near"), Path("far")]
+    assert finder.group_of(Path("unknown")) == [Path("unknown")]
+    finder.shutdown()
+
+
+def test_dhash_mismatch_prevents_grouping():
+    finder = DuplicateFinder()
+    finder._insert(Path("a"), ImageHashes(0, 0))
+    finder._insert(Path("b"), ImageHashes((1 << (DHASH_THRESHOLD + 1)) - 1, 0))
+
+    assert finder.group_of(Path("a")) == [Path("a")]
+    finder.shutdown()
@@ -0,0 +1,109 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app.services import image_service, index_service
+
+
+def encoded(image_format, mode="RGB"):
+    buffer = io.BytesIO()
+    Image.new(mode, (4, 4)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("image_format", ["PNG", "JPEG", "GIF", "WEBP", "BMP"])
+def test_sniff_format_identifies_supported_formats(tmp_path, image_format):
+    path = tmp_path / "image.bin"  # the extension plays no part
+    path.write_bytes(encoded(image_format))
+    assert image_service.sniff_format(path) == image_format
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"hello, world",
+    b"\xff\xd8",  # JPEG marker cut short
+    b"BM" + bytes(20),  # BMP signature without a valid info header
+    b"RIFF\0\0\0\0WAVE",
+])
+def test_sniff_format_rejects_other_content(tmp_path, content):
+    path = tmp_path / "image.png"
+    path.write_bytes(content)
+    assert image_service.sniff_format(path) is None
+
+
+def test_sniff_format_of_missing_file(tmp_path):
+    assert image_service.sniff_format(tmp_path / "gone.png") is None
+
+
+def make_files(folder):
+    folder.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (4, 4)).save(folder / "photo.png")
+    Image.new("RGB", (4, 4)).save(folder / "scan", "JPEG")  # no extension, still an image
+    (folder / "broken.jpg").write_bytes(b"not a jpeg")
+    (folder / "README").write_text("notes")
+    (folder / "Makefile").write_text("all:")
+
+
+def test_only_files_named_as_images_are_rejected(tmp_path):
+    make_files(tmp_path)
+    rejected = []
+    images = [p for batch in image_service.walk_image_batches([tmp_path], rejected=rejected) for p in batch]
+    assert sorted(p.name for p in images) == ["photo.png", "scan"]
+    assert rejected == [tmp_path / "broken.jpg"]
+
+
+def test_index_rejects_only_files_named_as_images(app_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(index_service, "RACY_SECONDS", 0)  # trust the first listing
+    folder = tmp_path / "in"
+    make_files(folder)
+    index = index_service.get_index()
+    for _ in range(2):  # listed from disk, then answered from the index
+        rejected = []
+        images = [p for batch in index.scan([folder], rejected=rejected) for p in batch]
+        assert sorted(p.name for p in images) == ["photo.png", "scan"]
+        assert rejected == [folder / "broken.jpg"]
+
+
+def scan(folder):
+    rejected = []
+    images = [p for batch in index_service.get_index().scan([folder], rejected=rejected) for p in batch]
+    return images, rejected
+
+
+def age(path, seconds=60):
+    old = os.stat(path).st_mtime - seconds
+    os.utime(path, (old, old))
+
+
+def test_empty_file_filled_in_later_is_found(app_data, tmp_path):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    photo = folder / "photo.jpg"
+    photo.touch()  # created, not written yet
+    age(photo)
+    age(folder)
+    folder_mtime = os.stat(folder).st_mtime_ns
+    assert scan(folder) == ([], [photo])
+
+    # Writing the file leaves the folder's mtime alone
+    Image.new("RGB", (4, 4)).save(photo, "JPEG")
+    assert os.stat(folder).st_mtime_ns == folder_mtime
+    assert scan(folder) == ([photo], [])
+
+
+def test_reject_changed_within_the_same_tick_is_sniffed_again(app_data, tmp_path):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    photo = folder / "photo.png"
+    Image.new("RGB", (4, 4)).save(photo)
+    content = photo.read_bytes()
+    photo.write_bytes(b"\0" * len(content))  # header not written yet
+    stat = os.stat(photo)
+    assert scan(folder) == ([], [photo])
+
+    # Same size and mtime: only the contents tell
+    photo.write_bytes(content)
+    os.utime(photo, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert scan(folder) == ([photo], [])
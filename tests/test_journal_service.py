@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from app.services import journal_service
+from app.services.journal_service import Journal
+
+
+def test_positions_are_coalesced_until_sync(app_data):
+    journal = Journal("s1")
+    journal.record("begin", roots=["/in"])
+    for i in range(100):
+        journal.note_position(Path(f"/in/{i}.jpg"))
+    assert journal.path.read_text().count('"position"') == 0
+
+    journal.sync()
+    assert journal.path.read_text().count('"position"') == 1
+    journal.note_position(Path("/in/last.jpg"))
+    journal.close()
+
+    state = journal_service.load_session("s1")
+    assert state.position == Path("/in/last.jpg")
+
+
+def test_load_session_rebuilds_state(app_data):
+    journal = Journal("s2")
+    journal.record("begin", roots=["/in"])
+    journal.record("snapshot", images=["/in/a.jpg", "/in/b.jpg", "/in/c.jpg"])
+    journal.record("added", images=["/in/d.jpg"])
+    journal.record("removed", images=["/in/c.jpg"])
+    journal.record("move", src="/in/a.jpg", dst="/out/cats/a.jpg")
+    journal.record("copy", src="/in/b.jpg", dst="/out/dogs/b.jpg")
+    journal.record("undo", src="/in/a.jpg")
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "move", "src": "/in/d.j')  # torn by a crash
+
+    state = journal_service.load_session("s2")
+    assert state.roots == ["/in"]
+    assert state.images == [Path("/in/a.jpg"), Path("/in/b.jpg"), Path("/in/d.jpg")]
+    assert state.moved == {Path("/in/b.jpg"): Path("/out/dogs/b.jpg")}
+    assert state.copied == {Path("/in/b.jpg")}
+    assert state.rolled_back == {}
+    assert state.remaining_images() == [Path("/in/a.jpg"), Path("/in/d.jpg")]
+    assert not state.finished
+
+
+def test_load_session_tracks_rollbacks_and_end(app_data):
+    journal = Journal("s3")
+    journal.record("begin", roots=["/in"])
+    journal.record("move", src="/in/a.jpg", dst="/out/cats/a.jpg")
+    journal.record("move", src="/in/b.jpg", dst="/out/cats/b.jpg")
+    journal.record("undo", src="/in/a.jpg", rollback=True)
+    journal.record("end")
+    journal.close()
+
+    state = journal_service.load_session("s3")
+    assert state.rolled_back == {Path("/in/a.jpg"): Path("/out/cats/a.jpg")}
+    assert state.moved == {Path("/in/b.jpg"): Path("/out/cats/b.jpg")}
+    assert state.images is None and state.remaining_images() == []
+    assert state.finished
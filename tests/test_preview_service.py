@@ -0,0 +1,51 @@
+import struct
+
+import pytest
+from PIL import Image
+
+from app.services.preview_service import _exif_thumbnail_bytes, supports_fast_preview
+
+THUMBNAIL = b"\xff\xd8\xff\xe0 thumbnail \xff\xd9"
+
+
+def exif_block(order="<", thumbnail=THUMBNAIL, with_ifd1=True, length=None):
+    """TIFF-structured EXIF: an empty IFD0 linking to an IFD1 that points at ``thumbnail``."""
+    ifd1 = 14  # header (8) + IFD0 with no entries (2 + 4)
+    data_offset = ifd1 + 2 + 2 * 12 + 4
+    header = (b"II" if order == "<" else b"MM") + struct.pack(order + "HI", 42, 8)
+    ifd0 = struct.pack(order + "HI", 0, ifd1 if with_ifd1 else 0)
+    entries = struct.pack(
+        order + "HHHIIHHII",
+        2,
+        0x0201, 4, 1, data_offset,
+        0x0202, 4, 1, len(thumbnail) if length is None else length,
+    ) + struct.pack(order + "I", 0)
+    return b"Exif\x00\x00" + header + ifd0 + entries + thumbnail
+
+
+@pytest.mark.parametrize("order", ["<", ">"])
+def test_finds_thumbnail_in_either_byte_order(order):
+    assert _exif_thumbnail_bytes(exif_block(order)) == THUMBNAIL
+
+
+def test_works_without_the_exif_prefix():
+    assert _exif_thumbnail_bytes(exif_block()[6:]) == THUMBNAIL
+
+
+@pytest.mark.parametrize("exif", [
+    b"",
+    b"Exif\x00\x00XX\x00*",
+    exif_block(with_ifd1=False),
+    exif_block(length=10_000),  # runs past the end of the block
+    exif_block()[:20],  # truncated inside IFD1
+])
+def test_missing_or_broken_thumbnail(exif):
+    assert _exif_thumbnail_bytes(exif) is None
+
+
+def test_fast_preview_follows_the_contents_not_the_name(tmp_path):
+    Image.new("RGB", (8, 8)).save(tmp_path / "photo.jpg", "PNG")
+    Image.new("RGB", (8, 8)).save(tmp_path / "photo.png", "JPEG")
+
+    assert not supports_fast_preview(tmp_path / "photo.jpg")
+    assert supports_fast_preview(tmp_path / "photo.png")
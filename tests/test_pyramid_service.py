@@ -0,0 +1,44 @@
+from PIL import Image, ImageChops
+
+from app.services.memory_service import MemoryManager
+from app.services.pyramid_service import TILE_SIZE, ImagePyramid
+
+
+def make_gradient(path, size):
+    gradient = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT), gradient))
+    image.save(path)
+    return image
+
+
+def test_levels_halve_down_to_one_tile(tmp_path):
+    make_gradient(tmp_path / "big.png", (1000, 600))
+    pyramid = ImagePyramid(tmp_path / "big.png", MemoryManager(1 << 30))
+    assert pyramid.finest_level == 0
+    assert [pyramid.level_size(level) for level in range(pyramid.level_count)] == [
+        (1000, 600), (500, 300), (250, 150),
+    ]
+    assert pyramid.tile(0, 3, 2).size == (1000 - 3 * TILE_SIZE, 600 - 2 * TILE_SIZE)
+
+
+def test_oversized_png_keeps_only_the_finest_level_that_fits(tmp_path):
+    original = make_gradient(tmp_path / "big.png", (1000, 600))
+    # Level 0 (1.8 MB) is more than half this budget, level 1 is not
+    pyramid = ImagePyramid(tmp_path / "big.png", MemoryManager(2_000_000))
+    assert pyramid.finest_level == 1
+
+    level = pyramid.level(2)
+    assert [built for built, _ in pyramid.take_built()] == [1, 2]
+    assert level.size == (250, 150)
+    # Reduced twice by 2 (rounding each time) rather than once by 4
+    difference = ImageChops.difference(level, original.reduce(4))
+    assert max(high for _, high in difference.getextrema()) <= 1
+
+
+def test_palette_images_are_converted_before_reducing(tmp_path):
+    make_gradient(tmp_path / "big.gif", (1000, 600))  # saved as a palette image
+    pyramid = ImagePyramid(tmp_path / "big.gif", MemoryManager(2_000_000))
+    assert pyramid.finest_level == 1
+    level = pyramid.level(1)
+    assert level.mode == "RGB"
+    assert level.size == pyramid.level_size(pyramid.finest_level)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.models.rule import Rule, validate_rule
+from app.services.metadata_service import ImageMetadata
+
+
+def metadata(**fields):
+    return ImageMetadata(**{"width": 4000, "height": 3000, "format": "JPEG", **fields})
+
+
+def test_name_conditions():
+    rule = Rule.from_dict({"category": "screens", "glob": "Screenshot*", "regex": r"\d{4}"})
+    assert rule.matches_name(Path("screenshot 2024.png"))
+    assert not rule.matches_name(Path("screenshot.png"))
+    assert not rule.needs_metadata
+
+
+def test_date_range_covers_whole_days():
+    rule = Rule.from_dict({"category": "trip", "date_from": "2024-06-01", "date_to": "2024-06-02"})
+    assert rule.needs_metadata
+    assert rule.matches_metadata(metadata(taken_at=datetime(2024, 6, 2, 23, 0)))
+    assert not rule.matches_metadata(metadata(taken_at=datetime(2024, 6, 3, 0, 0)))
+    assert not rule.matches_metadata(metadata())  # no capture time
+
+
+def test_dimension_and_format_conditions():
+    rule = Rule.from_dict({"category": "big", "min_width": 3000, "max_height": 3000, "format": "jpeg"})
+    assert rule.matches_metadata(metadata())
+    assert not rule.matches_metadata(metadata(width=2000))
+    assert not rule.matches_metadata(metadata(format="PNG"))
+
+
+def test_valid_rule():
+    assert validate_rule({"category": "big", "min_width": 3000, "format": ["jpeg", "png"]}) is None
+
+
+@pytest.mark.parametrize("data", [
+    "not a rule",
+    {"category": "Bad Name", "glob": "*"},
+    {"category": "cats"},
+    {"category": "cats", "colour": "red"},
+    {"category": "cats", "regex": "("},
+    {"category": "cats", "date_from": "yesterday"},
+    {"category": "cats", "date_from": "2024-06-01T00:00:00+02:00"},
+    {"category": "cats", "date_to": "2024-06-01T00:00:00Z"},
+    {"category": "cats", "min_width": "1000"},
+    {"category": "cats", "max_height": 12.5},
+    {"category": "cats", "min_height": -1},
+    {"category": "cats", "max_width": True},
+    {"category": "cats", "format": []},
+    {"category": "cats", "format": [""]},
+    {"category": "cats", "format": [1]},
+    {"category": "cats", "format": {"jpeg": True}},
+])
+def test_invalid_rules_are_reported(data):
+    assert validate_rule(data)
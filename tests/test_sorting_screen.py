@@ -0,0 +1,26 @@
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.gui.sorting_screen import SortingScreen
+
+
+def screen(count, sorted_indexes):
+    """Just the state the queue navigation reads, without building any widgets."""
+    images = [Path(f"{i}.jpg") for i in range(count)]
+    state = SimpleNamespace(images=images, _sorted={images[i] for i in sorted_indexes})
+    state._find_unsorted = partial(SortingScreen._find_unsorted, state)
+    return state
+
+
+def test_next_unsorted_looks_ahead_first():
+    assert SortingScreen._next_unsorted(screen(5, {0, 2}), 2) == 3
+
+
+def test_next_unsorted_wraps_round_to_skipped_images():
+    # 1 was skipped with the arrow key; 4, the last one, was just sorted
+    assert SortingScreen._next_unsorted(screen(5, {0, 2, 3, 4}), 5) == 1
+
+
+def test_next_unsorted_is_past_the_end_only_when_everything_is_sorted():
+    assert SortingScreen._next_unsorted(screen(3, {0, 1, 2}), 1) == 3
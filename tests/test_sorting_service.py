@@ -0,0 +1,128 @@
+import errno
+import os
+
+import pytest
+
+from app.services import journal_service, sorting_service
+
+
+def make_files(directory, *names):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        path = directory / name
+        path.write_bytes(name.encode())
+        paths.append(path)
+    return paths
+
+
+def test_replay_redoes_only_decisions_standing_at_rollback(app_data, tmp_path):
+    a, b = make_files(tmp_path / "in", "a.jpg", "b.jpg")
+    out = tmp_path / "out"
+    journal = journal_service.start_session([tmp_path / "in"])
+
+    sorting_service.move_into(a, out / "cats", journal)
+    sorting_service.undo_move(a, journal)
+    sorting_service.move_into(a, out / "dogs", journal)
+    sorting_service.move_into(b, out / "cats", journal)
+    sorting_service.undo_move(b, journal)
+    journal_service.end_active_session(finished=False)
+
+    assert sorting_service.rollback_session(journal.session_id) == []
+    assert a.exists() and b.exists()
+
+    assert sorting_service.replay_session(journal.session_id) == []
+    assert not a.exists()
+    assert (out / "dogs" / "a.jpg").exists()
+    assert not (out / "cats" / "a.jpg").exists()
+    assert b.exists()  # undone by the user, so not replayed
+
+
+def test_rollback_after_replay_rolls_back_again(app_data, tmp_path):
+    (a,) = make_files(tmp_path / "in", "a.jpg")
+    journal = journal_service.start_session([tmp_path / "in"])
+    sorting_service.move_into(a, tmp_path / "out" / "cats", journal)
+    journal_service.end_active_session(finished=False)
+
+    sorting_service.rollback_session(journal.session_id)
+    sorting_service.replay_session(journal.session_id)
+    assert not a.exists()
+    sorting_service.rollback_session(journal.session_id)
+    assert a.exists()
+
+
+def test_reserve_adds_suffixes_past_existing_names(tmp_path):
+    make_files(tmp_path / "cats", "a.jpg", "a_1.jpg")
+    index = sorting_service.CategoryIndex(tmp_path / "cats")
+    assert index.reserve("b.jpg").name == "b.jpg"
+    assert index.reserve("a.jpg").name == "a_2.jpg"
+    assert index.reserve("a.jpg").name == "a_3.jpg"
+    assert index.reserve("b.jpg").name == "b_1.jpg"
+
+
+def test_released_names_are_handed_out_again(tmp_path):
+    index = sorting_service.CategoryIndex(tmp_path / "cats")
+    first = index.reserve("a.jpg")
+    index.release(first)
+    assert index.reserve("a.jpg") == first
+
+
+def test_dry_run_index_does_not_create_the_folder(tmp_path):
+    index = sorting_service.CategoryIndex(tmp_path / "cats", create=False)
+    assert index.reserve("a.jpg") == tmp_path / "cats" / "a.jpg"
+    assert not (tmp_path / "cats").exists()
+
+
+def refuse_links(monkeypatch, error):
+    calls = []
+
+    def link(source, destination):
+        calls.append(source)
+        raise OSError(error, os.strerror(error))
+
+    monkeypatch.setattr(sorting_service.os, "link", link)
+    monkeypatch.setattr(sorting_service, "_unsupported", set())
+    return calls
+
+
+def test_copy_falls_back_and_remembers_unsupported_strategies(tmp_path, monkeypatch):
+    calls = refuse_links(monkeypatch, errno.EXDEV)
+    a, b = make_files(tmp_path / "in", "a.jpg", "b.jpg")
+    (tmp_path / "out").mkdir()
+
+    assert sorting_service.copy_file(a, tmp_path / "out" / "a.jpg", ("hardlink", "buffered")) == "buffered"
+    assert (tmp_path / "out" / "a.jpg").read_bytes() == a.read_bytes()
+    assert sorting_service.copy_file(b, tmp_path / "out" / "b.jpg", ("hardlink", "buffered")) == "buffered"
+    assert calls == [a]  # not tried again between the same devices
+    assert not list((tmp_path / "out").glob("*.partial"))
+
+
+def test_per_file_refusals_are_not_remembered(tmp_path, monkeypatch):
+    calls = refuse_links(monkeypatch, errno.EMLINK)
+    a, b = make_files(tmp_path / "in", "a.jpg", "b.jpg")
+    (tmp_path / "out").mkdir()
+
+    sorting_service.copy_file(a, tmp_path / "out" / "a.jpg", ("hardlink", "buffered"))
+    sorting_service.copy_file(b, tmp_path / "out" / "b.jpg", ("hardlink", "buffered"))
+    assert calls == [a, b]
+
+
+def test_real_failures_are_raised_not_skipped(tmp_path, monkeypatch):
+    refuse_links(monkeypatch, errno.ENOSPC)
+    (a,) = make_files(tmp_path / "in", "a.jpg")
+    (tmp_path / "out").mkdir()
+
+    with pytest.raises(OSError) as raised:
+        sorting_service.copy_file(a, tmp_path / "out" / "a.jpg", ("hardlink", "buffered"))
+    assert raised.value.errno == errno.ENOSPC
+    assert not (tmp_path / "out" / "a.jpg").exists()
+
+
+def test_last_refusal_is_raised_when_no_strategy_is_left(tmp_path, monkeypatch):
+    refuse_links(monkeypatch, errno.EXDEV)
+    (a,) = make_files(tmp_path / "in", "a.jpg")
+    (tmp_path / "out").mkdir()
+
+    with pytest.raises(OSError) as raised:
+        sorting_service.copy_file(a, tmp_path / "out" / "a.jpg", ("hardlink",))
+    assert raised.value.errno == errno.EXDEV
@@ -0,0 +1,110 @@
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from app.services import suggestion_service
+from app.services.suggestion_service import CategorySuggester
+
+
+def make_image(path, color):
+    Image.new("RGB", (64, 48), color).save(path)
+    return path
+
+
+def settle(suggester, timeout=5.0):
+    """Poll until no feature extraction is outstanding."""
+    deadline = time.monotonic() + timeout
+    while suggester._requested and time.monotonic() < deadline:
+        time.sleep(0.01)
+        suggester.poll()
+    suggester.poll()
+
+
+def test_learn_and_suggest(tmp_path, monkeypatch):
+    monkeypatch.setattr(suggestion_service, "MIN_EXAMPLES", 2)
+    suggester = CategorySuggester(tmp_path / "model.npz")
+    for i in range(3):
+        suggester.learn(make_image(tmp_path / f"red{i}.png", (250, 10 * i, 0)), "red")
+        suggester.learn(make_image(tmp_path / f"blue{i}.png", (0, 10 * i, 250)), "blue")
+    query = make_image(tmp_path / "query.png", (240, 20, 10))
+    suggester.prepare([query])
+    settle(suggester)
+
+    assert suggester.example_count == 6
+    ranked = suggester.suggest(query, ["blue", "red", "unused"])
+    assert [name for name, _ in ranked] == ["red", "blue"]
+    suggester.close()
+
+
+def test_forget_removes_the_example(tmp_path):
+    suggester = CategorySuggester(tmp_path / "model.npz")
+    paths = [make_image(tmp_path / f"{i}.png", (i * 40, 0, 0)) for i in range(3)]
+    for path in paths:
+        suggester.learn(path, "red")
+    settle(suggester)
+    suggester.forget(paths[0])
+
+    assert suggester.example_count == 2
+    assert suggester._counts[suggester._category_ids["red"]] == 2
+    np.testing.assert_allclose(
+        suggester._sums[0], suggester._features[:2].sum(axis=0), atol=1e-5,
+    )
+    suggester.close()
+
+
+def test_decision_is_learned_after_the_file_moved(tmp_path):
+    suggester = CategorySuggester(tmp_path / "model.npz")
+    path = make_image(tmp_path / "a.png", (200, 0, 0))
+    moved = tmp_path / "sorted" / "a.png"
+    moved.parent.mkdir()
+
+    suggester.learn(path, "cats")
+    os.rename(path, moved)  # the move queue got there first
+    settle(suggester)
+    suggester.note_moved(path, moved)
+    settle(suggester)
+
+    assert suggester.example_count == 1
+    suggester.close()
+
+
+def test_model_survives_a_reload(tmp_path):
+    suggester = CategorySuggester(tmp_path / "model.npz")
+    suggester.learn(make_image(tmp_path / "a.png", (200, 0, 0)), "cats")
+    settle(suggester)
+    suggester.close()
+
+    assert CategorySuggester(tmp_path / "model.npz").example_count == 1
+
+
+
+def test_rows_with_an_out_of_range_label_are_dropped_on_load(tmp_path):
+    features = np.zeros((2, suggestion_service.FEATURE_SIZE), dtype=np.float32)
+    np.savez(
+        tmp_path / "model.npz",
+        features=features,
+        labels=np.array([0, 3], dtype=np.int32),
+        paths=np.array(["a.png", "b.png"]),
+        categories=np.array(["cats"]),
+    )
+
+    suggester = CategorySuggester(tmp_path / "model.npz")
+
+    assert suggester.example_count == 1
+    assert suggester._paths == ["a.png"]
+    suggester.close()
+
+def test_failed_save_does_not_raise_and_is_retried(tmp_path):
+    blocker = tmp_path / "not-a-folder"
+    blocker.write_text("")
+    suggester = CategorySuggester(blocker / "model.npz")
+    suggester.learn(make_image(tmp_path / "a.png", (200, 0, 0)), "cats")
+    settle(suggester)
+    suggester.save()
+    suggester._saving.exception()
+    suggester.poll()
+
+    assert suggester._dirty
+    suggester.close()
@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.timing_service import Histogram
+
+
+def test_empty_histogram():
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_percentiles_land_in_the_right_bucket():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+    assert histogram.count == 100
+    assert histogram.total == pytest.approx(5.05)
+    # Buckets are a few percent wide
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.1)
+    assert histogram.percentile(95) == pytest.approx(0.095, rel=0.1)
+    assert histogram.percentile(99) == pytest.approx(0.099, rel=0.1)
+
+
+def test_percentiles_never_exceed_the_maximum():
+    histogram = Histogram()
+    for _ in range(10):
+        histogram.add(0.0123)
+    assert histogram.percentile(100) <= histogram.max == 0.0123
+    assert histogram.percentile(1) == pytest.approx(0.0123, rel=0.1)
+
+
+def test_extreme_durations_are_clamped_into_the_range():
+    histogram = Histogram()
+    histogram.add(0.0)
+    histogram.add(1e6)
+    assert histogram.percentile(50) >= 0.0
+    assert histogram.percentile(100) <= 1e6
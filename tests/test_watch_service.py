@@ -0,0 +1,83 @@
+import os
+import shutil
+import time
+
+import pytest
+from PIL import Image
+
+from app.services import index_service
+from app.services.watch_service import FolderWatcher
+
+
+def make_image(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (8, 8), "red").save(path, "PNG")
+    return path
+
+
+def wait_for(watcher, predicate, timeout=5.0):
+    """Collect changes until ``predicate(added, removed)`` holds."""
+    added, removed = set(), set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        changes = watcher.poll()
+        added.update(changes.added)
+        removed.update(changes.removed)
+        if predicate(added, removed):
+            break
+        time.sleep(0.05)
+    return added, removed
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    return request.param
+
+
+def start_watcher(root, use_inotify):
+    index_service.get_index().refresh([root], recursive=True)
+    watcher = FolderWatcher([root], recursive=True, use_inotify=use_inotify, debounce=0.1, poll_interval=0.1)
+    time.sleep(0.3)  # let the watcher thread set up its watches
+    return watcher
+
+
+def test_reports_added_and_removed_images(app_data, tmp_path, use_inotify):
+    root = tmp_path / "in"
+    old = make_image(root / "old.png")
+    watcher = start_watcher(root, use_inotify)
+    try:
+        new = make_image(root / "new.png")
+        old.unlink()
+        added, removed = wait_for(watcher, lambda a, r: new in a and old in r)
+        assert new in added and old in removed
+    finally:
+        watcher.close()
+
+
+def test_subfolder_moved_away_reports_its_images(app_data, tmp_path, use_inotify):
+    root = tmp_path / "in"
+    inside = [make_image(root / "sub" / "a.png"), make_image(root / "sub" / "deeper" / "b.png")]
+    watcher = start_watcher(root, use_inotify)
+    try:
+        os.rename(root / "sub", tmp_path / "elsewhere")
+        _, removed = wait_for(watcher, lambda a, r: set(inside) <= r)
+        assert set(inside) <= removed
+
+        # Moved back: watched again and its images show up again
+        os.rename(tmp_path / "elsewhere", root / "sub")
+        added, _ = wait_for(watcher, lambda a, r: inside[0] in a)
+        assert inside[0] in added
+    finally:
+        watcher.close()
+
+
+def test_deleted_subfolder_reports_its_images(app_data, tmp_path, use_inotify):
+    root = tmp_path / "in"
+    image = make_image(root / "sub" / "a.png")
+    watcher = start_watcher(root, use_inotify)
+    try:
+        shutil.rmtree(root / "sub")
+        _, removed = wait_for(watcher, lambda a, r: image in r)
+        assert image in removed
+    finally:
+        watcher.close()